@@ -0,0 +1,112 @@
+"""
+DealFlow Backend - Keyset Pagination
+Opaque cursors for list endpoints
+
+A cursor holds the sort value and _id of the last item of a page; the next page is
+read with a range condition on (sort field, _id) instead of skipping, so it is an
+index seek at any depth. List responses keep their JSON array body and return the
+cursor of the next page in the X-Next-Cursor header (absent on the last page).
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional, Sequence, Tuple
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException, Response, status
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_field: str, value: Any, item_id: Any) -> str:
+    """Cursor pointing after an item with `value` in `sort_field`"""
+    if isinstance(value, datetime):
+        value = {"$date": value.isoformat()}
+    elif isinstance(value, ObjectId):
+        value = str(value)
+    payload = json.dumps({"f": sort_field, "v": value, "id": str(item_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_field: str) -> Tuple[Any, ObjectId]:
+    """(sort value, _id) of a cursor; 400 if it is malformed or from another sort"""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if data["f"] != sort_field:
+            raise ValueError("cursor is for a different sort")
+        value = data["v"]
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value["$date"])
+        return value, ObjectId(data["id"])
+    except (ValueError, KeyError, TypeError, InvalidId, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def keyset_condition(
+    sort_field: str,
+    direction: int,
+    value: Any,
+    item_id: ObjectId,
+    id_field: str = "_id"
+) -> Dict[str, Any]:
+    """
+    Condition for items after (value, item_id) in (sort_field, id_field) order
+    Nulls sort before every value, so they come last in descending order and first
+    in ascending order.
+    """
+    op = "$lt" if direction < 0 else "$gt"
+    if sort_field == id_field:
+        return {id_field: {op: item_id}}
+    if value is None:
+        same = {sort_field: None, id_field: {op: item_id}}
+        return same if direction < 0 else {"$or": [same, {sort_field: {"$ne": None}}]}
+    clauses = [
+        {sort_field: {op: value}},
+        {sort_field: value, id_field: {op: item_id}}
+    ]
+    if direction < 0:
+        clauses.append({sort_field: None})
+    return {"$or": clauses}
+
+
+def apply_cursor(
+    query: Dict[str, Any],
+    cursor: Optional[str],
+    sort_field: str,
+    direction: int,
+    id_field: str = "_id"
+) -> Dict[str, Any]:
+    """`query` restricted to the items after `cursor` (unchanged without one)"""
+    if not cursor:
+        return query
+    value, item_id = decode_cursor(cursor, sort_field)
+    condition = keyset_condition(sort_field, direction, value, item_id, id_field)
+    return {**query, "$and": [*query.get("$and", []), condition]}
+
+
+def field_value(item: Any, field: str) -> Any:
+    """Value of a (dotted) field on a document"""
+    for part in field.split("."):
+        if item is None:
+            return None
+        item = item.get(part) if isinstance(item, dict) else getattr(item, part, None)
+    return item
+
+
+def set_next_cursor(
+    response: Response,
+    items: Sequence[Any],
+    limit: int,
+    sort_field: str,
+    id_attr: str = "id"
+):
+    """Set X-Next-Cursor when the page is full (there may be more items)"""
+    if not items or len(items) < limit:
+        return
+    last = items[-1]
+    value = field_value(last, id_attr if sort_field == "_id" else sort_field)
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor(sort_field, value, field_value(last, id_attr))
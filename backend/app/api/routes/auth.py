@@ -2,7 +2,7 @@
 DealFlow Backend - Authentication Routes
 """
 from datetime import datetime
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, BackgroundTasks
 from app.models.user import (
     User,
     UserCreate,
@@ -19,6 +19,8 @@ from app.core.security import (
     decode_token
 )
 from app.api.deps import get_current_user
+from app.services.thesis import get_compiled_thesis, invalidate_compiled_thesis
+from app.services.fits import refresh_user_fits
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -138,6 +140,7 @@ async def get_me(current_user: User = Depends(get_current_user)):
 @router.put("/thesis", response_model=UserResponse)
 async def update_thesis(
     thesis_data: ThesisUpdate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user)
 ):
     """Update user's fund thesis (for personalized discovery)"""
@@ -148,6 +151,9 @@ async def update_thesis(
     logger.info(f"Updating thesis for user {current_user.email}")
     logger.info(f"Received thesis data: {thesis_data.model_dump()}")
     
+    # Thesis the user's fit scores were computed with
+    previous_thesis = get_compiled_thesis(current_user)
+    
     # Update thesis
     if current_user.thesis is None:
         current_user.thesis = FundThesis()
@@ -227,6 +233,11 @@ async def update_thesis(
     current_user.updated_at = datetime.utcnow()
     await current_user.save()
     
+    # Recompile the thesis matchers used by fit scoring
+    invalidate_compiled_thesis(current_user.id)
+    get_compiled_thesis(current_user)
+    background_tasks.add_task(refresh_user_fits, current_user, previous_thesis)
+    
     logger.info(f"Thesis saved successfully for user {current_user.email}")
     logger.info(f"Saved thesis: sectors={current_user.thesis.sectors}, stages={current_user.thesis.stages}")
     
@@ -3,13 +3,16 @@ DealFlow Backend - Deals Routes
 """
 from datetime import datetime
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Response
 from beanie import PydanticObjectId
 from pydantic import BaseModel
 from app.models.deal import Deal, DealCreate, DealUpdate, DealResponse, Note, Activity
+from app.models.pipeline import Pipeline, PipelineStage, default_stages
 from app.models.startup import Startup
 from app.models.user import User
 from app.api.deps import get_current_user, get_optional_user
+from app.api.pagination import apply_cursor, set_next_cursor
+from app.services.startup_stats import invalidate_startup_stats
 
 router = APIRouter(prefix="/deals", tags=["Deals"])
 
@@ -37,14 +40,16 @@ def deal_to_response(deal: Deal) -> DealResponse:
 
 @router.get("", response_model=List[DealResponse])
 async def get_deals(
+    response: Response,
     current_user: User = Depends(get_current_user),
     status_filter: Optional[str] = Query(None, alias="status"),
     priority: Optional[str] = None,
     assigned_to: Optional[str] = None,
     skip: int = 0,
-    limit: int = 50
+    limit: int = 50,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page (replaces skip)")
 ):
-    """Get all deals for the current user"""
+    """Get all deals for the current user, most recently updated first"""
     query = {"user_id": str(current_user.id)}
     
     if status_filter:
@@ -54,33 +59,53 @@ async def get_deals(
     if assigned_to:
         query["assigned_to"] = assigned_to
     
+    query = apply_cursor(query, cursor, "updated_at", -1)
     deals = await Deal.find(query).sort(
-        [("updated_at", -1)]
-    ).skip(skip).limit(limit).to_list()
+        [("updated_at", -1), ("_id", -1)]
+    ).skip(0 if cursor else skip).limit(limit).to_list()
     
+    set_next_cursor(response, deals, limit, "updated_at")
     return [deal_to_response(d) for d in deals]
 
 
+async def get_pipeline_stages(user_id: str) -> List[PipelineStage]:
+    """Stages of the user's active pipeline (the default stages if they have none)"""
+    pipeline = await Pipeline.find_one(
+        {"user_id": user_id, "is_active": True},
+        sort=[("is_default", -1), ("updated_at", -1)]
+    )
+    stages = pipeline.stages if pipeline and pipeline.stages else default_stages()
+    return sorted(stages, key=lambda stage: stage.order)
+
+
 @router.get("/pipeline")
 async def get_pipeline_view(current_user: User = Depends(get_optional_user)):
-    """Get deals organized by pipeline stage"""
+    """
+    Get deals organized by pipeline stage
+    One aggregation groups the user's deals by status; notes and activities are not
+    read, only counted.
+    """
     # If no user, return empty pipeline or demo data
     if current_user is None:
-        pipeline_data = {}
-        for stage in ["new", "contacted", "meeting", "diligence", "passed", "invested"]:
-            pipeline_data[stage] = []
-        return pipeline_data
+        return {stage.id: [] for stage in default_stages()}
     
     user_id = str(current_user.id)
+    stage_ids = [stage.id for stage in await get_pipeline_stages(user_id)]
     
-    pipeline_data = {}
-    for stage in ["new", "contacted", "meeting", "diligence", "passed", "invested"]:
-        deals = await Deal.find({
-            "user_id": user_id,
-            "status": stage
-        }).sort([("priority", -1), ("updated_at", -1)]).to_list()
-        
-        pipeline_data[stage] = [deal_to_response(d) for d in deals]
+    projection = {field: 1 for field in DealResponse.model_fields if field not in ("id", "notes_count")}
+    projection["notes_count"] = {"$size": {"$ifNull": ["$notes", []]}}
+    groups = await Deal.aggregate([
+        {"$match": {"user_id": user_id, "status": {"$in": stage_ids}}},
+        {"$sort": {"priority": -1, "updated_at": -1}},
+        {"$project": projection},
+        {"$group": {"_id": "$status", "deals": {"$push": "$$ROOT"}}}
+    ]).to_list()
+    
+    pipeline_data = {stage_id: [] for stage_id in stage_ids}
+    for group in groups:
+        pipeline_data[group["_id"]] = [
+            DealResponse(id=str(deal.pop("_id")), **deal) for deal in group["deals"]
+        ]
     
     return pipeline_data
 
@@ -155,6 +180,7 @@ async def create_deal(
     # Update startup deal status
     startup.deal_status = deal_data.status
     await startup.save()
+    invalidate_startup_stats()
     
     return deal_to_response(deal)
 
@@ -198,6 +224,7 @@ async def update_deal(
             if startup:
                 startup.deal_status = deal_data.status
                 await startup.save()
+                invalidate_startup_stats()
         except:
             pass
     
@@ -268,6 +295,7 @@ async def delete_deal(
         if startup:
             startup.deal_status = "new"
             await startup.save()
+            invalidate_startup_stats()
     except:
         pass
     
@@ -4,17 +4,22 @@ For data ingestion and startup discovery
 """
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, HTTPException, status, Depends, BackgroundTasks
+from fastapi import APIRouter, HTTPException, status, Depends, BackgroundTasks, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 import uuid
 import asyncio
+import json
 import logging
+import time
 from app.models.user import User
 from app.models.startup import Startup
-from app.models.discovery import DiscoveryJob, DiscoveryResult, DiscoverySource, DiscoveryInsight
+from app.models.discovery import DiscoveryJob, DiscoveryResult, DiscoveryInsight
 from app.api.deps import get_current_user, get_optional_user
-from app.services.ingestion import IngestionService
-from app.services.scoring import ScoringService
+from app.api.pagination import apply_cursor, set_next_cursor
+from app.services.discovery import get_discovery_job, run_discovery_job
+from app.core.config import settings
 from beanie import PydanticObjectId
 
 logger = logging.getLogger(__name__)
@@ -28,6 +33,8 @@ class DiscoveryRunRequest(BaseModel):
     sectors: Optional[List[str]] = None
     stages: Optional[List[str]] = None
     limit_per_source: int = 20
+    ingest: bool = False  # Also upsert the results into the startups collection
+    delta: bool = False  # Only fetch records newer than the previous delta run
 
 
 class DiscoveryRunResponse(BaseModel):
@@ -45,6 +52,8 @@ class DiscoveryStatusResponse(BaseModel):
     progress: int
     startups_found: int
     startups_added: int
+    startups_created: int = 0
+    startups_updated: int = 0
     current_source: Optional[str] = None
     errors: List[str]
     filters_matched: bool = True  # Whether thesis filters matched any results
@@ -70,163 +79,52 @@ class DiscoveryResultResponse(BaseModel):
     is_saved: bool = False
 
 
-# In-memory job tracking (use Redis/database in production for persistence)
-discovery_jobs: Dict[str, Dict[str, Any]] = {}
+def job_status_response(job: DiscoveryJob) -> DiscoveryStatusResponse:
+    """Convert a DiscoveryJob to its API response"""
+    return DiscoveryStatusResponse(
+        job_id=job.job_id,
+        status=job.status,
+        progress=job.progress,
+        startups_found=job.startups_found,
+        startups_added=job.startups_added,
+        startups_created=job.startups_created,
+        startups_updated=job.startups_updated,
+        current_source=job.current_source,
+        errors=job.errors,
+        filters_matched=job.filters_matched,
+        applied_filters=job.applied_filters,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        completed_at=job.completed_at
+    )
 
 
-async def run_discovery_job(
-    job_id: str,
-    ingestion_service: IngestionService,
-    scoring_service: ScoringService,
-    sources: List[str],
-    limit_per_source: int,
-    user_id: Optional[str] = None,
-    sectors: Optional[List[str]] = None,
-    stages: Optional[List[str]] = None
-):
-    """
-    Background task to run discovery job
-    Fetches from APIs, stores in MongoDB, generates insights
-    Filters results based on user thesis (sectors, stages)
-    """
-    try:
-        if job_id not in discovery_jobs:
-            return
-        
-        job_data = discovery_jobs[job_id]
-        job_data["status"] = "running"
-        job_data["started_at"] = datetime.utcnow()
-        
-        logger.info(f"Starting discovery job {job_id} with sectors={sectors}, stages={stages}")
-        
-        total_startups = 0
-        total_added = 0
-        
-        # Fetch from each source with thesis filtering
-        for source in sources:
-            try:
-                job_data["current_source"] = source
-                job_data["progress"] = int((sources.index(source) / len(sources)) * 50)
-                
-                logger.info(f"Fetching from source: {source} with filters: sectors={sectors}, stages={stages}")
-                
-                if source.lower() == "yc":
-                    startups_data = await ingestion_service.fetch_yc_startups(
-                        limit=limit_per_source,
-                        sectors=sectors,
-                        stages=stages
-                    )
-                elif source.lower() == "crunchbase":
-                    startups_data = await ingestion_service.fetch_crunchbase_startups(
-                        limit=limit_per_source,
-                        sectors=sectors,
-                        stages=stages
-                    )
-                elif source.lower() == "angellist":
-                    startups_data = await ingestion_service.fetch_angellist_startups(
-                        limit=limit_per_source,
-                        sectors=sectors,
-                        stages=stages
-                    )
-                elif source.lower() == "mca":
-                    startups_data = await ingestion_service.fetch_mca_startups(
-                        limit=limit_per_source,
-                        sectors=sectors,
-                        stages=stages
-                    )
-                else:
-                    logger.warning(f"Unknown source: {source}")
-                    continue
-                
-                total_startups += len(startups_data)
-                
-                # Process and store each startup
-                for startup_data in startups_data:
-                    try:
-                        # Create discovery result
-                        discovery_result = DiscoveryResult(
-                            job_id=job_id,
-                            user_id=str(user_id) if user_id else None,
-                            name=startup_data.get("name", ""),
-                            sector=startup_data.get("sector", "Technology"),
-                            stage=startup_data.get("stage"),
-                            location=startup_data.get("location"),
-                            website=startup_data.get("website"),
-                            description=startup_data.get("description") or startup_data.get("tagline", ""),
-                            tagline=startup_data.get("tagline", ""),
-                            sources=[
-                                DiscoverySource(
-                                    name=source.lower(),
-                                    url=startup_data.get("website"),
-                                    relevance_score=0.8
-                                )
-                            ],
-                            discovery_score=75  # Score on 0-100 scale
-                        )
-                        
-                        # Generate AI insights
-                        try:
-                            insights = await scoring_service.generate_insights(startup_data)
-                            if insights:
-                                discovery_result.ai_insights = insights
-                        except Exception as e:
-                            logger.warning(f"Could not generate insights for {startup_data.get('name')}: {e}")
-                        
-                        # Calculate fit score
-                        try:
-                            fit_score = await scoring_service.calculate_fit_score(startup_data)
-                            discovery_result.fit_score = fit_score
-                        except Exception as e:
-                            logger.warning(f"Could not calculate fit score: {e}")
-                        
-                        # Save to MongoDB
-                        try:
-                            await discovery_result.save()
-                            total_added += 1
-                            logger.info(f"Saved startup: {startup_data.get('name')}")
-                        except Exception as save_error:
-                            logger.error(f"Failed to save startup {startup_data.get('name')}: {save_error}")
-                            job_data["errors"].append(f"Save error for {startup_data.get('name')}: {str(save_error)}")
-                    except Exception as e:
-                        logger.error(f"Error processing startup {startup_data.get('name')}: {e}")
-                        job_data["errors"].append(f"Error processing {startup_data.get('name')}: {str(e)}")
-                        continue
-                
-            except Exception as e:
-                logger.error(f"Error fetching from {source}: {e}")
-                job_data["errors"].append(f"Error fetching from {source}: {str(e)}")
-                continue
-        
-        # Update job status
-        job_data["status"] = "completed"
-        job_data["progress"] = 100
-        job_data["startups_found"] = total_startups
-        job_data["startups_added"] = total_added
-        job_data["completed_at"] = datetime.utcnow()
-        
-        # Check if any results matched the filters
-        # If we have results but they don't match the requested sectors/stages, filters didn't match
-        if total_added > 0 and (sectors or stages):
-            # Get the saved results and check if any match the filters
-            saved_results = await DiscoveryResult.find({"job_id": job_id}).to_list()
-            filters_matched = False
-            for result in saved_results:
-                sector_ok = not sectors or len(sectors) == 0 or result.sector in sectors or "Sector Agnostic" in sectors
-                stage_ok = not stages or len(stages) == 0 or result.stage in stages
-                if sector_ok and stage_ok:
-                    filters_matched = True
-                    break
-            job_data["filters_matched"] = filters_matched
-            if not filters_matched:
-                logger.warning(f"Discovery job {job_id}: No results matched filters. Showing all results instead.")
-        
-        logger.info(f"Discovery job {job_id} completed. Added {total_added} startups from {total_startups} found")
-        
-    except Exception as e:
-        logger.error(f"Discovery job {job_id} failed: {e}")
-        job_data["status"] = "failed"
-        job_data["errors"].append(str(e))
-        job_data["completed_at"] = datetime.utcnow()
+def discovery_result_response(r: DiscoveryResult) -> DiscoveryResultResponse:
+    """Convert a DiscoveryResult to its API response"""
+    return DiscoveryResultResponse(
+        id=str(r.id),
+        name=r.name,
+        sector=r.sector,
+        stage=r.stage,
+        location=r.location,
+        website=r.website,
+        description=r.description,
+        tagline=r.tagline or r.description or f"{r.sector} startup",
+        sources=[{"name": s.name, "url": s.url, "relevance_score": s.relevance_score} for s in r.sources],
+        discovery_score=r.discovery_score,
+        fit_score=r.fit_score,
+        is_saved=r.is_saved
+    )
+
+
+def sse_event(event: str, data: Any, event_id: Optional[str] = None) -> str:
+    """Format one server-sent event"""
+    lines = []
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(jsonable_encoder(data))}")
+    return "\n".join(lines) + "\n\n"
 
 
 @router.post("/run", response_model=DiscoveryRunResponse)
@@ -264,43 +162,27 @@ async def start_discovery(
                 logger.info(f"Using user thesis stages: {stages}")
         
         # Initialize job tracking
-        discovery_jobs[job_id] = {
-            "status": "pending",
-            "progress": 0,
-            "startups_found": 0,
-            "startups_added": 0,
-            "errors": [],
-            "filters_matched": True,  # Will be set to False if no matches found
-            "applied_filters": {
-                "sectors": sectors or [],
-                "stages": stages or [],
-            },
-            "created_at": datetime.utcnow(),
-            "started_at": None,
-            "completed_at": None,
-            "current_source": None,
-            "filters": {
-                "sectors": sectors,
-                "stages": stages
-            }
-        }
-        
-        # Initialize services
-        ingestion_service = IngestionService()
-        scoring_service = ScoringService()
-        
-        # Add background task with thesis filters
-        background_tasks.add_task(
-            run_discovery_job,
+        # Queued jobs are left unowned for worker.py to claim; inline jobs are owned by the API
+        job = DiscoveryJob(
             job_id=job_id,
-            ingestion_service=ingestion_service,
-            scoring_service=scoring_service,
+            user_id=str(current_user.id) if current_user else None,
             sources=request.sources,
-            limit_per_source=request.limit_per_source,
-            user_id=current_user.id if current_user else None,
             sectors=sectors,
-            stages=stages
+            stages=stages,
+            limit=request.limit_per_source,
+            ingest=request.ingest,
+            delta=request.delta,
+            applied_filters={
+                "sectors": sectors or [],
+                "stages": stages or [],
+            },
+            lease_owner=None if settings.DISCOVERY_QUEUE_ENABLED else "api"
         )
+        await job.insert()
+        
+        if not settings.DISCOVERY_QUEUE_ENABLED:
+            # No worker process: run in this process as a background task
+            background_tasks.add_task(run_discovery_job, job)
         
         filters_msg = ""
         if sectors:
@@ -326,60 +208,110 @@ async def get_discovery_status(job_id: str):
     """
     Get the status of a discovery job
     """
-    if job_id not in discovery_jobs:
+    job = await get_discovery_job(job_id)
+    if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job_data = discovery_jobs[job_id]
+    return job_status_response(job)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_discovery_events(job_id: str, request: Request):
+    """
+    Stream a discovery job as server-sent events
     
-    return DiscoveryStatusResponse(
-        job_id=job_id,
-        status=job_data["status"],
-        progress=job_data["progress"],
-        startups_found=job_data["startups_found"],
-        startups_added=job_data["startups_added"],
-        current_source=job_data.get("current_source"),
-        errors=job_data["errors"],
-        filters_matched=job_data.get("filters_matched", True),
-        applied_filters=job_data.get("applied_filters"),
-        created_at=job_data["created_at"],
-        started_at=job_data.get("started_at"),
-        completed_at=job_data.get("completed_at")
+    Events:
+    - progress: job status (same shape as GET /jobs/{job_id}), sent when it changes
+    - results: list of newly stored results; the event id is the last result id,
+      so a reconnecting EventSource resumes after it via Last-Event-ID
+    - complete: final job status, after which the stream closes
+    
+    Updates are coalesced: the job is checked every DISCOVERY_EVENTS_INTERVAL seconds
+    and everything that changed in between goes out as at most one event of each type.
+    """
+    job = await get_discovery_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    cursor = None
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id and PydanticObjectId.is_valid(last_event_id):
+        cursor = PydanticObjectId(last_event_id)
+    
+    async def events():
+        nonlocal cursor, job
+        last_progress = None
+        last_sent = time.monotonic()
+        
+        while True:
+            # Job state is read before results, so a finished job has all its results visible
+            query: Dict[str, Any] = {"job_id": job_id}
+            if cursor is not None:
+                query["_id"] = {"$gt": cursor}
+            results = await DiscoveryResult.find(query).sort("+_id").limit(
+                settings.DISCOVERY_EVENTS_MAX_RESULTS
+            ).to_list()
+            if results:
+                cursor = results[-1].id
+                yield sse_event("results", [discovery_result_response(r) for r in results], event_id=str(cursor))
+                last_sent = time.monotonic()
+            
+            progress = job_status_response(job)
+            if progress != last_progress:
+                last_progress = progress
+                yield sse_event("progress", progress)
+                last_sent = time.monotonic()
+            
+            more_results = len(results) == settings.DISCOVERY_EVENTS_MAX_RESULTS
+            if job.status in ("completed", "failed") and not more_results:
+                yield sse_event("complete", progress)
+                return
+            
+            if time.monotonic() - last_sent >= settings.DISCOVERY_EVENTS_KEEPALIVE:
+                yield ": keep-alive\n\n"
+                last_sent = time.monotonic()
+            
+            if await request.is_disconnected():
+                return
+            if not more_results:
+                await asyncio.sleep(settings.DISCOVERY_EVENTS_INTERVAL)
+            
+            job = await get_discovery_job(job_id)
+            if not job:
+                return
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 
 @router.get("/jobs/{job_id}/results", response_model=List[DiscoveryResultResponse])
-async def get_discovery_results(job_id: str, skip: int = 0, limit: int = 20):
+async def get_discovery_results(
+    job_id: str,
+    response: Response,
+    skip: int = 0,
+    limit: int = 20,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page (replaces skip)")
+):
     """
-    Get discovery results from a completed job
+    Get discovery results from a completed job, in discovery order
     """
-    if job_id not in discovery_jobs:
+    job = await get_discovery_job(job_id)
+    if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job_data = discovery_jobs[job_id]
-    if job_data["status"] not in ["completed", "running"]:
-        raise HTTPException(status_code=400, detail=f"Job is {job_data['status']}, cannot fetch results yet")
+    if job.status not in ["completed", "running"]:
+        raise HTTPException(status_code=400, detail=f"Job is {job.status}, cannot fetch results yet")
     
+    query = apply_cursor({"job_id": job_id}, cursor, "_id", 1)
     try:
         # Fetch results from MongoDB
-        results = await DiscoveryResult.find({"job_id": job_id}).skip(skip).limit(limit).to_list()
+        results = await DiscoveryResult.find(query).sort("+_id").skip(0 if cursor else skip).limit(limit).to_list()
         
-        return [
-            DiscoveryResultResponse(
-                id=str(r.id),
-                name=r.name,
-                sector=r.sector,
-                stage=r.stage,
-                location=r.location,
-                website=r.website,
-                description=r.description,
-                tagline=r.tagline or r.description or f"{r.sector} startup",
-                sources=[{"name": s.name, "url": s.url, "relevance_score": s.relevance_score} for s in r.sources],
-                discovery_score=r.discovery_score,
-                fit_score=r.fit_score,
-                is_saved=r.is_saved
-            )
-            for r in results
-        ]
+        set_next_cursor(response, results, limit, "_id")
+        return [discovery_result_response(r) for r in results]
     
     except Exception as e:
         logger.error(f"Error fetching discovery results: {e}")
@@ -436,35 +368,21 @@ async def pass_discovery_result(result_id: str, current_user: User = Depends(get
 
 @router.get("/saved")
 async def get_saved_discovery_results(
+    response: Response,
     current_user: User = Depends(get_current_user),
     skip: int = 0,
-    limit: int = 20
+    limit: int = 20,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page (replaces skip)")
 ):
     """
     Get all saved discovery results for current user
     """
+    query = apply_cursor({"user_id": str(current_user.id), "is_saved": True}, cursor, "_id", 1)
     try:
-        results = await DiscoveryResult.find(
-            {"user_id": str(current_user.id), "is_saved": True}
-        ).skip(skip).limit(limit).to_list()
+        results = await DiscoveryResult.find(query).sort("+_id").skip(0 if cursor else skip).limit(limit).to_list()
+        set_next_cursor(response, results, limit, "_id")
         
-        return [
-            DiscoveryResultResponse(
-                id=str(r.id),
-                name=r.name,
-                sector=r.sector,
-                stage=r.stage,
-                location=r.location,
-                website=r.website,
-                description=r.description,
-                tagline=r.tagline or r.description or f"{r.sector} startup",
-                sources=[{"name": s.name, "url": s.url, "relevance_score": s.relevance_score} for s in r.sources],
-                discovery_score=r.discovery_score,
-                fit_score=r.fit_score,
-                is_saved=r.is_saved
-            )
-            for r in results
-        ]
+        return [discovery_result_response(r) for r in results]
     
     except Exception as e:
         logger.error(f"Error fetching saved results: {e}")
@@ -3,7 +3,7 @@ DealFlow Backend - Outreach Routes
 """
 from datetime import datetime
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Response
 from beanie import PydanticObjectId
 from app.models.outreach import (
     Outreach,
@@ -15,6 +15,7 @@ from app.models.outreach import (
 from app.models.startup import Startup
 from app.models.user import User
 from app.api.deps import get_current_user, get_optional_user
+from app.api.pagination import apply_cursor, set_next_cursor
 from app.services.outreach import OutreachService
 
 router = APIRouter(prefix="/outreach", tags=["Outreach"])
@@ -38,11 +39,13 @@ def outreach_to_response(outreach: Outreach) -> OutreachResponse:
 
 @router.get("", response_model=List[OutreachResponse])
 async def get_outreach_list(
+    response: Response,
     current_user: User = Depends(get_optional_user),
     status_filter: Optional[str] = Query(None, alias="status"),
     type_filter: Optional[str] = Query(None, alias="type"),
     skip: int = 0,
-    limit: int = 50
+    limit: int = 50,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page (replaces skip)")
 ):
     """Get all outreach for the current user"""
     # Return empty list if no user
@@ -56,10 +59,12 @@ async def get_outreach_list(
     if type_filter:
         query["type"] = type_filter
     
+    query = apply_cursor(query, cursor, "created_at", -1)
     outreach_list = await Outreach.find(query).sort(
-        [("created_at", -1)]
-    ).skip(skip).limit(limit).to_list()
+        [("created_at", -1), ("_id", -1)]
+    ).skip(0 if cursor else skip).limit(limit).to_list()
     
+    set_next_cursor(response, outreach_list, limit, "created_at")
     return [outreach_to_response(o) for o in outreach_list]
 
 
@@ -3,8 +3,10 @@ DealFlow Backend - Startup Routes
 """
 from datetime import datetime
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+import uuid
+from fastapi import APIRouter, HTTPException, status, Depends, Query, BackgroundTasks, Response
 from beanie import PydanticObjectId
+from pymongo.errors import DuplicateKeyError
 from app.models.startup import (
     Startup,
     StartupCreate,
@@ -12,14 +14,31 @@ from app.models.startup import (
     StartupResponse
 )
 from app.models.user import User
+from app.models.rescore import RescoreJob, RescoreJobResponse
+from app.models.fit import StartupFit
 from app.api.deps import get_current_user, get_optional_user
+from app.api.pagination import apply_cursor, set_next_cursor
 from app.services.scoring import ScoringService
+from app.services.rescoring import run_rescore_job
+from app.services.search import search_match, search_startups
+from app.services.startup_stats import cached_startup_stats, invalidate_startup_stats
+from app.services.thesis import get_compiled_thesis
+from app.services.fits import (
+    SCORED_FIELDS,
+    has_fits,
+    is_refreshing,
+    personalized_startups,
+    refresh_startup_fits,
+    refresh_user_fits,
+    remove_startup_fits
+)
 
 router = APIRouter(prefix="/startups", tags=["Startups"])
 
 
-def startup_to_response(startup: Startup) -> StartupResponse:
-    """Convert Startup document to response model"""
+def startup_to_response(startup: Startup, fit: Optional[StartupFit] = None) -> StartupResponse:
+    """Convert Startup document to response model (with the user's own scores if given)"""
+    scores = fit or startup
     return StartupResponse(
         id=str(startup.id),
         name=startup.name,
@@ -27,15 +46,15 @@ def startup_to_response(startup: Startup) -> StartupResponse:
         sector=startup.sector,
         stage=startup.stage,
         location=startup.location,
-        score=startup.score,
-        score_breakdown=startup.score_breakdown,
-        unicorn_probability=startup.unicorn_probability,
+        score=scores.score,
+        score_breakdown=scores.score_breakdown,
+        unicorn_probability=scores.unicorn_probability,
         founders=startup.founders,
         metrics=startup.metrics,
         signals=startup.signals,
         sources=startup.sources,
         description=startup.description,
-        investor_fit=startup.investor_fit,
+        investor_fit=scores.investor_fit,
         deal_status=startup.deal_status,
         mutual_connections=startup.mutual_connections,
         last_updated=startup.last_updated,
@@ -44,20 +63,47 @@ def startup_to_response(startup: Startup) -> StartupResponse:
     )
 
 
+def add_range(query: dict, field: str, minimum: Optional[float], maximum: Optional[float]):
+    """Add a $gte/$lte condition on field when either bound is given"""
+    condition = {}
+    if minimum is not None:
+        condition["$gte"] = minimum
+    if maximum is not None:
+        condition["$lte"] = maximum
+    if condition:
+        query[field] = condition
+
+
 @router.get("", response_model=List[StartupResponse])
 async def get_startups(
+    background_tasks: BackgroundTasks,
+    response: Response,
     current_user: User = Depends(get_optional_user),
     sector: Optional[str] = Query(None, description="Filter by sector"),
     stage: Optional[str] = Query(None, description="Filter by stage"),
     min_score: Optional[float] = Query(None, ge=0, le=100, description="Minimum AI score"),
     status: Optional[str] = Query(None, description="Filter by deal status"),
-    search: Optional[str] = Query(None, description="Search by name or description"),
+    min_revenue: Optional[float] = Query(None, ge=0, description="Minimum revenue (USD)"),
+    max_revenue: Optional[float] = Query(None, ge=0, description="Maximum revenue (USD)"),
+    min_growth: Optional[float] = Query(None, description="Minimum growth (%)"),
+    max_growth: Optional[float] = Query(None, description="Maximum growth (%)"),
+    min_users: Optional[int] = Query(None, ge=0, description="Minimum users/customers"),
+    min_funding: Optional[float] = Query(None, ge=0, description="Minimum funding raised (USD)"),
+    max_funding: Optional[float] = Query(None, ge=0, description="Maximum funding raised (USD)"),
+    search: Optional[str] = Query(None, description="Search name, tagline and description (ranked by relevance; the last word matches as a prefix)"),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page (replaces skip)"),
     sort_by: str = Query("score", description="Sort field"),
     sort_order: str = Query("desc", description="Sort order (asc/desc)")
 ):
-    """Get all startups with filtering and pagination"""
+    """
+    Get all startups with filtering and pagination
+    With sort_by=score, users with a fund thesis get their personalized ranking
+    (their own materialized fit scores) instead of the global score.
+    Searches are ranked by relevance instead of sort_by.
+    Except for searches, the X-Next-Cursor header holds the cursor of the next page.
+    """
     # Build query
     query = {}
     
@@ -65,62 +111,111 @@ async def get_startups(
         query["sector"] = sector
     if stage:
         query["stage"] = stage
-    if min_score is not None:
-        query["score"] = {"$gte": min_score}
     if status:
         query["deal_status"] = status
     
-    # Build aggregation pipeline for search
-    if search:
-        query["$or"] = [
-            {"name": {"$regex": search, "$options": "i"}},
-            {"description": {"$regex": search, "$options": "i"}},
-            {"tagline": {"$regex": search, "$options": "i"}}
-        ]
+    # Metric ranges (parsed numeric fields, indexed)
+    add_range(query, "metrics.revenue_usd", min_revenue, max_revenue)
+    add_range(query, "metrics.growth_pct", min_growth, max_growth)
+    add_range(query, "metrics.users_count", min_users, None)
+    add_range(query, "metrics.funding_usd", min_funding, max_funding)
+    
+    # Ranked text / typeahead search
+    if search and search_match(search):
+        personalized = bool(current_user and current_user.thesis and await has_fits(current_user))
+        ranked = await search_startups(
+            search, query, user=current_user if personalized else None, min_score=min_score, skip=skip, limit=limit
+        )
+        return [startup_to_response(startup, fit) for startup, fit in ranked]
     
     # Determine sort direction
     sort_direction = -1 if sort_order == "desc" else 1
     
-    # Execute query
+    # Personalized ranking from the user's fit scores
+    if sort_by == "score" and current_user and current_user.thesis:
+        if await has_fits(current_user):
+            ranked = await personalized_startups(
+                current_user,
+                query,
+                min_score=min_score,
+                skip=0 if cursor else skip,
+                limit=limit,
+                sort_direction=sort_direction,
+                after=apply_cursor({}, cursor, "score", sort_direction, id_field="startup_id")
+            )
+            set_next_cursor(response, [fit for _, fit in ranked], limit, "score", id_attr="startup_id")
+            return [startup_to_response(startup, fit) for startup, fit in ranked]
+        if not is_refreshing(current_user):
+            # Not materialized yet: build them in the background, use global scores meanwhile
+            background_tasks.add_task(refresh_user_fits, current_user)
+    
+    if min_score is not None:
+        query["score"] = {"$gte": min_score}
+    
+    # Execute query (keyset on (sort_by, _id) when a cursor is given)
+    query = apply_cursor(query, cursor, sort_by, sort_direction)
     startups = await Startup.find(query).sort(
-        [(sort_by, sort_direction)]
-    ).skip(skip).limit(limit).to_list()
+        [(sort_by, sort_direction), ("_id", sort_direction)]
+    ).skip(0 if cursor else skip).limit(limit).to_list()
     
+    set_next_cursor(response, startups, limit, sort_by)
     return [startup_to_response(s) for s in startups]
 
 
 @router.get("/stats")
 async def get_startup_stats(current_user: User = Depends(get_optional_user)):
     """Get startup statistics"""
-    total = await Startup.count()
-    
-    # Count by status
-    status_counts = {}
-    for status in ["new", "contacted", "meeting", "diligence", "passed", "invested"]:
-        count = await Startup.find(Startup.deal_status == status).count()
-        status_counts[status] = count
+    return await cached_startup_stats()
+
+
+def rescore_job_to_response(job: RescoreJob) -> RescoreJobResponse:
+    """Convert RescoreJob document to response model"""
+    return RescoreJobResponse(
+        job_id=job.job_id,
+        status=job.status,
+        total=job.total,
+        processed=job.processed,
+        updated=job.updated,
+        progress=job.progress,
+        errors=job.errors,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        completed_at=job.completed_at,
+        execution_time=job.execution_time
+    )
+
+
+@router.post("/rescore", response_model=RescoreJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def start_rescore(
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Re-calculate AI scores for every startup against the current user's thesis
+    Runs as a background job; poll GET /startups/rescore/{job_id} for progress
+    """
+    job = RescoreJob(job_id=str(uuid.uuid4()), user_id=str(current_user.id))
+    await job.insert()
     
-    # Count by sector
-    sector_pipeline = [
-        {"$group": {"_id": "$sector", "count": {"$sum": 1}}},
-        {"$sort": {"count": -1}},
-        {"$limit": 10}
-    ]
-    sector_counts = await Startup.aggregate(sector_pipeline).to_list()
+    background_tasks.add_task(run_rescore_job, job, get_compiled_thesis(current_user))
     
-    # Average score
-    avg_pipeline = [
-        {"$group": {"_id": None, "avg_score": {"$avg": "$score"}}}
-    ]
-    avg_result = await Startup.aggregate(avg_pipeline).to_list()
-    avg_score = avg_result[0]["avg_score"] if avg_result else 0
+    return rescore_job_to_response(job)
+
+
+@router.get("/rescore/{job_id}", response_model=RescoreJobResponse)
+async def get_rescore_status(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """Get the progress of a rescore job"""
+    job = await RescoreJob.find_one(RescoreJob.job_id == job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Rescore job not found"
+        )
     
-    return {
-        "total": total,
-        "by_status": status_counts,
-        "by_sector": {item["_id"]: item["count"] for item in sector_counts},
-        "average_score": round(avg_score, 1)
-    }
+    return rescore_job_to_response(job)
 
 
 @router.get("/{startup_id}", response_model=StartupResponse)
@@ -143,12 +238,18 @@ async def get_startup(
             detail="Startup not found"
         )
     
-    return startup_to_response(startup)
+    fit = await StartupFit.find_one(
+        StartupFit.user_id == str(current_user.id),
+        StartupFit.startup_id == startup.id
+    )
+    
+    return startup_to_response(startup, fit)
 
 
 @router.post("", response_model=StartupResponse, status_code=status.HTTP_201_CREATED)
 async def create_startup(
     startup_data: StartupCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user)
 ):
     """Create a new startup"""
@@ -168,13 +269,21 @@ async def create_startup(
     
     # Calculate initial AI score
     scoring_service = ScoringService()
-    score_result = await scoring_service.calculate_score(startup, current_user.thesis)
+    score_result = await scoring_service.calculate_score(startup, get_compiled_thesis(current_user))
     startup.score = score_result["overall_score"]
     startup.score_breakdown = score_result["breakdown"]
     startup.unicorn_probability = score_result.get("unicorn_probability")
     startup.investor_fit = score_result.get("investor_fit")
     
-    await startup.insert()
+    try:
+        await startup.insert()
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A startup with this website already exists"
+        )
+    invalidate_startup_stats()
+    background_tasks.add_task(refresh_startup_fits, [startup])
     
     return startup_to_response(startup)
 
@@ -183,6 +292,7 @@ async def create_startup(
 async def update_startup(
     startup_id: str,
     startup_data: StartupUpdate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user)
 ):
     """Update a startup"""
@@ -200,15 +310,20 @@ async def update_startup(
             detail="Startup not found"
         )
     
-    # Update fields
-    update_dict = startup_data.model_dump(exclude_unset=True)
-    for key, value in update_dict.items():
-        setattr(startup, key, value)
+    # Update fields (the validated values: Startup does not validate on assignment,
+    # so dumped dicts would replace the Metrics and Founder models)
+    updated_fields = startup_data.model_fields_set
+    for key in updated_fields:
+        setattr(startup, key, getattr(startup_data, key))
+    startup.set_derived_keys()
     
     startup.updated_at = datetime.utcnow()
     startup.last_updated = "Just now"
     
     await startup.save()
+    invalidate_startup_stats()
+    if SCORED_FIELDS.intersection(updated_fields):
+        background_tasks.add_task(refresh_startup_fits, [startup])
     
     return startup_to_response(startup)
 
@@ -234,6 +349,8 @@ async def delete_startup(
         )
     
     await startup.delete()
+    invalidate_startup_stats()
+    await remove_startup_fits(startup.id)
 
 
 @router.post("/{startup_id}/score", response_model=StartupResponse)
@@ -258,7 +375,7 @@ async def rescore_startup(
     
     # Re-calculate score
     scoring_service = ScoringService()
-    score_result = await scoring_service.calculate_score(startup, current_user.thesis)
+    score_result = await scoring_service.calculate_score(startup, get_compiled_thesis(current_user))
     
     startup.score = score_result["overall_score"]
     startup.score_breakdown = score_result["breakdown"]
@@ -268,5 +385,6 @@ async def rescore_startup(
     startup.last_updated = "Just now"
     
     await startup.save()
+    invalidate_startup_stats()
     
     return startup_to_response(startup)
@@ -3,6 +3,7 @@ DealFlow Core Module
 """
 from app.core.config import settings
 from app.core.database import connect_to_mongo, close_mongo_connection
+from app.core.http import open_http_clients, close_http_clients, get_http_client, get_openai_client
 from app.core.security import (
     verify_password,
     get_password_hash,
@@ -15,6 +16,10 @@ __all__ = [
     "settings",
     "connect_to_mongo",
     "close_mongo_connection",
+    "open_http_clients",
+    "close_http_clients",
+    "get_http_client",
+    "get_openai_client",
     "verify_password",
     "get_password_hash",
     "create_access_token",
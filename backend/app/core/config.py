@@ -2,7 +2,7 @@
 DealFlow Backend - Configuration Settings
 """
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Dict
 import json
 
 
@@ -21,6 +21,8 @@ class Settings(BaseSettings):
     MONGODB_PORT: int = 27017
     MONGODB_URL: str = "mongodb://localhost:27017"
     DATABASE_NAME: str = "dealflow"
+    INDEX_CHECK_ON_STARTUP: bool = True  # Log missing indexes and poor query plans at startup
+    SLOW_QUERY_MS: int = 100  # Explained queries slower than this are logged
     
     @property
     def mongodb_connection_string(self) -> str:
@@ -45,6 +47,56 @@ class Settings(BaseSettings):
     MCA_API_KEY: str = ""
     MCA_API_PROVIDER: str = "signzy"  # Provider: signzy, surepass, gridlines
     MCA_API_BASE_URL: str = ""  # Optional custom base URL
+    MCA_MAX_CONCURRENCY: int = 8  # Parallel CIN lookups
+    MCA_RATE_LIMITS: str = '{"signzy": 5, "surepass": 10, "gridlines": 5}'  # Requests/second per provider
+    MCA_MAX_RETRIES: int = 3  # Retries on 429/5xx and network errors
+    MCA_RETRY_BACKOFF: float = 1.0  # Base delay (seconds) for exponential backoff
+    
+    # Ingestion
+    INGESTION_SOURCE_TIMEOUT: float = 60.0  # Max seconds to wait for a single source
+    INGESTION_TOTAL_TIMEOUT: float = 120.0  # Max seconds for a full multi-source refresh
+    CRUNCHBASE_MAX_PAGES: int = 5  # Paid search requests per Crunchbase fetch
+    DISCOVERY_INSERT_BATCH_SIZE: int = 100  # DiscoveryResult documents per insert_many
+    DISCOVERY_INSERT_FLUSH_INTERVAL: float = 1.0  # Max seconds a result waits in the insert buffer
+    JOB_PROGRESS_FLUSH_INTERVAL: float = 1.0  # Min seconds between job progress writes
+    DISCOVERY_EVENTS_INTERVAL: float = 1.0  # Seconds between job checks on the SSE stream
+    DISCOVERY_EVENTS_MAX_RESULTS: int = 100  # Results per SSE "results" event
+    DISCOVERY_EVENTS_KEEPALIVE: float = 15.0  # Seconds of silence before an SSE keep-alive comment
+    RESCORE_CHUNK_SIZE: int = 1000  # Startups scored and written per bulk_write
+    
+    # Discovery worker (python worker.py)
+    DISCOVERY_QUEUE_ENABLED: bool = False  # Queue jobs for workers instead of running them in the API process
+    DISCOVERY_WORKER_CONCURRENCY: int = 2  # Jobs run at once per worker
+    DISCOVERY_WORKER_POLL_INTERVAL: float = 2.0  # Seconds between queue polls when idle
+    DISCOVERY_JOB_LEASE_SECONDS: float = 60.0  # A job whose lease lapses is reclaimed by another worker
+    DISCOVERY_JOB_HEARTBEAT_INTERVAL: float = 15.0  # Seconds between lease renewals
+    DISCOVERY_JOB_MAX_ATTEMPTS: int = 3  # Give up on a job after this many claims
+    
+    # Dashboard
+    STATS_CACHE_TTL: float = 30.0  # Seconds GET /startups/stats is served from memory (0 disables the cache)
+    
+    # AI scoring (OpenAI-compatible API; point OPENAI_BASE_URL at a local stub for testing)
+    OPENAI_BASE_URL: str = ""  # Empty for api.openai.com
+    AI_SCORING_MODEL: str = "gpt-4o-mini"  # Must support JSON mode while AI_SCORING_JSON_MODE is on
+    AI_SCORING_JSON_MODE: bool = True  # Send response_format=json_object (turn off for models without JSON mode)
+    AI_SCORING_BATCH_SIZE: int = 5  # Startups scored per API request
+    AI_SCORING_CONCURRENCY: int = 4  # API requests in flight at once
+    AI_SCORING_RATE_LIMIT: float = 1.0  # API requests per second
+    AI_SCORING_CACHE_ENABLED: bool = True  # Reuse results for unchanged startups
+    
+    # Outbound HTTP client pool (shared by ingestion, Proxycurl and OpenAI)
+    HTTP_TIMEOUT: float = 30.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0  # Seconds an idle connection is kept open
+    HTTP2_ENABLED: bool = True
+    
+    # HTTP response cache for ingestion sources
+    HTTP_CACHE_ENABLED: bool = True
+    HTTP_CACHE_DIR: str = ".cache/http"
+    HTTP_CACHE_TTLS: str = '{"yc": 86400, "crunchbase": 604800, "mca": 2592000, "proxycurl": 2592000}'  # Seconds per source
+    HTTP_CACHE_DRAIN_TIMEOUT: float = 10.0  # Max seconds to finish caching a body the reader stopped early
+    HTTP_CACHE_DRAIN_MAX_BYTES: int = 50 * 1024 * 1024  # Larger remainders are not cached
     
     # CORS
     CORS_ORIGINS: str = '["http://localhost:5173","http://localhost:3000"]'
@@ -60,6 +112,22 @@ class Settings(BaseSettings):
         except:
             return ["http://localhost:5173", "http://localhost:3000"]
     
+    @property
+    def mca_rate_limits(self) -> Dict[str, float]:
+        """Parse per-provider MCA rate limits from JSON string"""
+        try:
+            return {k.lower(): float(v) for k, v in json.loads(self.MCA_RATE_LIMITS).items()}
+        except:
+            return {"signzy": 5.0, "surepass": 10.0, "gridlines": 5.0}
+    
+    @property
+    def http_cache_ttls(self) -> Dict[str, float]:
+        """Parse per-source HTTP cache TTLs from JSON string"""
+        try:
+            return {k.lower(): float(v) for k, v in json.loads(self.HTTP_CACHE_TTLS).items()}
+        except:
+            return {"yc": 86400.0, "crunchbase": 604800.0, "mca": 2592000.0, "proxycurl": 2592000.0}
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
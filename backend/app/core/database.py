@@ -3,13 +3,17 @@ DealFlow Backend - Database Connection
 """
 from motor.motor_asyncio import AsyncIOMotorClient
 from beanie import init_beanie
+from pymongo import IndexModel
 from app.core.config import settings
-from app.models.startup import Startup
+from app.models.startup import Startup, UNIQUE_KEYS
 from app.models.user import User
 from app.models.deal import Deal
 from app.models.pipeline import Pipeline
 from app.models.outreach import Outreach
-from app.models.discovery import DiscoveryJob, DiscoveryResult
+from app.models.discovery import DiscoveryJob, DiscoveryResult, SourceWatermark
+from app.models.rescore import RescoreJob
+from app.models.fit import StartupFit
+from app.models.ai_score import AIScoreCache
 from loguru import logger
 
 
@@ -34,7 +38,7 @@ async def connect_to_mongo():
         # Test connection
         await db.client.admin.command('ping')
         logger.info("✅ Successfully connected to MongoDB with authentication")
-        
+    
     except Exception as e:
         logger.warning(f"⚠️  Could not connect with authentication: {str(e)}")
         logger.info("🔄 Attempting connection without authentication...")
@@ -49,11 +53,13 @@ async def connect_to_mongo():
             logger.warning("⚠️  Connected to MongoDB WITHOUT authentication")
             logger.warning("🔐 For production, please enable authentication:")
             logger.warning(f"   Connection String: {settings.mongodb_connection_string}")
-            
+        
         except Exception as e2:
             logger.error(f"❌ Failed to connect to MongoDB: {str(e2)}")
             raise
     
+    await prepare_unique_indexes()
+    
     # Initialize Beanie with document models
     await init_beanie(
         database=db.client[settings.DATABASE_NAME],
@@ -64,12 +70,51 @@ async def connect_to_mongo():
             Pipeline,
             Outreach,
             DiscoveryJob,
-            DiscoveryResult
+            DiscoveryResult,
+            SourceWatermark,
+            RescoreJob,
+            StartupFit,
+            AIScoreCache
         ]
     )
     logger.info("Successfully connected to MongoDB")
 
 
+async def prepare_unique_indexes():
+    """
+    Replace the plain startup key indexes with unique ones where the stored data allows it
+    Building a unique index fails while two startups share a value, and init_beanie would
+    stop startup with it. For such a key the duplicates are logged, the plain index is kept
+    and the unique one is left out until they are merged.
+    """
+    collection = db.client[settings.DATABASE_NAME][Startup.Settings.name]
+    indexes = await collection.index_information()
+    for key in UNIQUE_KEYS:
+        on_key = {name: info for name, info in indexes.items() if [field for field, _ in info["key"]] == [key]}
+        if any(info.get("unique") for info in on_key.values()):
+            continue
+        duplicates = await collection.aggregate([
+            {"$match": {key: {"$type": "string"}}},
+            {"$group": {"_id": f"${key}", "count": {"$sum": 1}, "ids": {"$push": "$_id"}}},
+            {"$match": {"count": {"$gt": 1}}},
+            {"$limit": 20},
+            {"$project": {"ids": {"$slice": ["$ids", 5]}}}
+        ]).to_list(None)
+        if duplicates:
+            logger.error(
+                f"Startups share {key} values, so {key} is not made unique; merge them and restart: "
+                + ", ".join(f"{dup['_id']} ({', '.join(str(i) for i in dup['ids'])})" for dup in duplicates)
+            )
+            Startup.Settings.indexes = [
+                index for index in Startup.Settings.indexes
+                if not (isinstance(index, IndexModel) and index.document["name"] == f"{key}_unique")
+            ]
+            continue
+        for name in on_key:
+            logger.info(f"Dropping index {name}, replaced by a unique index")
+            await collection.drop_index(name)
+
+
 async def close_mongo_connection():
     """Close database connection"""
     logger.info("Closing MongoDB connection...")
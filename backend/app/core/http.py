@@ -0,0 +1,88 @@
+"""
+DealFlow Backend - Shared outbound HTTP client pool
+One pooled httpx client (keep-alive, optional HTTP/2) used by ingestion, Proxycurl and OpenAI
+"""
+from typing import Optional
+import httpx
+from openai import AsyncOpenAI
+from loguru import logger
+from app.core.config import settings
+
+
+class HTTPClients:
+    client: Optional[httpx.AsyncClient] = None
+    openai: Optional[AsyncOpenAI] = None
+
+
+http_clients = HTTPClients()
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional `h2` package (httpx[http2])"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _build_client() -> httpx.AsyncClient:
+    http2 = settings.HTTP2_ENABLED
+    if http2 and not _http2_available():
+        logger.warning("HTTP2_ENABLED is set but the h2 package is not installed - using HTTP/1.1")
+        http2 = False
+    
+    return httpx.AsyncClient(
+        timeout=settings.HTTP_TIMEOUT,
+        follow_redirects=True,
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+        )
+    )
+
+
+async def open_http_clients():
+    """Create the shared HTTP client pool"""
+    if http_clients.client is None or http_clients.client.is_closed:
+        http_clients.client = _build_client()
+        http_clients.openai = None
+        logger.info(
+            f"HTTP client pool ready (max_connections={settings.HTTP_MAX_CONNECTIONS}, "
+            f"keepalive={settings.HTTP_MAX_KEEPALIVE_CONNECTIONS})"
+        )
+
+
+async def close_http_clients():
+    """Close the shared HTTP client pool"""
+    logger.info("Closing HTTP client pool...")
+    if http_clients.openai is not None:
+        await http_clients.openai.close()
+        http_clients.openai = None
+    if http_clients.client is not None:
+        await http_clients.client.aclose()
+        http_clients.client = None
+    logger.info("HTTP client pool closed")
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use outside the app lifespan"""
+    if http_clients.client is None or http_clients.client.is_closed:
+        http_clients.client = _build_client()
+        http_clients.openai = None  # Bound to the previous client
+    return http_clients.client
+
+
+def get_openai_client() -> Optional[AsyncOpenAI]:
+    """Get the shared OpenAI client (None if OPENAI_API_KEY is not configured)"""
+    if not settings.OPENAI_API_KEY:
+        return None
+    if http_clients.openai is None:
+        http_clients.openai = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL or None,
+            http_client=get_http_client()
+        )
+    return http_clients.openai
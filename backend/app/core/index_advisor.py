@@ -0,0 +1,146 @@
+"""
+DealFlow Backend - Index Advisor
+Startup check that the declared indexes exist and the routes' queries use them
+
+Every model's Settings.indexes is compared with the collection's actual indexes
+(init_beanie only creates missing indexes, so one dropped by hand stays missing),
+and each query shape below is explained: collection scans, in-memory sorts and
+queries slower than SLOW_QUERY_MS are logged as warnings.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Set, Tuple, Type
+from beanie import Document
+from beanie.odm.fields import IndexModelField
+from pymongo import IndexModel
+from loguru import logger
+from app.core.config import settings
+from app.models.startup import Startup
+from app.models.deal import Deal
+from app.models.outreach import Outreach
+from app.models.pipeline import Pipeline
+from app.models.discovery import DiscoveryJob, DiscoveryResult, SourceWatermark
+from app.models.fit import StartupFit
+from app.models.ai_score import AIScoreCache
+
+IndexKey = Tuple[Tuple[str, Any], ...]
+
+
+@dataclass
+class QueryShape:
+    """A query a route runs, with placeholder values"""
+    name: str
+    model: Type[Document]
+    filter: Dict[str, Any]
+    sort: List[Tuple[str, int]] = field(default_factory=list)
+
+
+QUERY_SHAPES = [
+    QueryShape("GET /startups", Startup, {}, [("score", -1), ("_id", -1)]),
+    QueryShape("GET /startups?sector", Startup, {"sector": ""}, [("score", -1), ("_id", -1)]),
+    QueryShape("GET /startups?sector&stage", Startup, {"sector": "", "stage": ""}, [("score", -1), ("_id", -1)]),
+    QueryShape("GET /startups (personalized)", StartupFit, {"user_id": ""}, [("score", -1), ("startup_id", -1)]),
+    QueryShape(
+        "GET /startups?sector&stage (personalized)", StartupFit,
+        {"user_id": "", "sector": "", "stage": ""}, [("score", -1), ("startup_id", -1)]
+    ),
+    QueryShape("discovery ingest (yc_id)", Startup, {"yc_id": ""}),
+    QueryShape("discovery ingest (crunchbase_id)", Startup, {"crunchbase_id": ""}),
+    QueryShape("discovery ingest (cin)", Startup, {"cin": ""}),
+    QueryShape("GET /deals", Deal, {"user_id": ""}, [("updated_at", -1), ("_id", -1)]),
+    QueryShape("GET /deals?status", Deal, {"user_id": "", "status": ""}, [("updated_at", -1), ("_id", -1)]),
+    QueryShape("GET /deals/pipeline", Deal, {"user_id": "", "status": {"$in": [""]}}, [("priority", -1), ("updated_at", -1)]),
+    QueryShape("GET /deals/pipeline (stages)", Pipeline, {"user_id": "", "is_active": True}),
+    QueryShape("POST /deals (existing deal)", Deal, {"user_id": "", "startup_id": ""}),
+    QueryShape("GET /outreach", Outreach, {"user_id": ""}, [("created_at", -1), ("_id", -1)]),
+    QueryShape("GET /outreach/stats", Outreach, {"user_id": "", "status": ""}),
+    QueryShape("GET /discovery/jobs/{id}/results", DiscoveryResult, {"job_id": ""}, [("_id", 1)]),
+    QueryShape("GET /discovery/saved", DiscoveryResult, {"user_id": "", "is_saved": True}, [("_id", 1)]),
+]
+
+# Models whose declared indexes are checked
+INDEXED_MODELS = (Startup, Deal, Pipeline, Outreach, DiscoveryJob, DiscoveryResult, SourceWatermark, StartupFit, AIScoreCache)
+
+
+def _index_key(key: Any) -> IndexKey:
+    """Comparable key specification (text indexes compare by their _fts key)"""
+    fields = tuple((name, direction if isinstance(direction, str) else int(direction)) for name, direction in key)
+    if any(direction == "text" for _, direction in fields):
+        return (("_fts", "text"),)
+    return fields
+
+
+def _declared_key(index: Any) -> IndexKey:
+    """Key specification of a Settings.indexes entry"""
+    if isinstance(index, IndexModelField):
+        index = index.index
+    if isinstance(index, IndexModel):
+        return _index_key(index.document["key"].items())
+    if isinstance(index, str):
+        return ((index, 1),)
+    return _index_key(index)
+
+
+def _plan_stages(plan: Dict[str, Any]) -> Set[str]:
+    """Stage names of an explained plan (classic and slot-based engine formats)"""
+    stages = set()
+    pending = [plan]
+    while pending:
+        node = pending.pop()
+        if not isinstance(node, dict):
+            continue
+        if "stage" in node:
+            stages.add(node["stage"])
+        for key in ("inputStage", "queryPlan"):
+            if key in node:
+                pending.append(node[key])
+        pending.extend(node.get("inputStages", []))
+    return stages
+
+
+async def missing_indexes() -> Dict[str, List[IndexKey]]:
+    """Declared indexes that do not exist, by collection"""
+    missing = {}
+    for model in INDEXED_MODELS:
+        collection = model.get_motor_collection()
+        existing = {_index_key(info["key"]) for info in (await collection.index_information()).values()}
+        absent = [key for key in map(_declared_key, model.get_settings().indexes or []) if key not in existing]
+        if absent:
+            missing[collection.name] = absent
+    return missing
+
+
+async def explain_query(shape: QueryShape) -> List[str]:
+    """Problems with the plan of one query shape"""
+    cursor = shape.model.get_motor_collection().find(shape.filter).limit(50)
+    if shape.sort:
+        cursor = cursor.sort(shape.sort)
+    explain = await cursor.explain()
+    
+    problems = []
+    stages = _plan_stages(explain.get("queryPlanner", {}).get("winningPlan", {}))
+    if "COLLSCAN" in stages:
+        problems.append("collection scan")
+    if "SORT" in stages:
+        problems.append("in-memory sort")
+    elapsed = explain.get("executionStats", {}).get("executionTimeMillis", 0)
+    if elapsed > settings.SLOW_QUERY_MS:
+        problems.append(f"took {elapsed}ms")
+    return problems
+
+
+async def check_indexes():
+    """Log missing indexes and query shapes with poor plans"""
+    try:
+        for collection, keys in (await missing_indexes()).items():
+            for key in keys:
+                logger.warning(f"Index check: {collection} is missing index {dict(key)}")
+        
+        poor = 0
+        for shape in QUERY_SHAPES:
+            problems = await explain_query(shape)
+            if problems:
+                poor += 1
+                logger.warning(f"Index check: {shape.name} ({shape.filter}, sort {shape.sort}): {', '.join(problems)}")
+        logger.info(f"Index check: {len(QUERY_SHAPES) - poor}/{len(QUERY_SHAPES)} query shapes use an index")
+    except Exception as e:
+        logger.warning(f"Index check failed: {e}")
@@ -47,8 +47,15 @@ from app.models.discovery import (
     DiscoveryJob,
     DiscoveryResult,
     DiscoverySource,
-    DiscoveryInsight
+    DiscoveryInsight,
+    SourceWatermark
 )
+from app.models.rescore import (
+    RescoreJob,
+    RescoreJobResponse
+)
+from app.models.fit import StartupFit
+from app.models.ai_score import AIScore, AIScoreCache
 
 __all__ = [
     # Startup
@@ -93,4 +100,13 @@ __all__ = [
     "DiscoveryResult",
     "DiscoverySource",
     "DiscoveryInsight",
+    "SourceWatermark",
+    # Rescore
+    "RescoreJob",
+    "RescoreJobResponse",
+    # Fit
+    "StartupFit",
+    # AI score
+    "AIScore",
+    "AIScoreCache",
 ]
@@ -0,0 +1,37 @@
+"""
+DealFlow - AI Score Model
+LLM scoring results and their content-hash cache
+"""
+from datetime import datetime
+from typing import List
+from beanie import Document
+from pydantic import BaseModel, Field
+from pymongo import ASCENDING, IndexModel
+
+
+class AIScore(BaseModel):
+    """Scores and insights returned by the AI scoring model"""
+    team_score: float = Field(ge=0, le=100)
+    market_score: float = Field(ge=0, le=100)
+    traction_score: float = Field(ge=0, le=100)
+    unicorn_probability: float = Field(ge=0, le=100)
+    key_strengths: List[str] = Field(default_factory=list)
+    key_risks: List[str] = Field(default_factory=list)
+    recommendation: str = ""
+
+
+class AIScoreCache(Document):
+    """
+    Cached AI score
+    Keyed by a hash of the model name, prompt version and the startup fields in the prompt
+    """
+    key: str
+    model: str
+    result: AIScore
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    
+    class Settings:
+        name = "ai_score_cache"
+        indexes = [
+            IndexModel([("key", ASCENDING)], unique=True)
+        ]
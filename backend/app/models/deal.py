@@ -6,6 +6,7 @@ from datetime import datetime
 from typing import List, Optional
 from beanie import Document, Link
 from pydantic import BaseModel, Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 
 class Note(BaseModel):
@@ -79,7 +80,11 @@ class Deal(Document):
             "user_id",
             "status",
             "priority",
-            "assigned_to"
+            "assigned_to",
+            IndexModel([("user_id", ASCENDING), ("updated_at", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("user_id", ASCENDING), ("status", ASCENDING), ("updated_at", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("user_id", ASCENDING), ("status", ASCENDING), ("priority", DESCENDING), ("updated_at", DESCENDING)]),
+            IndexModel([("user_id", ASCENDING), ("startup_id", ASCENDING)])
         ]
 
 
@@ -6,6 +6,7 @@ from datetime import datetime
 from typing import List, Optional, Dict, Any
 from beanie import Document
 from pydantic import BaseModel, Field
+from pymongo import ASCENDING, IndexModel
 
 
 class DiscoverySource(BaseModel):
@@ -38,19 +39,33 @@ class DiscoveryJob(Document):
     sectors: Optional[List[str]] = None
     stages: Optional[List[str]] = None
     limit: int = 50
+    ingest: bool = False  # Upsert results into the startups collection
+    delta: bool = False  # Fetch only records newer than the per-source watermarks
     
     # Results
     startups_found: int = 0
     startups_added: int = 0
     startups_skipped: int = 0
+    startups_created: int = 0  # Ingest mode: new Startup documents
+    startups_updated: int = 0  # Ingest mode: Startup documents with changed fields
     
     # Progress tracking
     progress: int = 0  # 0-100
     current_source: Optional[str] = None
     
+    # Thesis filtering
+    filters_matched: bool = True  # Set to False if no results matched the filters
+    applied_filters: Optional[Dict[str, Any]] = None
+    
     # Errors
     errors: List[str] = Field(default_factory=list)
     
+    # Worker lease (queued jobs are claimed by worker.py)
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    heartbeat_at: Optional[datetime] = None
+    attempts: int = 0
+    
     # Timestamps
     created_at: datetime = Field(default_factory=datetime.utcnow)
     started_at: Optional[datetime] = None
@@ -61,6 +76,12 @@ class DiscoveryJob(Document):
     
     class Settings:
         collection = "discovery_job"
+        indexes = [
+            IndexModel([("job_id", ASCENDING)], unique=True),
+            "user_id",
+            IndexModel([("status", ASCENDING), ("created_at", ASCENDING)]),
+            IndexModel([("status", ASCENDING), ("lease_expires_at", ASCENDING)])
+        ]
 
 
 class DiscoveryResult(Document):
@@ -99,3 +120,24 @@ class DiscoveryResult(Document):
     
     class Settings:
         collection = "discovery_result"
+        indexes = [
+            IndexModel([("job_id", ASCENDING), ("_id", ASCENDING)]),
+            IndexModel([("user_id", ASCENDING), ("is_saved", ASCENDING), ("_id", ASCENDING)])
+        ]
+
+
+class SourceWatermark(Document):
+    """
+    Newest record seen by delta discovery runs of one source
+    Kept per filter scope, since records a filtered run never saw are still new for other filters
+    """
+    source: str  # yc, crunchbase, mca
+    scope: str = ""  # Sector/stage filters of the runs that set it
+    value: str  # See IngestionService record_watermark
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    
+    class Settings:
+        name = "source_watermarks"
+        indexes = [
+            IndexModel([("source", ASCENDING), ("scope", ASCENDING)], unique=True)
+        ]
@@ -0,0 +1,47 @@
+"""
+DealFlow - Startup Fit Model
+Per-user scores of each startup against that user's fund thesis
+"""
+from datetime import datetime
+from typing import Optional
+from beanie import Document, PydanticObjectId
+from pydantic import Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from app.models.startup import ScoreBreakdown
+
+
+class StartupFit(Document):
+    """
+    Materialized score of one startup for one user
+    Kept up to date by app.services.fits when the startup or the user's thesis changes
+    """
+    user_id: str
+    startup_id: PydanticObjectId
+    
+    # Copied from the startup so filtered rankings are served from the fit indexes
+    sector: Optional[str] = None
+    stage: Optional[str] = None
+    
+    # Scores (same fields as on Startup, computed with the user's thesis)
+    score: float = Field(default=0, ge=0, le=100)
+    score_breakdown: Optional[ScoreBreakdown] = None
+    unicorn_probability: Optional[float] = Field(None, ge=0, le=100)
+    investor_fit: Optional[str] = None
+    
+    # user.updated_at of the thesis these scores were computed with
+    thesis_updated_at: Optional[datetime] = None
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    
+    class Settings:
+        name = "startup_fits"
+        indexes = [
+            IndexModel([("user_id", ASCENDING), ("startup_id", ASCENDING)], unique=True),
+            IndexModel([("user_id", ASCENDING), ("score", DESCENDING), ("startup_id", DESCENDING)]),
+            IndexModel([
+                ("user_id", ASCENDING), ("sector", ASCENDING), ("stage", ASCENDING),
+                ("score", DESCENDING), ("startup_id", DESCENDING)
+            ]),
+            IndexModel([("user_id", ASCENDING), ("sector", ASCENDING), ("score", DESCENDING), ("startup_id", DESCENDING)]),
+            IndexModel([("user_id", ASCENDING), ("stage", ASCENDING), ("score", DESCENDING), ("startup_id", DESCENDING)]),
+            "startup_id"
+        ]
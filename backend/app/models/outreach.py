@@ -6,6 +6,7 @@ from datetime import datetime
 from typing import List, Optional
 from beanie import Document
 from pydantic import BaseModel, Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 
 class OutreachTemplate(BaseModel):
@@ -65,7 +66,9 @@ class Outreach(Document):
             "user_id",
             "startup_id",
             "status",
-            "type"
+            "type",
+            IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("user_id", ASCENDING), ("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)])
         ]
 
 
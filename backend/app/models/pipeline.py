@@ -18,6 +18,18 @@ class PipelineStage(BaseModel):
     is_terminal: bool = False  # True for "Invested" or "Passed"
 
 
+def default_stages() -> List[PipelineStage]:
+    """Stages of a pipeline the user has not customized"""
+    return [
+        PipelineStage(id="new", name="New", order=0, color="#6366f1"),
+        PipelineStage(id="contacted", name="Contacted", order=1, color="#8b5cf6"),
+        PipelineStage(id="meeting", name="Meeting", order=2, color="#a855f7"),
+        PipelineStage(id="diligence", name="Due Diligence", order=3, color="#d946ef"),
+        PipelineStage(id="passed", name="Passed", order=4, color="#ef4444", is_terminal=True),
+        PipelineStage(id="invested", name="Invested", order=5, color="#22c55e", is_terminal=True),
+    ]
+
+
 class Pipeline(Document):
     """
     Pipeline document model for MongoDB
@@ -28,14 +40,7 @@ class Pipeline(Document):
     description: Optional[str] = None
     
     # Stages
-    stages: List[PipelineStage] = Field(default_factory=lambda: [
-        PipelineStage(id="new", name="New", order=0, color="#6366f1"),
-        PipelineStage(id="contacted", name="Contacted", order=1, color="#8b5cf6"),
-        PipelineStage(id="meeting", name="Meeting", order=2, color="#a855f7"),
-        PipelineStage(id="diligence", name="Due Diligence", order=3, color="#d946ef"),
-        PipelineStage(id="passed", name="Passed", order=4, color="#ef4444", is_terminal=True),
-        PipelineStage(id="invested", name="Invested", order=5, color="#22c55e", is_terminal=True),
-    ])
+    stages: List[PipelineStage] = Field(default_factory=default_stages)
     
     # Settings
     is_default: bool = Field(default=True)
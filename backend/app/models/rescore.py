@@ -0,0 +1,58 @@
+"""
+DealFlow - Rescore Job Model
+Tracks bulk rescoring of the startups collection
+"""
+from datetime import datetime
+from typing import List, Optional
+from beanie import Document
+from pydantic import BaseModel, Field
+from pymongo import ASCENDING, IndexModel
+
+
+class RescoreJob(Document):
+    """
+    Bulk rescore job tracking
+    Progress is persisted while the job runs (see JobProgressTracker)
+    """
+    job_id: str
+    user_id: Optional[str] = None
+    status: str = "pending"  # pending, running, completed, failed
+    
+    # Progress tracking
+    total: int = 0  # Startups in the collection when the job started
+    processed: int = 0  # Startups scored so far
+    updated: int = 0  # Startups whose score fields changed
+    progress: int = 0  # 0-100
+    
+    # Errors
+    errors: List[str] = Field(default_factory=list)
+    
+    # Timestamps
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    
+    # Metadata
+    execution_time: Optional[float] = None  # seconds
+    
+    class Settings:
+        name = "rescore_jobs"
+        indexes = [
+            IndexModel([("job_id", ASCENDING)], unique=True),
+            "user_id"
+        ]
+
+
+class RescoreJobResponse(BaseModel):
+    """API Response schema for a rescore job"""
+    job_id: str
+    status: str
+    total: int
+    processed: int
+    updated: int
+    progress: int
+    errors: List[str]
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    execution_time: Optional[float] = None
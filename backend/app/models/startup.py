@@ -4,8 +4,10 @@ Matches the frontend Startup interface
 """
 from datetime import datetime
 from typing import List, Optional
+import re
 from beanie import Document
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
 
 
 class Founder(BaseModel):
@@ -24,12 +26,124 @@ class ScoreBreakdown(BaseModel):
     fit: float = Field(ge=0, le=100)
 
 
+# Amounts such as "$2.5M", "500K", "$1,200,000" or "1.2 billion"
+AMOUNT_PATTERN = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*(billion|million|thousand|bn|b|mm|m|k)?\b", re.IGNORECASE)
+AMOUNT_MULTIPLIERS = {
+    "k": 1e3, "thousand": 1e3,
+    "m": 1e6, "mm": 1e6, "million": 1e6,
+    "b": 1e9, "bn": 1e9, "billion": 1e9,
+}
+PERCENT_PATTERN = re.compile(r"([-+]?\d[\d,]*(?:\.\d+)?)\s*(%|x\b)?", re.IGNORECASE)
+
+
+def parse_amount(text: Optional[str]) -> Optional[float]:
+    """
+    Largest amount in a metric string, e.g. "$2.5M ARR" -> 2500000.0
+    Ranges such as "$0 - $50K ARR" resolve to their upper end.
+    """
+    if not text:
+        return None
+    amounts = [
+        float(number.replace(",", "")) * AMOUNT_MULTIPLIERS.get((suffix or "").lower(), 1)
+        for number, suffix in AMOUNT_PATTERN.findall(text)
+    ]
+    return max(amounts) if amounts else None
+
+
+def parse_percent(text: Optional[str]) -> Optional[float]:
+    """Growth percentage in a metric string, e.g. "+150% YoY" -> 150.0, "3x" -> 200.0"""
+    if not text:
+        return None
+    match = PERCENT_PATTERN.search(text)
+    if not match:
+        return None
+    value = float(match.group(1).replace(",", ""))
+    if (match.group(2) or "").lower() == "x":
+        return (value - 1) * 100
+    return value
+
+
+# Legal-entity suffixes dropped from names before matching ("Stripe, Inc." -> "stripe")
+NAME_SUFFIXES = {
+    "inc", "incorporated", "llc", "ltd", "limited", "corp", "corporation", "co",
+    "company", "gmbh", "plc", "pvt", "private", "pte", "sa", "ag", "bv",
+}
+
+# Keys that name exactly one company: source ids and the website domain (unique indexes where set)
+UNIQUE_KEYS = ("yc_id", "crunchbase_id", "cin", "domain")
+
+# MongoDB error code for a write that violates a unique index
+DUPLICATE_KEY = 11000
+
+
+def normalize_domain(url: Optional[str]) -> Optional[str]:
+    """Registered host of a website URL, e.g. "https://www.Stripe.com/about" -> "stripe.com" """
+    if not url:
+        return None
+    host = re.sub(r"^[a-z][a-z0-9+.-]*://", "", url.strip().lower())
+    host = re.split(r"[/?#:]", host, maxsplit=1)[0]
+    if host.startswith("www."):
+        host = host[4:]
+    return host.strip(".") or None
+
+
+def normalize_name(name: Optional[str]) -> Optional[str]:
+    """Company name reduced for matching: lowercase words, no punctuation or legal suffix"""
+    if not name:
+        return None
+    words = re.findall(r"[a-z0-9]+", name.lower())
+    while len(words) > 1 and words[-1] in NAME_SUFFIXES:
+        words.pop()
+    return " ".join(words) or None
+
+
+def search_terms(*texts: Optional[str]) -> List[str]:
+    """Distinct lowercase words of the given texts, in order (prefix search keys)"""
+    terms: List[str] = []
+    for text in texts:
+        for word in re.findall(r"[a-z0-9]+", (text or "").lower()):
+            if word not in terms:
+                terms.append(word)
+    return terms
+
+
+def normalize_cin(cin: Optional[str]) -> Optional[str]:
+    """Corporate Identification Number (India) in canonical form"""
+    if not cin:
+        return None
+    return re.sub(r"\s+", "", cin).upper() or None
+
+
 class Metrics(BaseModel):
-    """Startup metrics"""
+    """
+    Startup metrics
+    The numeric fields are parsed from the display strings whenever those are set,
+    so they can be indexed, range-filtered and read directly by scoring.
+    """
     revenue: Optional[str] = None
     growth: Optional[str] = None
     users: Optional[str] = None
     funding: Optional[str] = None
+    
+    # Parsed values
+    revenue_usd: Optional[float] = None
+    growth_pct: Optional[float] = None
+    users_count: Optional[int] = None
+    funding_usd: Optional[float] = None
+    
+    @model_validator(mode="after")
+    def parse_numeric_fields(self) -> "Metrics":
+        if self.revenue:
+            self.revenue_usd = parse_amount(self.revenue)
+        if self.growth:
+            self.growth_pct = parse_percent(self.growth)
+        if self.users:
+            # "Fortune 500" names a customer segment, not a count
+            count = parse_amount(re.sub(r"fortune\s*\d+", "", self.users, flags=re.IGNORECASE))
+            self.users_count = int(count) if count is not None else None
+        if self.funding:
+            self.funding_usd = parse_amount(self.funding)
+        return self
 
 
 class Startup(Document):
@@ -78,21 +192,60 @@ class Startup(Document):
     angellist_id: Optional[str] = None
     linkedin_url: Optional[str] = None
     website: Optional[str] = None
+    cin: Optional[str] = None  # MCA Corporate Identification Number (India)
+    
+    # Entity resolution keys (derived from website and name)
+    domain: Optional[str] = None
+    name_key: Optional[str] = None
+    
+    # Typeahead search keys (words of name and tagline)
+    search_terms: List[str] = Field(default_factory=list)
     
     # YC specific data
     yc_batch: Optional[str] = None  # e.g., "W24", "S23"
     yc_status: Optional[str] = None  # active, acquired, dead
     
+    @model_validator(mode="after")
+    def set_derived_keys(self) -> "Startup":
+        """Derive matching and search keys (call again after assigning fields)"""
+        self.domain = normalize_domain(self.website) or self.domain
+        self.name_key = normalize_name(self.name)
+        self.cin = normalize_cin(self.cin)
+        self.search_terms = search_terms(self.name, self.tagline)
+        return self
+    
     class Settings:
         name = "startups"
         indexes = [
             "name",
             "sector",
             "stage",
-            "score",
+            IndexModel([("score", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("sector", ASCENDING), ("stage", ASCENDING), ("score", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("sector", ASCENDING), ("score", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("stage", ASCENDING), ("score", DESCENDING), ("_id", DESCENDING)]),
             "deal_status",
-            "crunchbase_id",
-            "yc_id",
+            # Source ids and domains identify a company: unique where set (ingest relies on it)
+            *[
+                IndexModel(
+                    [(key, ASCENDING)],
+                    name=f"{key}_unique",
+                    unique=True,
+                    partialFilterExpression={key: {"$type": "string"}}
+                )
+                for key in UNIQUE_KEYS
+            ],
+            "metrics.revenue_usd",
+            "metrics.growth_pct",
+            "metrics.users_count",
+            "metrics.funding_usd",
+            "name_key",
+            "search_terms",
+            IndexModel(
+                [("name", TEXT), ("tagline", TEXT), ("description", TEXT)],
+                name="startup_text",
+                weights={"name": 10, "tagline": 4, "description": 1}
+            ),
         ]
 
 
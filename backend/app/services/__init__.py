@@ -3,10 +3,14 @@ DealFlow Backend - Services Module
 """
 from app.services.ingestion import IngestionService
 from app.services.scoring import ScoringService
+from app.services.batch_scoring import BatchScorer
+from app.services.thesis import CompiledThesis
 from app.services.outreach import OutreachService
 
 __all__ = [
     "IngestionService",
     "ScoringService",
+    "BatchScorer",
+    "CompiledThesis",
     "OutreachService"
 ]
@@ -0,0 +1,216 @@
+"""
+DealFlow Backend - AI Scoring Pipeline
+Batched OpenAI scoring with bounded concurrency, rate limiting and a result cache
+
+Startups are hashed on the fields that go into the prompt (plus model name and
+prompt version). Cached hashes are answered from Mongo; the rest are grouped into
+batches of AI_SCORING_BATCH_SIZE per request, sent with at most
+AI_SCORING_CONCURRENCY requests in flight and AI_SCORING_RATE_LIMIT requests per
+second. Responses must be a JSON object (requested through JSON mode when
+AI_SCORING_JSON_MODE is on, otherwise only through the prompt) and every entry is
+validated into an AIScore; anything that fails is returned as None and not cached.
+"""
+import asyncio
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Sequence
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+from loguru import logger
+from app.core.config import settings
+from app.core.http import get_openai_client
+from app.core.rate_limit import TokenBucket
+from app.models.ai_score import AIScore, AIScoreCache
+from app.models.startup import Startup
+
+# Bump when the prompt or the AIScore schema changes to invalidate cached results
+PROMPT_VERSION = 1
+
+SYSTEM_PROMPT = "You are a VC analyst scoring startups. Reply with a single JSON object and nothing else."
+
+USER_PROMPT = """Analyze each startup below and score it.
+
+Reply with a JSON object of the form {"results": [...]} containing one entry per startup with:
+- id: the startup's id, exactly as given
+- team_score, market_score, traction_score, unicorn_probability: numbers from 0 to 100
+- key_strengths: list of 3 short strings
+- key_risks: list of 3 short strings
+- recommendation: one sentence
+
+Startups:
+"""
+
+
+def prompt_fields(startup: Startup) -> Dict[str, Any]:
+    """The startup fields sent to the model (and hashed for the cache)"""
+    return {
+        "name": startup.name,
+        "sector": startup.sector,
+        "stage": startup.stage,
+        "tagline": startup.tagline,
+        "description": startup.description,
+        "founders": [
+            {"name": f.name, "role": f.role, "background": f.background}
+            for f in startup.founders
+        ],
+        "metrics": {
+            "revenue": startup.metrics.revenue,
+            "growth": startup.metrics.growth,
+            "users": startup.metrics.users,
+            "funding": startup.metrics.funding
+        } if startup.metrics else None,
+        "signals": startup.signals,
+    }
+
+
+def cache_key(fields: Dict[str, Any], model: str) -> str:
+    """Content hash of the prompt inputs for one startup"""
+    payload = json.dumps(
+        {"model": model, "prompt_version": PROMPT_VERSION, "startup": fields},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def parse_scores(content: Optional[str], ids: Sequence[str]) -> Dict[str, AIScore]:
+    """
+    Strictly parse a batch response into AIScores by id
+    The content must be a JSON object with a "results" list; entries with an unknown
+    id or failing validation are dropped (and logged).
+    """
+    data = json.loads(content or "")
+    results = data.get("results") if isinstance(data, dict) else None
+    if not isinstance(results, list):
+        raise ValueError('response has no "results" list')
+    
+    wanted = set(ids)
+    scores: Dict[str, AIScore] = {}
+    for item in results:
+        if not isinstance(item, dict) or str(item.get("id")) not in wanted:
+            logger.warning(f"AI scoring: ignoring unexpected result entry {str(item)[:100]}")
+            continue
+        try:
+            scores[str(item["id"])] = AIScore.model_validate(
+                {k: v for k, v in item.items() if k != "id"}, strict=True
+            )
+        except ValidationError as e:
+            logger.warning(f"AI scoring: invalid result for id {item['id']}: {e.errors()[:2]}")
+    return scores
+
+
+class AIScoringPipeline:
+    """
+    Scores startups with the OpenAI API
+    Use get_ai_scoring_pipeline() so concurrency and rate limits are shared process-wide.
+    """
+    
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        rate_limit: Optional[float] = None,
+        use_cache: Optional[bool] = None,
+        json_mode: Optional[bool] = None
+    ):
+        self.model = model or settings.AI_SCORING_MODEL
+        self.batch_size = max(1, batch_size or settings.AI_SCORING_BATCH_SIZE)
+        self.use_cache = settings.AI_SCORING_CACHE_ENABLED if use_cache is None else use_cache
+        self.json_mode = settings.AI_SCORING_JSON_MODE if json_mode is None else json_mode
+        self._semaphore = asyncio.Semaphore(max(1, concurrency or settings.AI_SCORING_CONCURRENCY))
+        rate = rate_limit if rate_limit is not None else settings.AI_SCORING_RATE_LIMIT
+        self._limiter = TokenBucket(rate) if rate and rate > 0 else None
+        
+        # API calls made by this pipeline (for logging and tests against a stub server)
+        self.requests = 0
+    
+    async def _cached(self, keys: List[str]) -> Dict[str, AIScore]:
+        if not self.use_cache or not keys:
+            return {}
+        entries = await AIScoreCache.find({"key": {"$in": keys}}).to_list()
+        return {entry.key: entry.result for entry in entries}
+    
+    async def _store(self, results: Dict[str, AIScore]):
+        if not self.use_cache or not results:
+            return
+        entries = [AIScoreCache(key=key, model=self.model, result=score) for key, score in results.items()]
+        try:
+            await AIScoreCache.insert_many(entries, ordered=False)
+        except BulkWriteError:
+            pass  # Another request cached the same startup first
+    
+    async def _request(self, batch: Dict[str, Dict[str, Any]]) -> Dict[str, AIScore]:
+        """Score one batch (cache key -> prompt fields) with a single API call"""
+        client = get_openai_client()
+        # Short ids keep the prompt small; they are mapped back to cache keys below
+        ids = {str(i): key for i, key in enumerate(batch)}
+        startups = [{"id": i, **batch[key]} for i, key in ids.items()]
+        # Models without JSON mode reject response_format; their replies still go through parse_scores
+        options = {"response_format": {"type": "json_object"}} if self.json_mode else {}
+        
+        async with self._semaphore:
+            if self._limiter:
+                await self._limiter.acquire()
+            self.requests += 1
+            response = await client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": USER_PROMPT + json.dumps(startups, default=str)}
+                ],
+                temperature=0.3,
+                **options
+            )
+        
+        scores = parse_scores(response.choices[0].message.content, list(ids))
+        return {ids[i]: score for i, score in scores.items()}
+    
+    async def score(self, startups: Sequence[Startup]) -> List[Optional[AIScore]]:
+        """AI scores for startups, in input order (None where scoring failed or is unavailable)"""
+        if not startups or get_openai_client() is None:
+            return [None] * len(startups)
+        
+        fields = [prompt_fields(startup) for startup in startups]
+        keys = [cache_key(f, self.model) for f in fields]
+        results = await self._cached(list(set(keys)))
+        
+        # Unique uncached startups, batched per request
+        pending: Dict[str, Dict[str, Any]] = {}
+        for key, f in zip(keys, fields):
+            if key not in results:
+                pending.setdefault(key, f)
+        pending_keys = list(pending)
+        batches = [
+            {key: pending[key] for key in pending_keys[i:i + self.batch_size]}
+            for i in range(0, len(pending_keys), self.batch_size)
+        ]
+        
+        if batches:
+            logger.info(
+                f"AI scoring: {len(startups)} startups, {sum(key in results for key in keys)} cached, "
+                f"{len(pending)} to score in {len(batches)} requests"
+            )
+            responses = await asyncio.gather(*(self._request(batch) for batch in batches), return_exceptions=True)
+            fresh: Dict[str, AIScore] = {}
+            for batch, response in zip(batches, responses):
+                if isinstance(response, BaseException):
+                    logger.error(f"AI scoring request for {len(batch)} startups failed: {response}")
+                    continue
+                fresh.update(response)
+            await self._store(fresh)
+            results.update(fresh)
+        
+        return [results.get(key) for key in keys]
+
+
+_pipeline: Optional[AIScoringPipeline] = None
+
+
+def get_ai_scoring_pipeline() -> AIScoringPipeline:
+    """Process-wide pipeline sharing one semaphore and rate limiter"""
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = AIScoringPipeline()
+    return _pipeline
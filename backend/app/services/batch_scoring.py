@@ -0,0 +1,190 @@
+"""
+DealFlow Backend - Batch Scoring Engine
+Scores many startups against one thesis, column-wise with NumPy
+
+Per-startup text is reduced to integer points through the compiled keyword matchers
+and lookup tables memoized per distinct value (sectors, stages, locations, users
+strings and signals repeat heavily across the collection). The sub-scores, weighted
+overall score and unicorn probability are then computed as NumPy columns. Results
+are identical to ScoringService.calculate_score for every startup.
+"""
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import numpy as np
+from app.models.startup import Startup, ScoreBreakdown
+from app.services.scoring import (
+    SCORE_WEIGHTS,
+    HOT_SECTORS,
+    STAGE_SCORES,
+    MARKET_KEYWORDS,
+    team_points,
+    revenue_points,
+    growth_points,
+    users_points,
+    signal_points,
+    ScoringService,
+)
+from app.services.thesis import ThesisLike, compile_thesis
+
+
+def first_match_points(value: str, table: Dict[str, int]) -> int:
+    """Points of the first table key (in table order) contained in value"""
+    for key, points in table.items():
+        if key in value:
+            return points
+    return 0
+
+
+class MemoTable:
+    """Caches fn(value) per distinct value"""
+    
+    def __init__(self, fn: Callable[[Any], Any]):
+        self.fn = fn
+        self.values: Dict[Any, Any] = {}
+    
+    def __call__(self, value: Any) -> Any:
+        try:
+            return self.values[value]
+        except KeyError:
+            result = self.values[value] = self.fn(value)
+            return result
+
+
+class BatchScorer:
+    """
+    Scores a list of startups against a single thesis
+    
+    Build once per thesis and reuse across chunks; the memo tables keep growing
+    with the distinct values seen, so later chunks are mostly table lookups.
+    """
+    
+    def __init__(self, thesis: ThesisLike = None, scoring_service: Optional[ScoringService] = None):
+        self.thesis = compile_thesis(thesis)
+        self.scoring_service = scoring_service or ScoringService()
+        
+        # Market tables
+        self.sector_points = MemoTable(lambda sector: first_match_points(sector, HOT_SECTORS))
+        self.stage_points = MemoTable(lambda stage: first_match_points(stage, STAGE_SCORES))
+        self.hub_points = MemoTable(
+            lambda location: 5 if "startup_hub" in MARKET_KEYWORDS.categories(location) else 0
+        )
+        
+        # Traction tables
+        self.users_points = MemoTable(users_points)
+        self.signal_points = MemoTable(signal_points)
+        
+        # Fit tables (thesis is fixed for the scorer's lifetime)
+        self.fit_points = MemoTable(self._fit_points)
+        self.fit_descriptions: Dict[tuple, str] = {}
+    
+    def _fit_points(self, key: tuple) -> int:
+        """Thesis fit points (before clamping) for a (sector, stage, location) triple"""
+        sector, stage, location = key
+        return 50 + self.thesis.fit_adjustment(sector, stage, location)
+    
+    def _fit_description(self, startup: Startup, fit_score: float) -> str:
+        # The description only depends on sector, stage, location and the fit score,
+        # which is itself a function of those three for a fixed thesis
+        key = (startup.sector, startup.stage, startup.location)
+        description = self.fit_descriptions.get(key)
+        if description is None:
+            description = self.scoring_service._generate_fit_description(startup, self.thesis, fit_score)
+            self.fit_descriptions[key] = description
+        return description
+    
+    def score(self, startups: Sequence[Startup]) -> List[Dict[str, Any]]:
+        """Score startups; returns one calculate_score-shaped dict per startup, in order"""
+        n = len(startups)
+        if n == 0:
+            return []
+        
+        team_bonus = np.zeros(n)
+        has_metrics = np.zeros(n, dtype=bool)
+        traction_points = np.zeros(n)
+        market_points = np.zeros(n)
+        fit_points = np.zeros(n)
+        unicorn_adjustments = np.zeros(n)
+        
+        for i, startup in enumerate(startups):
+            # Team
+            if startup.founders:
+                points = sum(
+                    team_points(founder.background, founder.role, founder.linkedin)
+                    for founder in startup.founders
+                )
+                if len(startup.founders) >= 2:
+                    points += 5
+                team_bonus[i] = points
+            
+            # Traction (signals only count when metrics are present)
+            metrics = startup.metrics
+            if metrics:
+                has_metrics[i] = True
+                points = 0
+                if metrics.revenue:
+                    points += revenue_points(metrics.revenue_usd)
+                if metrics.growth:
+                    points += growth_points(metrics.growth_pct)
+                if metrics.users:
+                    points += self.users_points(metrics.users)
+                if startup.signals:
+                    points += sum(self.signal_points(signal) for signal in startup.signals)
+                traction_points[i] = points
+            
+            # Market
+            sector_lower = startup.sector.lower() if startup.sector else ""
+            stage_lower = startup.stage.lower() if startup.stage else ""
+            location_lower = startup.location.lower() if startup.location else ""
+            market_points[i] = (
+                self.sector_points(sector_lower)
+                + self.stage_points(stage_lower)
+                + self.hub_points(location_lower)
+                + (10 if startup.yc_batch else 0)
+            )
+            
+            # Fit
+            if self.thesis:
+                fit_points[i] = self.fit_points((startup.sector, startup.stage, startup.location))
+            
+            # Unicorn adjustments
+            adjustments = 0
+            if startup.yc_batch:
+                adjustments += 15
+            if len(startup.sources) >= 3:
+                adjustments += 5
+            if startup.signals and len(startup.signals) >= 4:
+                adjustments += 5
+            unicorn_adjustments[i] = adjustments
+        
+        # Column-wise scores; operation order mirrors ScoringService so floats match exactly
+        team = np.minimum(100, 50.0 + team_bonus)
+        traction = np.where(has_metrics, np.minimum(100, 50.0 + traction_points), 50.0)
+        market = np.minimum(100, 60.0 + market_points)
+        if self.thesis:
+            fit = np.maximum(0, np.minimum(100, fit_points))
+        else:
+            fit = np.full(n, 70.0)
+        
+        overall = (
+            team * SCORE_WEIGHTS["team"] +
+            traction * SCORE_WEIGHTS["traction"] +
+            market * SCORE_WEIGHTS["market"] +
+            fit * SCORE_WEIGHTS["fit"]
+        )
+        unicorn = np.minimum(99, (team * 0.35 + traction * 0.35 + market * 0.30) * 0.9 + unicorn_adjustments)
+        
+        # Python's round() (not np.round) so rounding matches the per-item path
+        results = []
+        for i, startup in enumerate(startups):
+            fit_score = float(fit[i])
+            results.append({
+                "overall_score": round(float(overall[i]), 1),
+                "breakdown": ScoreBreakdown(
+                    team=round(float(team[i]), 1),
+                    traction=round(float(traction[i]), 1),
+                    market=round(float(market[i]), 1),
+                    fit=round(fit_score, 1)
+                ),
+                "unicorn_probability": round(float(unicorn[i]), 1),
+                "investor_fit": self._fit_description(startup, fit_score)
+            })
+        return results
@@ -0,0 +1,89 @@
+"""
+DealFlow Backend - Batched document writer
+Buffers Beanie documents and writes them with unordered insert_many
+"""
+import time
+from typing import Callable, Generic, List, Optional, Type, TypeVar
+from beanie import Document, PydanticObjectId
+from pymongo.errors import BulkWriteError
+from loguru import logger
+
+DocT = TypeVar("DocT", bound=Document)
+
+
+class DocumentBatchWriter(Generic[DocT]):
+    """
+    Collects documents and inserts them `batch_size` at a time, or sooner once the
+    oldest buffered document has waited `flush_interval` seconds.
+    
+    Inserts are unordered, so one bad document does not block the rest of its batch;
+    each failed document is passed to `on_error(document, message)`. Ids are assigned
+    client-side before insert so callers can reference documents once they are written.
+    """
+    
+    def __init__(
+        self,
+        document_model: Type[DocT],
+        batch_size: int = 100,
+        on_error: Optional[Callable[[DocT, str], None]] = None,
+        flush_interval: Optional[float] = None
+    ):
+        self.document_model = document_model
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.on_error = on_error
+        self.written: List[DocT] = []
+        self.failed: List[DocT] = []
+        self._buffer: List[DocT] = []
+        self._buffered_since = 0.0
+    
+    @property
+    def inserted_count(self) -> int:
+        return len(self.written)
+    
+    async def add(self, document: DocT):
+        """Buffer a document, flushing when the batch is full or has waited too long"""
+        if not self._buffer:
+            self._buffered_since = time.monotonic()
+        self._buffer.append(document)
+        if len(self._buffer) >= self.batch_size:
+            await self.flush()
+        elif self.flush_interval is not None and time.monotonic() - self._buffered_since >= self.flush_interval:
+            await self.flush()
+    
+    async def flush(self) -> int:
+        """Write everything buffered; returns the number of documents inserted"""
+        if not self._buffer:
+            return 0
+        
+        batch, self._buffer = self._buffer, []
+        for document in batch:
+            if document.id is None:
+                document.id = PydanticObjectId()
+        
+        errors = {}
+        try:
+            await self.document_model.insert_many(batch, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                errors[error["index"]] = error.get("errmsg", "write error")
+        except Exception as e:
+            errors = {index: str(e) for index in range(len(batch))}
+        
+        for index, document in enumerate(batch):
+            if index in errors:
+                self.failed.append(document)
+                if self.on_error:
+                    self.on_error(document, errors[index])
+            else:
+                self.written.append(document)
+        
+        inserted = len(batch) - len(errors)
+        logger.info(f"Inserted {inserted}/{len(batch)} {self.document_model.__name__} documents")
+        return inserted
+    
+    async def __aenter__(self) -> "DocumentBatchWriter[DocT]":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.flush()
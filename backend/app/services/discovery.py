@@ -0,0 +1,255 @@
+"""
+DealFlow Backend - Discovery Job Runner
+Runs discovery jobs from the API process or from a dedicated worker (see worker.py)
+"""
+from datetime import datetime
+from typing import List, Optional, Dict, Any
+import logging
+from app.core.config import settings
+from app.models.discovery import DiscoveryJob, DiscoveryResult, DiscoverySource
+from app.models.user import User
+from app.services.batch_writer import DocumentBatchWriter
+from app.services.entity_resolution import EntityResolver, match_existing_startups
+from app.services.ingestion import IngestionService
+from app.services.jobs import JobProgressTracker
+from app.services.scoring import ScoringService
+from app.services.startup_ingest import upsert_startups
+from app.services.thesis import CompiledThesis, get_compiled_thesis
+from app.services.watermarks import load_watermarks, next_watermarks, save_watermarks, watermark_scope
+
+logger = logging.getLogger(__name__)
+
+
+async def get_discovery_job(job_id: str) -> Optional[DiscoveryJob]:
+    """Load a discovery job by its public job ID"""
+    return await DiscoveryJob.find_one(DiscoveryJob.job_id == job_id)
+
+
+async def get_user_thesis(user_id: Optional[str]) -> Optional[CompiledThesis]:
+    """Compiled thesis of the job's owner, if any"""
+    if not user_id:
+        return None
+    try:
+        return get_compiled_thesis(await User.get(user_id))
+    except Exception as e:
+        logger.warning(f"Could not load thesis for user {user_id}: {e}")
+        return None
+
+
+async def run_discovery_job(
+    job: DiscoveryJob,
+    ingestion_service: Optional[IngestionService] = None,
+    scoring_service: Optional[ScoringService] = None
+):
+    """
+    Run a discovery job
+    Fetches from APIs, stores in MongoDB, generates insights
+    Filters results based on user thesis (sectors, stages)
+    Job state is persisted on the DiscoveryJob document with throttled progress writes
+    """
+    job_id = job.job_id
+    sources = job.sources
+    limit_per_source = job.limit
+    user_id = job.user_id
+    sectors = job.sectors
+    stages = job.stages
+    ingestion_service = ingestion_service or IngestionService()
+    scoring_service = scoring_service or ScoringService()
+    
+    progress = JobProgressTracker(job)
+    
+    try:
+        await progress.update(force=True, status="running", started_at=datetime.utcnow())
+        
+        logger.info(f"Starting discovery job {job_id} with sectors={sectors}, stages={stages}")
+        
+        total_startups = 0
+        thesis = await get_user_thesis(user_id)
+        
+        def on_save_error(result: DiscoveryResult, message: str):
+            logger.error(f"Failed to save startup {result.name}: {message}")
+            progress.add_error(f"Save error for {result.name}: {message}")
+        
+        # Results are buffered and written with unordered insert_many; the flush interval
+        # keeps them showing up on the job's event stream while the job is running
+        writer = DocumentBatchWriter(
+            DiscoveryResult,
+            batch_size=settings.DISCOVERY_INSERT_BATCH_SIZE,
+            on_error=on_save_error,
+            flush_interval=settings.DISCOVERY_INSERT_FLUSH_INTERVAL
+        )
+        
+        # Fetch all sources concurrently with thesis filtering
+        source_names = [source.lower() for source in sources]
+        completed_sources = []
+        
+        async def on_source_complete(source: str, startups: List[Dict[str, Any]]):
+            completed_sources.append(source)
+            await progress.update(
+                current_source=source,
+                progress=int((len(completed_sources) / len(source_names)) * 50)
+            )
+        
+        # Delta mode: only fetch records newer than the per-source watermarks
+        scope = watermark_scope(sectors, stages)
+        watermarks: Dict[str, str] = {}
+        if job.delta:
+            try:
+                watermarks = await load_watermarks(source_names, scope)
+                logger.info(f"Discovery job {job_id}: delta run from watermarks {watermarks}")
+            except Exception as e:
+                logger.warning(f"Could not load source watermarks, fetching in full: {e}")
+        
+        logger.info(f"Fetching from sources: {source_names} with filters: sectors={sectors}, stages={stages}")
+        fetched = await ingestion_service.fetch_from_all_sources(
+            limit_per_source=limit_per_source,
+            sectors=sectors,
+            stages=stages,
+            sources=source_names,
+            since=watermarks,
+            on_source_complete=on_source_complete
+        )
+        
+        # Merge records of the same company across sources (and within a source)
+        resolver = EntityResolver()
+        for source in sources:
+            if source.lower() not in ingestion_service.SOURCES:
+                continue
+            
+            startups_data = fetched.get(source.lower())
+            if startups_data is None:
+                progress.add_error(f"Error fetching from {source}: timed out or failed")
+                continue
+            
+            total_startups += len(startups_data)
+            for startup_data in startups_data:
+                resolver.add(source.lower(), startup_data)
+        
+        entities = resolver.entities
+        logger.info(f"Discovery job {job_id}: {total_startups} records resolved to {len(entities)} companies")
+        
+        try:
+            existing = await match_existing_startups(entities)
+        except Exception as e:
+            logger.warning(f"Could not match existing startups: {e}")
+            existing = {}
+        
+        await progress.update(startups_skipped=resolver.duplicates)
+        
+        # Ingest mode: upsert the companies into the startups collection
+        if job.ingest:
+            try:
+                outcome = await upsert_startups(entities, thesis)
+                existing.update(outcome.startup_ids)
+                for error in outcome.errors:
+                    progress.add_error(error)
+                await progress.update(
+                    startups_created=outcome.created,
+                    startups_updated=outcome.updated
+                )
+                logger.info(
+                    f"Discovery job {job_id}: ingested {outcome.created} new and {outcome.updated} changed startups "
+                    f"({outcome.unchanged} unchanged, {outcome.skipped} without an ingest key)"
+                )
+            except Exception as e:
+                logger.error(f"Discovery job {job_id}: ingest failed: {e}")
+                progress.add_error(f"Ingest failed: {str(e)}")
+        
+        to_process = len(entities) or 1
+        processed = 0
+        
+        # Process and store each company
+        for position, entity in enumerate(entities):
+            startup_data = entity.data
+            try:
+                # Create discovery result
+                discovery_result = DiscoveryResult(
+                    job_id=job_id,
+                    user_id=str(user_id) if user_id else None,
+                    startup_id=existing.get(position),
+                    name=startup_data.get("name", ""),
+                    sector=startup_data.get("sector", "Technology"),
+                    stage=startup_data.get("stage"),
+                    location=startup_data.get("location"),
+                    website=startup_data.get("website"),
+                    description=startup_data.get("description") or startup_data.get("tagline", ""),
+                    tagline=startup_data.get("tagline", ""),
+                    sources=[
+                        DiscoverySource(
+                            name=source,
+                            url=url,
+                            relevance_score=0.8
+                        )
+                        for source, url in entity.sources.items()
+                    ],
+                    discovery_score=75  # Score on 0-100 scale
+                )
+                
+                # Generate AI insights
+                try:
+                    insights = await scoring_service.generate_insights(startup_data)
+                    if insights:
+                        discovery_result.ai_insights = insights
+                except Exception as e:
+                    logger.warning(f"Could not generate insights for {startup_data.get('name')}: {e}")
+                
+                # Calculate fit score
+                try:
+                    fit_score = await scoring_service.calculate_fit_score(startup_data, thesis)
+                    discovery_result.fit_score = fit_score
+                except Exception as e:
+                    logger.warning(f"Could not calculate fit score: {e}")
+                
+                # Queue for batched insert into MongoDB
+                await writer.add(discovery_result)
+            except Exception as e:
+                logger.error(f"Error processing startup {startup_data.get('name')}: {e}")
+                progress.add_error(f"Error processing {startup_data.get('name')}: {str(e)}")
+            
+            processed += 1
+            await progress.update(progress=50 + int((processed / to_process) * 49))
+        
+        await writer.flush()
+        total_added = writer.inserted_count
+        
+        # Check if any results matched the filters
+        # If we have results but they don't match the requested sectors/stages, filters didn't match
+        filters_matched = True
+        if total_added > 0 and (sectors or stages):
+            # Check the saved results against the filters
+            filters_matched = False
+            for result in writer.written:
+                sector_ok = not sectors or len(sectors) == 0 or result.sector in sectors or "Sector Agnostic" in sectors
+                stage_ok = not stages or len(stages) == 0 or result.stage in stages
+                if sector_ok and stage_ok:
+                    filters_matched = True
+                    break
+            if not filters_matched:
+                logger.warning(f"Discovery job {job_id}: No results matched filters. Showing all results instead.")
+        
+        # Advance watermarks only once the fetched records have been processed
+        if job.delta:
+            try:
+                await save_watermarks(next_watermarks(fetched, watermarks), scope)
+            except Exception as e:
+                logger.warning(f"Could not save source watermarks: {e}")
+        
+        # Update job status
+        completed_at = datetime.utcnow()
+        await progress.update(
+            force=True,
+            status="completed",
+            progress=100,
+            startups_found=total_startups,
+            startups_added=total_added,
+            filters_matched=filters_matched,
+            completed_at=completed_at,
+            execution_time=(completed_at - job.started_at).total_seconds()
+        )
+        
+        logger.info(f"Discovery job {job_id} completed. Added {total_added} startups from {total_startups} found")
+    
+    except Exception as e:
+        logger.error(f"Discovery job {job_id} failed: {e}")
+        progress.add_error(str(e))
+        await progress.update(force=True, status="failed", completed_at=datetime.utcnow())
@@ -0,0 +1,176 @@
+"""
+DealFlow Backend - Discovery Worker
+Claims queued DiscoveryJob documents from MongoDB and runs them outside the API process
+
+Jobs are claimed with an atomic find-and-modify that sets a lease (owner + expiry).
+While a job runs its lease is renewed by a heartbeat; if the worker dies the lease
+lapses and another worker reclaims the job, up to DISCOVERY_JOB_MAX_ATTEMPTS claims.
+"""
+import asyncio
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+import logging
+from pymongo import ASCENDING, ReturnDocument
+from app.core.config import settings
+from app.models.discovery import DiscoveryJob, DiscoveryResult
+from app.services.discovery import run_discovery_job
+
+logger = logging.getLogger(__name__)
+
+
+def make_worker_id() -> str:
+    """Unique lease owner name for this process"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class DiscoveryWorker:
+    """Runs up to `concurrency` queued discovery jobs at a time"""
+    
+    def __init__(self, concurrency: Optional[int] = None, worker_id: Optional[str] = None):
+        self.worker_id = worker_id or make_worker_id()
+        self.concurrency = max(1, concurrency or settings.DISCOVERY_WORKER_CONCURRENCY)
+        self.lease = timedelta(seconds=settings.DISCOVERY_JOB_LEASE_SECONDS)
+        self._running: Dict[str, asyncio.Task] = {}
+        self._stopping = asyncio.Event()
+        self._wake = asyncio.Event()
+    
+    def stop(self):
+        """Stop claiming new jobs; running jobs are allowed to finish"""
+        logger.info(f"Worker {self.worker_id} stopping...")
+        self._stopping.set()
+        self._wake.set()
+    
+    async def claim(self) -> Optional[DiscoveryJob]:
+        """Atomically lease the oldest queued (or abandoned) job"""
+        now = datetime.utcnow()
+        raw = await DiscoveryJob.get_motor_collection().find_one_and_update(
+            {
+                "$or": [
+                    {"status": "pending", "lease_owner": None},
+                    {"status": "running", "lease_expires_at": {"$lt": now}}
+                ],
+                "attempts": {"$lt": settings.DISCOVERY_JOB_MAX_ATTEMPTS}
+            },
+            {
+                "$set": {
+                    "status": "running",
+                    "lease_owner": self.worker_id,
+                    "lease_expires_at": now + self.lease,
+                    "heartbeat_at": now
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("created_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER
+        )
+        if raw is None:
+            return None
+        return DiscoveryJob.model_validate(raw)
+    
+    async def fail_abandoned_jobs(self):
+        """Mark jobs that lost their lease too many times as failed"""
+        now = datetime.utcnow()
+        result = await DiscoveryJob.get_motor_collection().update_many(
+            {
+                "status": "running",
+                "lease_expires_at": {"$lt": now},
+                "attempts": {"$gte": settings.DISCOVERY_JOB_MAX_ATTEMPTS}
+            },
+            {
+                "$set": {"status": "failed", "completed_at": now, "lease_expires_at": None},
+                "$push": {"errors": f"Job abandoned after {settings.DISCOVERY_JOB_MAX_ATTEMPTS} attempts"}
+            }
+        )
+        if result.modified_count:
+            logger.warning(f"Marked {result.modified_count} abandoned discovery job(s) as failed")
+    
+    async def _heartbeat(self, job: DiscoveryJob, task: asyncio.Task):
+        """
+        Renew the lease while the job runs; cancel the job once the lease is lost
+        A failed renewal is retried on the next beat; the job is only cancelled when
+        another worker took the lease or it expired without a successful renewal.
+        """
+        lease_expires_at = job.lease_expires_at or datetime.utcnow() + self.lease
+        while True:
+            await asyncio.sleep(settings.DISCOVERY_JOB_HEARTBEAT_INTERVAL)
+            now = datetime.utcnow()
+            try:
+                result = await DiscoveryJob.get_motor_collection().update_one(
+                    {"_id": job.id, "lease_owner": self.worker_id, "status": "running"},
+                    {"$set": {"lease_expires_at": now + self.lease, "heartbeat_at": now}}
+                )
+            except Exception as e:
+                if now < lease_expires_at:
+                    logger.warning(f"Could not renew lease on discovery job {job.job_id}, retrying: {e}")
+                    continue
+                logger.error(f"Lease on discovery job {job.job_id} expired while renewals failed: {e}")
+                lost = True
+            else:
+                lost = result.matched_count == 0
+                if not lost:
+                    lease_expires_at = now + self.lease
+            
+            if lost:
+                if not task.done():
+                    logger.warning(f"Lost lease on discovery job {job.job_id}, cancelling")
+                    task.cancel()
+                return
+    
+    async def _execute(self, job: DiscoveryJob):
+        if job.attempts > 1:
+            # Drop partial results from an interrupted attempt before starting over
+            await DiscoveryResult.find(DiscoveryResult.job_id == job.job_id).delete()
+            logger.info(f"Retrying discovery job {job.job_id} (attempt {job.attempts})")
+        
+        task = asyncio.create_task(run_discovery_job(job))
+        heartbeat = asyncio.create_task(self._heartbeat(job, task))
+        try:
+            await task
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                raise
+        finally:
+            heartbeat.cancel()
+    
+    def _start(self, job: DiscoveryJob):
+        logger.info(f"Worker {self.worker_id} claimed discovery job {job.job_id}")
+        task = asyncio.create_task(self._execute(job))
+        self._running[job.job_id] = task
+        
+        def done(finished: asyncio.Task):
+            self._running.pop(job.job_id, None)
+            if not finished.cancelled() and finished.exception():
+                logger.error(f"Discovery job {job.job_id} crashed: {finished.exception()}")
+            self._wake.set()
+        
+        task.add_done_callback(done)
+    
+    async def run(self):
+        """Claim and run jobs until stop() is called"""
+        logger.info(f"Discovery worker {self.worker_id} started (concurrency={self.concurrency})")
+        
+        while not self._stopping.is_set():
+            try:
+                await self.fail_abandoned_jobs()
+                while len(self._running) < self.concurrency and not self._stopping.is_set():
+                    job = await self.claim()
+                    if job is None:
+                        break
+                    self._start(job)
+            except Exception as e:
+                logger.error(f"Error polling discovery queue: {e}")
+            
+            # Sleep until the next poll, or until a slot frees up
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=settings.DISCOVERY_WORKER_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+        
+        if self._running:
+            logger.info(f"Waiting for {len(self._running)} running discovery job(s) to finish...")
+            await asyncio.gather(*self._running.values(), return_exceptions=True)
+        logger.info(f"Discovery worker {self.worker_id} stopped")
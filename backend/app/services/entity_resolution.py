@@ -0,0 +1,130 @@
+"""
+DealFlow Backend - Entity Resolution
+Merges records of the same company across sources and links them to stored startups
+
+Every record gets blocking keys (CIN, normalized domain, normalized name) that are
+looked up in a hash index, so resolving n records takes O(n) dictionary lookups
+instead of pairwise comparisons. A name match is not trusted when both records
+have different domains (e.g. two unrelated companies called "Weave").
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+from app.models.startup import Startup, normalize_cin, normalize_domain, normalize_name
+
+
+def blocking_keys(cin: Optional[str], domain: Optional[str], name_key: Optional[str]) -> List[str]:
+    """Hash-index keys for a record, strongest first"""
+    keys = []
+    if cin:
+        keys.append(f"cin:{cin}")
+    if domain:
+        keys.append(f"domain:{domain}")
+    if name_key:
+        keys.append(f"name:{name_key}")
+    return keys
+
+
+@dataclass
+class ResolvedEntity:
+    """One company with the merged data of all its source records"""
+    data: Dict[str, Any]
+    sources: Dict[str, Optional[str]] = field(default_factory=dict)  # source -> URL
+    cin: Optional[str] = None
+    domain: Optional[str] = None
+    name_key: Optional[str] = None
+    records: int = 0
+    
+    def conflicts_with(self, cin: Optional[str], domain: Optional[str]) -> bool:
+        """Whether a record clearly belongs to a different company"""
+        if self.cin and cin:
+            return self.cin != cin
+        return bool(self.domain and domain and self.domain != domain)
+    
+    def merge(self, source: str, data: Dict[str, Any]):
+        """Add a source record; fields already set keep their value"""
+        for key, value in data.items():
+            if key == "sources":
+                merged = list(self.data.get("sources") or [])
+                merged += [s for s in value or [] if s not in merged]
+                self.data["sources"] = merged
+            elif value not in (None, "", []) and self.data.get(key) in (None, "", []):
+                self.data[key] = value
+        self.sources.setdefault(source, data.get("website") or None)
+        self.records += 1
+
+
+class EntityResolver:
+    """Groups source records into entities through a blocking-key hash index"""
+    
+    def __init__(self):
+        self.entities: List[ResolvedEntity] = []
+        self._index: Dict[str, ResolvedEntity] = {}
+    
+    def add(self, source: str, data: Dict[str, Any]) -> ResolvedEntity:
+        """Add a record from `source`; returns the entity it was merged into"""
+        cin = normalize_cin(data.get("cin"))
+        domain = normalize_domain(data.get("website"))
+        name_key = normalize_name(data.get("name"))
+        keys = blocking_keys(cin, domain, name_key)
+        
+        entity = next(
+            (
+                self._index[key] for key in keys
+                if key in self._index and not self._index[key].conflicts_with(cin, domain)
+            ),
+            None
+        )
+        if entity is None:
+            entity = ResolvedEntity(data={})
+            self.entities.append(entity)
+        
+        entity.merge(source, data)
+        entity.cin = entity.cin or cin
+        entity.domain = entity.domain or domain
+        entity.name_key = entity.name_key or name_key
+        for key in blocking_keys(entity.cin, entity.domain, entity.name_key):
+            self._index.setdefault(key, entity)
+        return entity
+    
+    @property
+    def duplicates(self) -> int:
+        """Records merged into an existing entity"""
+        return sum(entity.records for entity in self.entities) - len(self.entities)
+
+
+async def match_existing_startups(entities: Sequence[ResolvedEntity]) -> Dict[int, str]:
+    """
+    Stored startups for resolved entities, as {entity position: startup id}
+    One query over the indexed cin / domain / name_key fields; matching then applies
+    the same key order and conflict rule as EntityResolver.
+    """
+    cins = {e.cin for e in entities if e.cin}
+    domains = {e.domain for e in entities if e.domain}
+    names = {e.name_key for e in entities if e.name_key}
+    clauses = []
+    if cins:
+        clauses.append({"cin": {"$in": list(cins)}})
+    if domains:
+        clauses.append({"domain": {"$in": list(domains)}})
+    if names:
+        clauses.append({"name_key": {"$in": list(names)}})
+    if not clauses:
+        return {}
+    
+    cursor = Startup.get_motor_collection().find(
+        {"$or": clauses},
+        {"_id": 1, "cin": 1, "domain": 1, "name_key": 1}
+    )
+    index: Dict[str, Dict[str, Any]] = {}
+    async for doc in cursor:
+        for key in blocking_keys(doc.get("cin"), doc.get("domain"), doc.get("name_key")):
+            index.setdefault(key, doc)
+    
+    matches: Dict[int, str] = {}
+    for position, entity in enumerate(entities):
+        for key in blocking_keys(entity.cin, entity.domain, entity.name_key):
+            doc = index.get(key)
+            if doc and not entity.conflicts_with(doc.get("cin"), doc.get("domain")):
+                matches[position] = str(doc["_id"])
+                break
+    return matches
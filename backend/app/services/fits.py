@@ -0,0 +1,224 @@
+"""
+DealFlow Backend - Per-User Fit Scores
+Keeps StartupFit documents in step with startups and fund theses
+
+Each user with a thesis has one StartupFit per startup. Only the affected documents
+are recomputed: the changed startups when a startup is written, and the startups
+whose (sector, stage, location) match the thesis differently when a thesis changes.
+Fits carry the startup's sector and stage so rankings filtered on them are read off
+the fit indexes before any startup is looked up.
+"""
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from beanie import PydanticObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from loguru import logger
+from app.core.config import settings
+from app.models.fit import StartupFit
+from app.models.startup import Startup
+from app.models.user import User
+from app.services.batch_scoring import BatchScorer
+from app.services.thesis import CompiledThesis, get_compiled_thesis
+
+# Startup fields that feed into scores; other updates leave fits unchanged
+SCORED_FIELDS = {"sector", "stage", "location", "founders", "metrics", "signals", "sources", "yc_batch"}
+
+# Startup fields copied onto fits (filters applied before the startup lookup)
+FIT_FILTER_FIELDS = ("sector", "stage")
+
+# (sector, stage, location) triples per $or query when selecting affected startups
+AFFECTED_QUERY_BATCH = 500
+
+# Per-user locks so thesis refreshes for one user run one after another
+_refresh_locks: Dict[str, asyncio.Lock] = {}
+
+
+def _refresh_lock(user_id: str) -> asyncio.Lock:
+    lock = _refresh_locks.get(user_id)
+    if lock is None:
+        lock = _refresh_locks[user_id] = asyncio.Lock()
+    return lock
+
+
+def is_refreshing(user: User) -> bool:
+    """Whether a full fit refresh for this user is running in this process"""
+    lock = _refresh_locks.get(str(user.id))
+    return lock is not None and lock.locked()
+
+
+async def has_fits(user: User) -> bool:
+    """Whether fit scores have been materialized for this user"""
+    return await StartupFit.find_one(StartupFit.user_id == str(user.id)) is not None
+
+
+def fit_operation(user: User, startup: Startup, result: Dict[str, Any], now: datetime) -> UpdateOne:
+    """Upsert of one user's scores for one startup"""
+    return UpdateOne(
+        {"user_id": str(user.id), "startup_id": startup.id},
+        {"$set": {
+            "score": result["overall_score"],
+            "score_breakdown": result["breakdown"].model_dump(),
+            "unicorn_probability": result["unicorn_probability"],
+            "investor_fit": result["investor_fit"],
+            "sector": startup.sector,
+            "stage": startup.stage,
+            "thesis_updated_at": user.updated_at,
+            "updated_at": now
+        }},
+        upsert=True
+    )
+
+
+async def _write_fits(operations: List[UpdateOne]) -> int:
+    """Unordered bulk upsert; returns the number of fits written"""
+    if not operations:
+        return 0
+    try:
+        write = await StartupFit.get_motor_collection().bulk_write(operations, ordered=False)
+        return write.upserted_count + write.modified_count
+    except BulkWriteError as e:
+        errors = e.details.get("writeErrors", [])
+        logger.error(f"{len(errors)} fit updates failed: {errors[0].get('errmsg') if errors else ''}")
+        return e.details.get("nUpserted", 0) + e.details.get("nModified", 0)
+
+
+async def _score_fits(user: User, scorer: BatchScorer, startups: Sequence[Startup]) -> int:
+    # Scoring is CPU-bound; keep it off the event loop
+    results = await asyncio.to_thread(scorer.score, startups)
+    now = datetime.utcnow()
+    return await _write_fits([
+        fit_operation(user, startup, result, now)
+        for startup, result in zip(startups, results)
+    ])
+
+
+async def refresh_startup_fits(startups: Sequence[Startup]):
+    """Recompute every thesis user's fits for these (new or changed) startups"""
+    if not startups:
+        return
+    try:
+        users = await User.find(User.thesis != None).to_list()
+        for user in users:
+            thesis = get_compiled_thesis(user)
+            if thesis:
+                await _score_fits(user, BatchScorer(thesis), startups)
+    except Exception as e:
+        logger.error(f"Could not refresh fit scores for {len(startups)} startups: {e}")
+
+
+async def remove_startup_fits(startup_id: PydanticObjectId):
+    """Drop all users' fits for a deleted startup"""
+    await StartupFit.find(StartupFit.startup_id == startup_id).delete()
+
+
+async def _affected_queries(previous: CompiledThesis, thesis: CompiledThesis) -> List[Dict[str, Any]]:
+    """Startup queries covering every (sector, stage, location) whose thesis match changed"""
+    groups = await Startup.aggregate([
+        {"$group": {"_id": {"sector": "$sector", "stage": "$stage", "location": "$location"}}}
+    ]).to_list()
+    
+    changed: List[Tuple[Optional[str], Optional[str], Optional[str]]] = []
+    for group in groups:
+        key = (group["_id"].get("sector"), group["_id"].get("stage"), group["_id"].get("location"))
+        if previous.fit_key(*key) != thesis.fit_key(*key):
+            changed.append(key)
+    
+    return [
+        {"$or": [
+            {"sector": sector, "stage": stage, "location": location}
+            for sector, stage, location in changed[i:i + AFFECTED_QUERY_BATCH]
+        ]}
+        for i in range(0, len(changed), AFFECTED_QUERY_BATCH)
+    ]
+
+
+async def refresh_user_fits(user: User, previous: Optional[CompiledThesis] = None):
+    """
+    Recompute a user's fits after their thesis changed
+    With the previous thesis, and fits already materialized, only startups whose thesis
+    match changed are rescored (the other sub-scores do not depend on the thesis);
+    otherwise every startup is scored.
+    """
+    user_id = str(user.id)
+    chunk_size = max(1, settings.RESCORE_CHUNK_SIZE)
+    
+    async with _refresh_lock(user_id):
+        try:
+            thesis = get_compiled_thesis(user)
+            if thesis is None:
+                await StartupFit.find(StartupFit.user_id == user_id).delete()
+                return
+            
+            if previous is not None and await has_fits(user):
+                queries = await _affected_queries(previous, thesis)
+            else:
+                queries = [{}]
+            
+            scorer = BatchScorer(thesis)
+            written = 0
+            for query in queries:
+                chunk: List[Startup] = []
+                async for startup in Startup.find(query, batch_size=chunk_size):
+                    chunk.append(startup)
+                    if len(chunk) >= chunk_size:
+                        written += await _score_fits(user, scorer, chunk)
+                        chunk = []
+                if chunk:
+                    written += await _score_fits(user, scorer, chunk)
+            
+            logger.info(f"Refreshed {written} fit scores for user {user_id}")
+        
+        except Exception as e:
+            logger.error(f"Could not refresh fit scores for user {user_id}: {e}")
+
+
+async def personalized_startups(
+    user: User,
+    query: Dict[str, Any],
+    min_score: Optional[float] = None,
+    skip: int = 0,
+    limit: int = 50,
+    sort_direction: int = -1,
+    after: Optional[Dict[str, Any]] = None
+) -> List[Tuple[Startup, StartupFit]]:
+    """
+    Startups ranked by the user's fit scores, read off the (user_id, [sector, stage,] score) indexes
+    `query` filters on startup fields: sector and stage are matched on the fits, the rest
+    in the startup lookup; without the rest the page is cut before the lookup.
+    `after` is an extra condition on the fits (the keyset of a page cursor).
+    """
+    match: Dict[str, Any] = {"user_id": str(user.id), **(after or {})}
+    if min_score is not None:
+        match["score"] = {"$gte": min_score}
+    startup_query = dict(query)
+    for field in FIT_FILTER_FIELDS:
+        if field in startup_query:
+            match[field] = startup_query.pop(field)
+    
+    pipeline: List[Dict[str, Any]] = [
+        {"$match": match},
+        {"$sort": {"score": sort_direction, "startup_id": sort_direction}}
+    ]
+    page = [{"$skip": skip}, {"$limit": limit}]
+    if not startup_query:
+        pipeline += page
+    
+    lookup: Dict[str, Any] = {
+        "from": Startup.get_motor_collection().name,
+        "localField": "startup_id",
+        "foreignField": "_id",
+        "as": "startup"
+    }
+    if startup_query:
+        lookup["pipeline"] = [{"$match": startup_query}]
+    pipeline += [{"$lookup": lookup}, {"$unwind": "$startup"}]
+    if startup_query:
+        pipeline += page
+    
+    rows = await StartupFit.aggregate(pipeline).to_list()
+    return [
+        (Startup.model_validate(row.pop("startup")), StartupFit.model_validate(row))
+        for row in rows
+    ]
@@ -0,0 +1,181 @@
+"""
+DealFlow Backend - Persistent HTTP response cache for ingestion sources
+
+Responses are keyed by (provider, method, URL, query params, JSON payload) and kept
+on disk: an SQLite index holds metadata and validators (ETag / Last-Modified), and
+each body is stored as its own file so large payloads never sit in the database.
+Freshness is decided per source (see settings.HTTP_CACHE_TTLS); stale entries are
+revalidated with conditional requests instead of being downloaded again.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+import httpx
+
+from app.core.config import settings
+
+
+@dataclass
+class CacheEntry:
+    """Metadata for a cached response"""
+    key: str
+    source: str
+    url: str
+    status_code: int
+    content_type: Optional[str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+    body_path: Path
+    
+    @property
+    def age(self) -> float:
+        """Seconds since the entry was fetched or last revalidated"""
+        return time.time() - self.fetched_at
+    
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers for revalidating this entry with the origin"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+    
+    def to_response(self, request: httpx.Request) -> httpx.Response:
+        """Rebuild an httpx.Response from the cached body"""
+        headers = {"X-DealFlow-Cache": "hit"}
+        if self.content_type:
+            headers["Content-Type"] = self.content_type
+        return httpx.Response(
+            status_code=self.status_code,
+            headers=headers,
+            content=self.body_path.read_bytes(),
+            request=request
+        )
+
+
+class ResponseCache:
+    """SQLite-indexed, file-backed response cache"""
+    
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.bodies = self.directory / "bodies"
+        self.bodies.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.directory / "index.sqlite3"
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    source TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    status_code INTEGER NOT NULL,
+                    content_type TEXT,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL
+                )
+                """
+            )
+    
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def key_for(
+        provider: str,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        payload: Any = None
+    ) -> str:
+        """Stable cache key for a request. Auth headers are deliberately not part of it."""
+        raw = json.dumps(
+            [provider, method.upper(), url, params or {}, payload],
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(raw.encode()).hexdigest()
+    
+    def body_path(self, key: str) -> Path:
+        return self.bodies / key
+    
+    def temp_body_path(self, key: str) -> Path:
+        """Scratch file a body can be streamed into before commit()"""
+        return self.bodies / f"{key}.{uuid.uuid4().hex}.tmp"
+    
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Look up an entry; returns None if missing or its body file is gone"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT key, source, url, status_code, content_type, etag, last_modified, fetched_at "
+                "FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        
+        entry = CacheEntry(*row, body_path=self.body_path(key))
+        if not entry.body_path.exists():
+            return None
+        return entry
+    
+    def commit(self, key: str, source: str, url: str, response: httpx.Response, temp_path: Path):
+        """Move a fully written body into place and record the response metadata"""
+        os.replace(temp_path, self.body_path(key))
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, source, url, status_code, content_type, etag, last_modified, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    source,
+                    url,
+                    response.status_code,
+                    response.headers.get("Content-Type"),
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                    time.time()
+                )
+            )
+    
+    def put(self, key: str, source: str, url: str, response: httpx.Response):
+        """Store a fully read response"""
+        temp_path = self.temp_body_path(key)
+        temp_path.write_bytes(response.content)
+        self.commit(key, source, url, response, temp_path)
+    
+    def touch(self, key: str):
+        """Mark an entry fresh again after a 304 revalidation"""
+        with self._connect() as conn:
+            conn.execute("UPDATE responses SET fetched_at = ? WHERE key = ?", (time.time(), key))
+
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Get the process-wide response cache, or None when caching is disabled"""
+    global _response_cache
+    if not settings.HTTP_CACHE_ENABLED:
+        return None
+    if _response_cache is None:
+        _response_cache = ResponseCache(settings.HTTP_CACHE_DIR)
+    return _response_cache
@@ -11,14 +11,23 @@ Data Sources:
 
 All sources include curated fallback data when APIs are not configured.
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Awaitable, AsyncIterator, Tuple
 import httpx
 import os
 import asyncio
+import inspect
+import random
 import re
 import json
+from contextlib import aclosing
 from datetime import datetime
+from pathlib import Path
+import ijson
+from ijson.common import ObjectBuilder
 from app.core.config import settings
+from app.core.http import get_http_client
+from app.core.rate_limit import TokenBucket
+from app.services.http_cache import get_response_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -103,12 +112,204 @@ def normalize_stage(stage: str) -> str:
     return STAGE_MAPPING.get(stage_lower, stage.title())
 
 
+# JSON paths (ijson prefixes) under which the YC feed lists its companies
+YC_FEED_ITEM_PREFIXES = ("item", "companies.item", "results.item")
+
+# Order of YC batch seasons within a year (X is the spring batch)
+YC_SEASONS = {"W": 0, "X": 1, "S": 2, "F": 3}
+YC_SEASON_NAMES = {"winter": "W", "spring": "X", "summer": "S", "fall": "F"}
+YC_BATCH_PATTERN = re.compile(r"^\s*(?:([WXSF])(\d{2})|(winter|spring|summer|fall)\s+(\d{4}))\s*$", re.IGNORECASE)
+
+# Fields of the MCA providers' company master data holding filing dates
+MCA_FILING_DATE_FIELDS = (
+    "last_filing_date", "date_of_last_agm", "dateOfLastAGM",
+    "date_of_balance_sheet", "dateOfBalanceSheet", "balance_sheet_date",
+)
+MCA_DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d-%b-%Y")
+
+
+# Crunchbase category permalinks searched for each thesis sector
+CRUNCHBASE_SECTOR_CATEGORIES = {
+    "FinTech": ["fintech", "financial-services", "payments"],
+    "HealthTech": ["health-care", "medical", "health-diagnostics"],
+    "AI/ML": ["artificial-intelligence", "machine-learning"],
+    "B2B SaaS": ["saas", "b2b", "software"],
+    "Enterprise Software": ["enterprise-software"],
+    "Developer Tools": ["developer-tools", "developer-apis"],
+    "Climate Tech": ["cleantech", "clean-energy", "renewable-energy"],
+    "Blockchain/Web3": ["blockchain", "cryptocurrency", "web3"],
+    "Consumer": ["consumer", "consumer-goods"],
+    "EdTech": ["edtech", "education"],
+    "E-commerce": ["e-commerce", "retail"],
+    "Marketplace": ["marketplace"],
+    "Cybersecurity": ["cyber-security", "network-security"],
+    "DeepTech": ["hardware", "biotechnology", "robotics"],
+}
+
+# Crunchbase last_funding_type values for each thesis stage
+CRUNCHBASE_STAGE_FUNDING_TYPES = {
+    "Pre-Seed": ["pre_seed", "angel"],
+    "Seed": ["seed"],
+    "Series A": ["series_a"],
+    "Series B": ["series_b"],
+    "Series C+": ["series_c", "series_d", "series_e"],
+    "Growth/Late Stage": ["series_f", "series_g", "series_h", "private_equity", "post_ipo_equity", "post_ipo_debt"],
+}
+CRUNCHBASE_FUNDING_TYPE_STAGES = {
+    funding_type: stage
+    for stage, funding_types in CRUNCHBASE_STAGE_FUNDING_TYPES.items()
+    for funding_type in funding_types
+}
+CRUNCHBASE_CATEGORY_SECTORS = {
+    category: sector
+    for sector, categories in CRUNCHBASE_SECTOR_CATEGORIES.items()
+    for category in categories
+}
+
+
+def yc_company_id(company: Dict[str, Any]) -> Optional[str]:
+    """Stable id of a raw YC API company"""
+    return str(company.get("id") or company.get("slug") or "") or None
+
+
+def yc_batch_key(batch: Optional[str]) -> Tuple[int, int]:
+    """Sortable (year, season) of a YC batch such as "W24" or "Summer 2023" ((0, 0) if unknown)"""
+    match = YC_BATCH_PATTERN.match(batch or "")
+    if not match:
+        return (0, 0)
+    if match.group(1):
+        return (2000 + int(match.group(2)), YC_SEASONS[match.group(1).upper()])
+    return (int(match.group(4)), YC_SEASONS[YC_SEASON_NAMES[match.group(3).lower()]])
+
+
+def mca_filing_date(company_data: Dict[str, Any]) -> Optional[str]:
+    """Latest filing date in MCA company master data as YYYY-MM-DD (None if not provided)"""
+    dates = []
+    for field in MCA_FILING_DATE_FIELDS:
+        value = company_data.get(field)
+        if not isinstance(value, str):
+            continue
+        for date_format in MCA_DATE_FORMATS:
+            try:
+                dates.append(datetime.strptime(value.strip()[:11], date_format).strftime("%Y-%m-%d"))
+                break
+            except ValueError:
+                continue
+    return max(dates) if dates else None
+
+
+def record_watermark(source: str, record: Dict[str, Any]) -> Optional[str]:
+    """
+    Delta watermark of a fetched startup record (None if the source or record has none)
+    YC: "<batch>:<company id>", Crunchbase: its updated_at, MCA: the latest filing date
+    """
+    if source == "yc":
+        return f"{record.get('yc_batch') or ''}:{record['yc_id']}" if record.get("yc_id") else None
+    if source == "crunchbase":
+        return record.get("source_updated_at")
+    if source == "mca":
+        return record.get("filing_date")
+    return None
+
+
+def watermark_key(source: str, watermark: Optional[str]) -> Tuple:
+    """Sort key of a watermark value of `source`"""
+    if source == "yc":
+        batch, _, company_id = (watermark or "").partition(":")
+        return (*yc_batch_key(batch), int(company_id) if company_id.isdigit() else -1, company_id)
+    return (watermark or "",)
+
+
+async def _iter_file(path: Path, chunk_size: int = 65536) -> AsyncIterator[bytes]:
+    """Read a file in chunks without blocking the event loop"""
+    with open(path, "rb") as f:
+        while True:
+            chunk = await asyncio.to_thread(f.read, chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+async def _drain_to_file(chunks: AsyncIterator[bytes], path: Path, max_bytes: int) -> bool:
+    """Append the rest of a byte stream to a file (False if it is longer than `max_bytes`)"""
+    drained = 0
+    with open(path, "ab") as f:
+        async for chunk in chunks:
+            drained += len(chunk)
+            if drained > max_bytes:
+                return False
+            await asyncio.to_thread(f.write, chunk)
+    return True
+
+
+def _cancelling() -> bool:
+    """Whether the current task is being cancelled (e.g. by a source timeout)"""
+    task = asyncio.current_task()
+    return task is not None and task.cancelling() > 0
+
+
+async def iter_json_items(chunks: AsyncIterator[bytes], prefixes: Tuple[str, ...]) -> AsyncIterator[Any]:
+    """
+    Incrementally parse a JSON byte stream and yield every value found at one of
+    `prefixes` (ijson prefix syntax, e.g. "item" for top-level array elements).
+    Only the value currently being built is kept in memory.
+    """
+    events = ijson.sendable_list()
+    parser = ijson.parse_coro(events)
+    builder = None
+    builder_prefix = end_event = None
+    
+    def drain():
+        nonlocal builder, builder_prefix, end_event
+        for prefix, event, value in events:
+            if builder is not None:
+                if prefix == builder_prefix and event == end_event:
+                    item, builder = builder.value, None
+                    yield item
+                else:
+                    builder.event(event, value)
+            elif prefix in prefixes:
+                if event in ("start_map", "start_array"):
+                    builder = ObjectBuilder()
+                    builder.event(event, value)
+                    builder_prefix = prefix
+                    end_event = event.replace("start", "end")
+                else:
+                    yield value
+        del events[:]
+    
+    async for chunk in chunks:
+        parser.send(chunk)
+        for item in drain():
+            yield item
+    
+    parser.close()
+    for item in drain():
+        yield item
+
+
+# Shared per-provider limiters so every IngestionService respects the same quota
+_mca_rate_limiters: Dict[str, Optional[TokenBucket]] = {}
+
+
+def _get_mca_rate_limiter(provider: str) -> Optional[TokenBucket]:
+    """Get the rate limiter for an MCA provider (None if unlimited)"""
+    if provider not in _mca_rate_limiters:
+        rate = settings.mca_rate_limits.get(provider)
+        _mca_rate_limiters[provider] = TokenBucket(rate) if rate and rate > 0 else None
+    return _mca_rate_limiters[provider]
+
+
 class IngestionService:
     """Service for ingesting startup data from various sources"""
     
     YC_COMPANIES_URL = "https://api.ycombinator.com/v0.1/companies"
     CRUNCHBASE_BASE_URL = "https://api.crunchbase.com/api/v4"
     PROXYCURL_BASE_URL = "https://nubela.co/proxycurl/api/v2"
+    CRUNCHBASE_MAX_PAGE_SIZE = 1000  # Largest `limit` the search API accepts
+    
+    # Sources supported by fetch_from_all_sources
+    SOURCES = ("yc", "crunchbase", "angellist", "mca")
     
     # MCA API Provider URLs (licensed third-party providers)
     MCA_PROVIDER_URLS = {
@@ -117,27 +318,211 @@ class IngestionService:
         "gridlines": "https://api.gridlines.io/mca-service/api/v1"
     }
     
-    def __init__(self):
-        self.client = httpx.AsyncClient(timeout=30.0, follow_redirects=True)
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        # Use the app-wide pooled client so connections and TLS sessions are reused
+        self.client = client or get_http_client()
+    
+    async def _cached_request(
+        self,
+        source: str,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Any] = None,
+        provider: Optional[str] = None,
+        limiter: Optional[TokenBucket] = None
+    ) -> httpx.Response:
+        """
+        Send a request through the on-disk response cache.
+        
+        Fresh entries (younger than the source's TTL) are served without touching the
+        network; stale ones are revalidated with If-None-Match / If-Modified-Since and
+        only re-downloaded when the origin says they changed. Only 200s are cached.
+        `limiter` is only charged for requests that actually go to the network.
+        """
+        cache = get_response_cache()
+        if cache is None:
+            if limiter:
+                await limiter.acquire()
+            return await self.client.request(method, url, headers=headers, params=params, json=json)
+        
+        key = cache.key_for(provider or source, method, url, params=params, payload=json)
+        request = self.client.build_request(method, url, headers=headers, params=params, json=json)
+        entry = await asyncio.to_thread(cache.get, key)
+        
+        if entry and entry.age < settings.http_cache_ttls.get(source, 0):
+            logger.debug(f"{source}: cache hit for {url}")
+            return await asyncio.to_thread(entry.to_response, request)
+        
+        if entry:
+            request.headers.update(entry.conditional_headers())
+        
+        if limiter:
+            await limiter.acquire()
+        response = await self.client.send(request)
+        
+        if response.status_code == 304 and entry:
+            logger.debug(f"{source}: cache revalidated for {url}")
+            await asyncio.to_thread(cache.touch, key)
+            return await asyncio.to_thread(entry.to_response, request)
+        
+        if response.status_code == 200:
+            await asyncio.to_thread(cache.put, key, source, url, response)
+        
+        return response
+    
+    async def _stream_cached(
+        self,
+        source: str,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Streaming counterpart of _cached_request: yields the response body in chunks.
+        
+        Cached bodies are streamed from disk. Network bodies are written to the cache
+        file while they are consumed; if the consumer stops early the rest of the body
+        is drained to disk (not memory, bounded by HTTP_CACHE_DRAIN_TIMEOUT and
+        HTTP_CACHE_DRAIN_MAX_BYTES) so the next run is served from the cache. When the
+        consumer is cancelled, e.g. by a source timeout, the partial body is discarded
+        and the response closed at once.
+        Raises httpx.HTTPStatusError for non-200 responses.
+        """
+        cache = get_response_cache()
+        key = entry = None
+        if cache is not None:
+            key = cache.key_for(source, method, url)
+            entry = await asyncio.to_thread(cache.get, key)
+            if entry and entry.age < settings.http_cache_ttls.get(source, 0):
+                logger.debug(f"{source}: cache hit for {url}")
+                async for chunk in _iter_file(entry.body_path):
+                    yield chunk
+                return
+        
+        request = self.client.build_request(method, url, headers=headers)
+        if entry:
+            request.headers.update(entry.conditional_headers())
+        response = await self.client.send(request, stream=True)
+        
+        try:
+            if response.status_code == 304 and entry:
+                logger.debug(f"{source}: cache revalidated for {url}")
+                await asyncio.to_thread(cache.touch, key)
+                async for chunk in _iter_file(entry.body_path):
+                    yield chunk
+                return
+            
+            if response.status_code != 200:
+                raise httpx.HTTPStatusError(
+                    f"{source} returned {response.status_code}",
+                    request=request,
+                    response=response
+                )
+            
+            body = response.aiter_bytes()
+            if cache is None:
+                async for chunk in body:
+                    yield chunk
+                return
+            
+            temp_path = cache.temp_body_path(key)
+            complete = False
+            try:
+                with open(temp_path, "wb") as temp_file:
+                    async for chunk in body:
+                        await asyncio.to_thread(temp_file.write, chunk)
+                        yield chunk
+                complete = True
+            except GeneratorExit:
+                # Stopped early: finish caching the body, unless the consumer is being cancelled
+                if not _cancelling():
+                    try:
+                        complete = await asyncio.wait_for(
+                            _drain_to_file(body, temp_path, settings.HTTP_CACHE_DRAIN_MAX_BYTES),
+                            timeout=settings.HTTP_CACHE_DRAIN_TIMEOUT
+                        )
+                    except Exception as e:
+                        logger.debug(f"{source}: could not finish caching {url}: {e!r}")
+                raise
+            finally:
+                if complete:
+                    await asyncio.to_thread(cache.commit, key, source, url, response, temp_path)
+                else:
+                    temp_path.unlink(missing_ok=True)
+        finally:
+            await response.aclose()
     
     async def fetch_yc_startups(
         self, 
         batch: str = "latest", 
         limit: int = 50,
         sectors: Optional[List[str]] = None,
-        stages: Optional[List[str]] = None
+        stages: Optional[List[str]] = None,
+        stream: bool = True,
+        since: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """Fetch startups from Y Combinator public API"""
+        """
+        Fetch startups from Y Combinator public API
+        
+        With `stream` (the default) the feed is parsed incrementally via
+        iter_yc_startups, so memory stays flat and the download stops being parsed
+        as soon as `limit` matches are found. `stream=False` loads the whole feed.
+        
+        Delta mode (`since` set to a watermark from record_watermark): companies not
+        newer than the watermark are skipped before normalization, and the `limit`
+        oldest new companies are returned in watermark order.
+        """
         startups = []
         all_startups = []  # Keep unfiltered results as fallback
+        scan_limit = None if since else limit * 3  # Get more to filter from
+        
+        def accept(startup: Dict[str, Any]) -> bool:
+            """Collect a normalized startup; returns True once `limit` matches are found"""
+            if not startup["name"]:
+                return False
+            
+            # Add to all_startups (unfiltered fallback, not used for deltas)
+            if len(all_startups) < limit and not since:
+                all_startups.append(startup)
+            
+            # Check sector filter
+            sector_match = True
+            if sectors and len(sectors) > 0 and "Sector Agnostic" not in sectors:
+                sector_match = startup["sector"] in sectors
+            
+            # Check stage filter
+            stage_match = True
+            if stages and len(stages) > 0:
+                stage_match = startup["stage"] in stages
+            
+            # Add to filtered list if matches
+            if sector_match and stage_match:
+                startups.append(startup)
+            return not since and len(startups) >= limit
         
         try:
-            response = await self.client.get(
-                self.YC_COMPANIES_URL,
-                headers={"Accept": "application/json"}
-            )
+            # Log the filters being applied
+            logger.info(f"Applying filters - sectors: {sectors}, stages: {stages}")
             
-            if response.status_code == 200:
+            if stream:
+                scanned = 0
+                async with aclosing(self.iter_yc_startups(max_companies=scan_limit, since=since)) as feed:
+                    async for startup in feed:
+                        scanned += 1
+                        if accept(startup):
+                            break
+                logger.info(f"Streamed {scanned} companies from YC API")
+            else:
+                response = await self._cached_request(
+                    "yc",
+                    "GET",
+                    self.YC_COMPANIES_URL,
+                    headers={"Accept": "application/json"}
+                )
+                response.raise_for_status()
+                
                 data = response.json()
                 # Handle different response formats
                 if isinstance(data, list):
@@ -149,72 +534,27 @@ class IngestionService:
                 
                 logger.info(f"Fetched {len(companies)} companies from YC API")
                 
-                # Log the filters being applied
-                logger.info(f"Applying filters - sectors: {sectors}, stages: {stages}")
-                
-                # Safely iterate with limit
-                max_iter = min(len(companies), limit * 3)  # Get more to filter from
-                for i in range(max_iter):
-                    company = companies[i]
-                    industries = company.get("industries", [])
-                    sector = normalize_sector(industries[0] if industries else "Technology")
-                    stage = normalize_stage(company.get("stage", "Seed"))
-                    
-                    # Handle location - can be in locations array or location field
-                    locations = company.get("locations", [])
-                    location = locations[0] if locations else company.get("location", "San Francisco, CA")
-                    
-                    # YC API uses camelCase
-                    startup = {
-                        "name": company.get("name", ""),
-                        "tagline": company.get("oneLiner", company.get("one_liner", "")),
-                        "sector": sector,
-                        "stage": stage,
-                        "description": company.get("longDescription", company.get("oneLiner", company.get("long_description", company.get("one_liner", "")))),
-                        "website": company.get("website", ""),
-                        "location": location,
-                        "founded_year": company.get("yearFounded", company.get("year_founded")),
-                        "team_size": company.get("teamSize", company.get("team_size")),
-                        "yc_batch": company.get("batch", ""),
-                        "thumbnail_url": company.get("smallLogoUrl", company.get("logo_url", "")),
-                        "source": "YC",
-                        "sources": ["Y Combinator"],
-                        "created_at": datetime.utcnow(),
-                        "updated_at": datetime.utcnow(),
-                        "last_updated": "Just now"
-                    }
-                    
-                    if startup["name"]:
-                        # Add to all_startups (unfiltered fallback)
-                        if len(all_startups) < limit:
-                            all_startups.append(startup)
-                        
-                        # Check sector filter
-                        sector_match = True
-                        if sectors and len(sectors) > 0 and "Sector Agnostic" not in sectors:
-                            sector_match = sector in sectors
-                        
-                        # Check stage filter
-                        stage_match = True
-                        if stages and len(stages) > 0:
-                            stage_match = stage in stages
-                        
-                        # Add to filtered list if matches
-                        if sector_match and stage_match:
-                            startups.append(startup)
-                            if len(startups) >= limit:
-                                break
-                
-                # If filtering returned no results, use unfiltered results
-                if len(startups) == 0 and len(all_startups) > 0:
-                    logger.warning(f"No startups matched filters (sectors={sectors}, stages={stages}). Returning unfiltered results.")
-                    startups = all_startups
-                
-                logger.info(f"Processed {len(startups)} YC startups")
-                return startups
-            else:
-                logger.warning(f"YC API returned {response.status_code}")
-                
+                for company in companies[:scan_limit]:
+                    if since and not self._is_new_yc_company(company, since):
+                        continue
+                    if accept(self._normalize_yc_company(company)):
+                        break
+            
+            if since:
+                startups.sort(key=lambda startup: watermark_key("yc", record_watermark("yc", startup)))
+                startups = startups[:limit]
+                logger.info(f"{len(startups)} YC companies newer than watermark {since}")
+            
+            # If filtering returned no results, use unfiltered results
+            if len(startups) == 0 and len(all_startups) > 0:
+                logger.warning(f"No startups matched filters (sectors={sectors}, stages={stages}). Returning unfiltered results.")
+                startups = all_startups
+            
+            logger.info(f"Processed {len(startups)} YC startups")
+            return startups
+        
+        except httpx.HTTPStatusError as e:
+            logger.warning(f"YC API returned {e.response.status_code}")
         except Exception as e:
             logger.error(f"Error fetching from YC API: {e}")
         
@@ -222,6 +562,72 @@ class IngestionService:
         logger.info("Using curated YC company data")
         return self._get_curated_yc_startups(limit, sectors, stages)
     
+    async def iter_yc_startups(
+        self,
+        max_companies: Optional[int] = None,
+        since: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the YC companies feed and yield normalized startup dicts one at a time.
+        Only the company currently being parsed is held in memory. With `since`,
+        companies not newer than that watermark are skipped without being normalized.
+        """
+        chunks = self._stream_cached(
+            "yc",
+            "GET",
+            self.YC_COMPANIES_URL,
+            headers={"Accept": "application/json"}
+        )
+        async with aclosing(chunks):
+            companies = iter_json_items(chunks, YC_FEED_ITEM_PREFIXES)
+            async with aclosing(companies):
+                scanned = 0
+                async for company in companies:
+                    if since and not self._is_new_yc_company(company, since):
+                        continue
+                    if max_companies is not None and scanned >= max_companies:
+                        break
+                    scanned += 1
+                    yield self._normalize_yc_company(company)
+    
+    def _is_new_yc_company(self, company: Dict[str, Any], since: str) -> bool:
+        """Whether a raw YC company is newer than a delta watermark"""
+        company_id = yc_company_id(company)
+        if not company_id:
+            return True
+        return watermark_key("yc", f"{company.get('batch') or ''}:{company_id}") > watermark_key("yc", since)
+    
+    def _normalize_yc_company(self, company: Dict[str, Any]) -> Dict[str, Any]:
+        """Normalize a raw YC API company into a startup dict"""
+        industries = company.get("industries", [])
+        sector = normalize_sector(industries[0] if industries else "Technology")
+        stage = normalize_stage(company.get("stage", "Seed"))
+        
+        # Handle location - can be in locations array or location field
+        locations = company.get("locations", [])
+        location = locations[0] if locations else company.get("location", "San Francisco, CA")
+        
+        # YC API uses camelCase
+        return {
+            "name": company.get("name", ""),
+            "tagline": company.get("oneLiner", company.get("one_liner", "")),
+            "sector": sector,
+            "stage": stage,
+            "description": company.get("longDescription", company.get("oneLiner", company.get("long_description", company.get("one_liner", "")))),
+            "website": company.get("website", ""),
+            "location": location,
+            "founded_year": company.get("yearFounded", company.get("year_founded")),
+            "team_size": company.get("teamSize", company.get("team_size")),
+            "yc_batch": company.get("batch", ""),
+            "yc_id": yc_company_id(company),
+            "thumbnail_url": company.get("smallLogoUrl", company.get("logo_url", "")),
+            "source": "YC",
+            "sources": ["Y Combinator"],
+            "created_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow(),
+            "last_updated": "Just now"
+        }
+    
     def _get_curated_yc_startups(
         self, 
         limit: int, 
@@ -258,67 +664,163 @@ class IngestionService:
         self,
         sectors: Optional[List[str]] = None,
         stages: Optional[List[str]] = None,
-        limit: int = 50
+        limit: int = 50,
+        since: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """Fetch startups from Crunchbase API (requires paid API key)"""
+        """
+        Fetch startups from Crunchbase API (requires paid API key)
+        
+        Sectors and stages are sent as category / funding-type predicates, so pages
+        come back pre-filtered; only filters without a predicate are checked locally.
+        Results are paged with `after_id`; while a page is processed the next one is
+        already requested if it may be needed (always while local filtering can drop
+        results), and paging stops at `limit` matches or CRUNCHBASE_MAX_PAGES requests.
+        Delta mode (`since` set to an updated_at watermark) asks only for organizations
+        updated since then, oldest update first.
+        """
         if not settings.CRUNCHBASE_API_KEY or settings.CRUNCHBASE_API_KEY == "your-crunchbase-api-key":
             logger.warning("Crunchbase API key not configured - using curated data")
             return self._get_curated_crunchbase_startups(limit, sectors, stages)
         
         startups = []
+        page_size = max(1, min(limit, self.CRUNCHBASE_MAX_PAGE_SIZE))
+        max_pages = max(1, settings.CRUNCHBASE_MAX_PAGES)
+        pages = 0
+        next_page = None
         
         try:
-            url = f"{self.CRUNCHBASE_BASE_URL}/searches/organizations"
-            headers = {
-                "X-cb-user-key": settings.CRUNCHBASE_API_KEY,
-                "Content-Type": "application/json"
-            }
-            
             query = {
-                "field_ids": ["identifier", "short_description", "categories", "location_identifiers", "funding_total", "last_funding_type", "founded_on", "website_url"],
-                "limit": limit,
+                "field_ids": ["identifier", "short_description", "categories", "location_identifiers", "funding_total", "last_funding_type", "founded_on", "website_url", "updated_at"],
+                "limit": page_size,
                 "order": [{"field_id": "rank_org", "sort": "asc"}]
             }
+            predicates = self._crunchbase_predicates(sectors, stages, since)
+            if predicates:
+                query["query"] = predicates
+            filtered = {predicate["field_id"] for predicate in predicates}
+            check_sector = bool(sectors) and "categories" not in filtered and "Sector Agnostic" not in sectors
+            check_stage = bool(stages) and "last_funding_type" not in filtered
+            if since:
+                query["order"] = [{"field_id": "updated_at", "sort": "asc"}]
             
-            response = await self.client.post(url, headers=headers, json=query)
-            
-            if response.status_code != 200:
-                logger.error(f"Crunchbase API error: {response.status_code}")
-                return self._get_curated_crunchbase_startups(limit, sectors, stages)
-            
-            data = response.json()
-            
-            for entity in data.get("entities", []):
-                props = entity.get("properties", {})
-                categories = props.get("categories", [])
-                sector = normalize_sector(categories[0].get("value") if categories else "Technology")
-                stage = normalize_stage(props.get("last_funding_type", "Seed"))
+            next_page = asyncio.create_task(self._fetch_crunchbase_page(query))
+            while next_page is not None:
+                entities = await next_page
+                next_page = None
+                if entities is None:
+                    break
+                pages += 1
                 
-                if sectors and sector not in sectors and "Sector Agnostic" not in sectors:
-                    continue
-                if stages and stage not in stages:
-                    continue
+                has_more = len(entities) == page_size and pages < max_pages
+                # Prefetch the next page unless this page is certain to reach the limit
+                if has_more and (check_sector or check_stage or len(startups) + len(entities) < limit):
+                    next_page = asyncio.create_task(self._fetch_crunchbase_page(query, entities[-1].get("uuid")))
                 
-                startup = {
-                    "name": props.get("identifier", {}).get("value", "Unknown"),
-                    "tagline": props.get("short_description"),
-                    "sector": sector,
-                    "stage": stage,
-                    "location": props.get("location_identifiers", [{}])[0].get("value") if props.get("location_identifiers") else None,
-                    "website": props.get("website_url"),
-                    "sources": ["Crunchbase"],
-                    "created_at": datetime.utcnow(),
-                    "updated_at": datetime.utcnow(),
-                    "last_updated": "Just now"
-                }
-                startups.append(startup)
+                for entity in entities:
+                    startup = self._normalize_crunchbase_entity(entity, sectors)
+                    
+                    if check_sector and startup["sector"] not in sectors:
+                        continue
+                    if check_stage and startup["stage"] not in stages:
+                        continue
+                    
+                    startups.append(startup)
+                    if len(startups) >= limit:
+                        break
                 
+                if len(startups) >= limit and next_page is not None:
+                    next_page.cancel()
+                    next_page = None
+        
         except Exception as e:
             logger.error(f"Error fetching from Crunchbase: {e}")
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+        
+        if not startups and pages == 0:
             return self._get_curated_crunchbase_startups(limit, sectors, stages)
         
+        logger.info(f"Crunchbase: {len(startups)} startups from {pages} search requests")
         return startups
     
+    def _crunchbase_predicates(
+        self,
+        sectors: Optional[List[str]],
+        stages: Optional[List[str]],
+        since: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """Search predicates for the thesis filters (and the delta watermark)"""
+        predicates = []
+        if sectors and "Sector Agnostic" not in sectors:
+            categories = [c for sector in sectors for c in CRUNCHBASE_SECTOR_CATEGORIES.get(sector, [])]
+            # A sector without known categories can only be matched client-side
+            if categories and all(sector in CRUNCHBASE_SECTOR_CATEGORIES for sector in sectors):
+                predicates.append({"type": "predicate", "field_id": "categories", "operator_id": "includes", "values": categories})
+        if stages:
+            funding_types = [t for stage in stages for t in CRUNCHBASE_STAGE_FUNDING_TYPES.get(stage, [])]
+            if funding_types and all(stage in CRUNCHBASE_STAGE_FUNDING_TYPES for stage in stages):
+                predicates.append({"type": "predicate", "field_id": "last_funding_type", "operator_id": "includes", "values": funding_types})
+        if since:
+            predicates.append({"type": "predicate", "field_id": "updated_at", "operator_id": "gte", "values": [since]})
+        return predicates
+    
+    async def _fetch_crunchbase_page(
+        self,
+        query: Dict[str, Any],
+        after_id: Optional[str] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """One page of organization search results (None if the request failed)"""
+        url = f"{self.CRUNCHBASE_BASE_URL}/searches/organizations"
+        headers = {
+            "X-cb-user-key": settings.CRUNCHBASE_API_KEY,
+            "Content-Type": "application/json"
+        }
+        if after_id:
+            query = {**query, "after_id": after_id}
+        
+        response = await self._cached_request("crunchbase", "POST", url, headers=headers, json=query)
+        if response.status_code != 200:
+            logger.error(f"Crunchbase API error: {response.status_code}")
+            return None
+        return response.json().get("entities", [])
+    
+    def _normalize_crunchbase_entity(
+        self,
+        entity: Dict[str, Any],
+        sectors: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Normalize a Crunchbase organization into a startup dict"""
+        props = entity.get("properties", {})
+        
+        # Prefer a category that matches the requested sectors (the predicate matched on any of them);
+        # searched category permalinks map straight to their sector
+        category_sectors = [
+            CRUNCHBASE_CATEGORY_SECTORS.get(c.get("permalink")) or normalize_sector(c.get("value"))
+            for c in props.get("categories") or [] if c.get("value") or c.get("permalink")
+        ]
+        sector = next(
+            (s for s in category_sectors if sectors and s in sectors),
+            category_sectors[0] if category_sectors else "Technology"
+        )
+        funding_type = props.get("last_funding_type") or "seed"
+        stage = CRUNCHBASE_FUNDING_TYPE_STAGES.get(funding_type) or normalize_stage(funding_type.replace("_", " "))
+        
+        return {
+            "name": props.get("identifier", {}).get("value", "Unknown"),
+            "crunchbase_id": props.get("identifier", {}).get("permalink") or entity.get("uuid"),
+            "tagline": props.get("short_description"),
+            "sector": sector,
+            "stage": stage,
+            "location": props.get("location_identifiers", [{}])[0].get("value") if props.get("location_identifiers") else None,
+            "website": props.get("website_url"),
+            "source_updated_at": props.get("updated_at"),
+            "sources": ["Crunchbase"],
+            "created_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow(),
+            "last_updated": "Just now"
+        }
+    
     def _get_curated_crunchbase_startups(
         self, 
         limit: int, 
@@ -345,9 +847,10 @@ class IngestionService:
         self, 
         limit: int = 50, 
         sectors: Optional[List[str]] = None, 
-        stages: Optional[List[str]] = None
+        stages: Optional[List[str]] = None,
+        since: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """Fetch startups from AngelList/Wellfound (public pages only)"""
+        """Fetch startups from AngelList/Wellfound (public pages only; no delta support, `since` is ignored)"""
         logger.info("AngelList integration - using curated public company data")
         return self._get_curated_angellist_startups(limit, sectors, stages)
     
@@ -377,7 +880,8 @@ class IngestionService:
         self, 
         limit: int = 50, 
         sectors: Optional[List[str]] = None, 
-        stages: Optional[List[str]] = None
+        stages: Optional[List[str]] = None,
+        since: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Fetch Indian startups from MCA (Ministry of Corporate Affairs) via licensed API providers.
@@ -393,12 +897,18 @@ class IngestionService:
         - Director information
         - Registered address
         - Filing status
+        
+        Delta mode (`since` set to a filing-date watermark) returns the `limit` companies
+        with the oldest filings on or after the watermark. The CINs are not ordered by
+        filing date, so it looks up every CIN a full run may look up (limit * 2) before
+        picking them; a newer filing is then never returned ahead of an older one the
+        watermark would skip. If any lookup failed, the filing dates are left off the
+        results so the watermark does not move and the next delta run looks again.
         """
         if not settings.MCA_API_KEY or settings.MCA_API_KEY == "your-mca-api-key":
             logger.warning("MCA API key not configured - using curated Indian startup data")
             return self._get_curated_mca_startups(limit, sectors, stages)
         
-        startups = []
         provider = settings.MCA_API_PROVIDER.lower()
         base_url = settings.MCA_API_BASE_URL or self.MCA_PROVIDER_URLS.get(provider)
         
@@ -407,63 +917,144 @@ class IngestionService:
             return self._get_curated_mca_startups(limit, sectors, stages)
         
         try:
-            # Get curated CINs to lookup via API
-            curated_cins = self._get_indian_startup_cins()
+            # Get curated CINs to lookup via API. Sector/stage come from our own
+            # metadata, so filter before spending paid lookups on them.
+            curated_cins = [
+                cin_data for cin_data in self._get_indian_startup_cins()
+                if self._mca_record_matches(cin_data, sectors, stages)
+            ]
             
-            for cin_data in curated_cins[:limit * 2]:
-                try:
-                    company_data = await self._fetch_mca_company_by_cin(
-                        cin_data["cin"], 
-                        base_url, 
-                        provider
-                    )
-                    
-                    if company_data:
-                        sector = normalize_sector(cin_data.get("sector", "Technology"))
-                        stage = normalize_stage(cin_data.get("stage", "Seed"))
-                        
-                        if sectors and sector not in sectors and "Sector Agnostic" not in sectors:
-                            continue
-                        if stages and stage not in stages:
-                            continue
-                        
-                        startup = {
-                            "name": company_data.get("company_name") or cin_data["name"],
-                            "tagline": cin_data.get("tagline", ""),
-                            "sector": sector,
-                            "stage": stage,
-                            "description": cin_data.get("description", ""),
-                            "website": cin_data.get("website", ""),
-                            "location": company_data.get("registered_office_address") or cin_data.get("location", "India"),
-                            "founded_year": company_data.get("incorporation_date", "")[:4] if company_data.get("incorporation_date") else cin_data.get("founded_year"),
-                            "cin": cin_data["cin"],
-                            "company_status": company_data.get("company_status", "Active"),
-                            "company_type": company_data.get("company_type", "Private Limited"),
-                            "source": "MCA",
-                            "sources": ["MCA (India)"],
-                            "created_at": datetime.utcnow(),
-                            "updated_at": datetime.utcnow(),
-                            "last_updated": "Just now"
-                        }
-                        startups.append(startup)
-                        
-                        if len(startups) >= limit:
-                            break
-                            
-                except Exception as e:
-                    logger.warning(f"Error fetching CIN {cin_data['cin']}: {e}")
-                    continue
+            cin_records = curated_cins[:limit * 2]
+            failed: List[str] = []
+            startups = await self._lookup_mca_cins(
+                cin_records,
+                base_url,
+                provider,
+                len(cin_records) if since else limit,
+                since=since,
+                failed=failed
+            )
+            
+            if since:
+                startups.sort(key=lambda startup: startup.get("filing_date") or "")
+                startups = startups[:limit]
+                if failed:
+                    logger.warning(f"{len(failed)} MCA lookups failed; keeping the MCA watermark at {since}")
+                    for startup in startups:
+                        startup["filing_date"] = None
+                logger.info(f"{len(startups)} MCA companies with filings since {since}")
+                return startups
             
             if startups:
                 logger.info(f"Fetched {len(startups)} startups from MCA API")
                 return startups
-                
+        
         except Exception as e:
             logger.error(f"Error fetching from MCA API: {e}")
         
         # Fallback to curated data
         return self._get_curated_mca_startups(limit, sectors, stages)
     
+    def _mca_record_matches(
+        self,
+        cin_data: Dict[str, Any],
+        sectors: Optional[List[str]],
+        stages: Optional[List[str]]
+    ) -> bool:
+        """Check a curated CIN record against the thesis filters"""
+        sector = normalize_sector(cin_data.get("sector", "Technology"))
+        stage = normalize_stage(cin_data.get("stage", "Seed"))
+        
+        if sectors and sector not in sectors and "Sector Agnostic" not in sectors:
+            return False
+        if stages and stage not in stages:
+            return False
+        return True
+    
+    def _build_mca_startup(self, cin_data: Dict[str, Any], company_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge MCA master data with our curated metadata into a startup dict"""
+        return {
+            "name": company_data.get("company_name") or cin_data["name"],
+            "tagline": cin_data.get("tagline", ""),
+            "sector": normalize_sector(cin_data.get("sector", "Technology")),
+            "stage": normalize_stage(cin_data.get("stage", "Seed")),
+            "description": cin_data.get("description", ""),
+            "website": cin_data.get("website", ""),
+            "location": company_data.get("registered_office_address") or cin_data.get("location", "India"),
+            "founded_year": company_data.get("incorporation_date", "")[:4] if company_data.get("incorporation_date") else cin_data.get("founded_year"),
+            "cin": cin_data["cin"],
+            "filing_date": mca_filing_date(company_data),
+            "company_status": company_data.get("company_status", "Active"),
+            "company_type": company_data.get("company_type", "Private Limited"),
+            "source": "MCA",
+            "sources": ["MCA (India)"],
+            "created_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow(),
+            "last_updated": "Just now"
+        }
+    
+    async def _lookup_mca_cins(
+        self,
+        cin_records: List[Dict[str, Any]],
+        base_url: str,
+        provider: str,
+        limit: int,
+        since: Optional[str] = None,
+        failed: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Look up CINs concurrently and return up to `limit` startups in input order.
+        
+        At most MCA_MAX_CONCURRENCY lookups are in flight (and never more than the
+        matches still needed), requests are paced by the provider's rate limit, and
+        lookups stop as soon as `limit` matches are found. With `since`, companies whose
+        latest filing is older than that date are not matches and are never normalized.
+        CINs whose lookup failed are appended to `failed`.
+        """
+        # Workers share one iterator, so each CIN is looked up exactly once
+        records = iter(enumerate(cin_records))
+        matches: List[tuple] = []
+        in_flight = 0
+        slots = asyncio.Condition()
+        
+        def done() -> bool:
+            return len(matches) >= limit
+        
+        async def worker():
+            nonlocal in_flight
+            for index, cin_data in records:
+                # Never have more lookups outstanding than matches still needed
+                async with slots:
+                    await slots.wait_for(lambda: done() or len(matches) + in_flight < limit)
+                    if done():
+                        return
+                    in_flight += 1
+                try:
+                    company_data = await self._fetch_mca_company_by_cin(
+                        cin_data["cin"],
+                        base_url,
+                        provider
+                    )
+                    if company_data is None and failed is not None:
+                        failed.append(cin_data["cin"])
+                    filing_date = mca_filing_date(company_data) if company_data else None
+                    if company_data and not (since and filing_date and filing_date < since):
+                        matches.append((index, self._build_mca_startup(cin_data, company_data)))
+                except Exception as e:
+                    logger.warning(f"Error fetching CIN {cin_data['cin']}: {e}")
+                    if failed is not None:
+                        failed.append(cin_data["cin"])
+                finally:
+                    async with slots:
+                        in_flight -= 1
+                        slots.notify_all()
+        
+        workers = min(max(1, settings.MCA_MAX_CONCURRENCY), len(cin_records))
+        await asyncio.gather(*[worker() for _ in range(workers)])
+        
+        matches.sort(key=lambda match: match[0])
+        return [startup for _, startup in matches[:limit]]
+    
     async def _fetch_mca_company_by_cin(
         self, 
         cin: str, 
@@ -480,8 +1071,8 @@ class IngestionService:
             }
             url = f"{base_url}/mca/company"
             payload = {"cin": cin}
-            response = await self.client.post(url, headers=headers, json=payload)
-            
+            response = await self._post_mca(provider, url, headers, payload)
+        
         elif provider == "surepass":
             headers = {
                 "Authorization": f"Bearer {settings.MCA_API_KEY}",
@@ -489,8 +1080,8 @@ class IngestionService:
             }
             url = f"{base_url}/corporate/company"
             payload = {"id_number": cin}
-            response = await self.client.post(url, headers=headers, json=payload)
-            
+            response = await self._post_mca(provider, url, headers, payload)
+        
         elif provider == "gridlines":
             headers = {
                 "X-API-Key": settings.MCA_API_KEY,
@@ -499,7 +1090,7 @@ class IngestionService:
             }
             url = f"{base_url}/company-master"
             payload = {"cin": cin}
-            response = await self.client.post(url, headers=headers, json=payload)
+            response = await self._post_mca(provider, url, headers, payload)
         else:
             logger.error(f"Unsupported MCA provider: {provider}")
             return None
@@ -518,6 +1109,47 @@ class IngestionService:
         
         return None
     
+    async def _post_mca(
+        self,
+        provider: str,
+        url: str,
+        headers: Dict[str, str],
+        payload: Dict[str, Any]
+    ) -> httpx.Response:
+        """POST to an MCA provider (cached), paced by its rate limit and retried with backoff on 429/5xx"""
+        limiter = _get_mca_rate_limiter(provider)
+        max_retries = max(0, settings.MCA_MAX_RETRIES)
+        
+        for attempt in range(max_retries + 1):
+            try:
+                response = await self._cached_request(
+                    "mca",
+                    "POST",
+                    url,
+                    headers=headers,
+                    json=payload,
+                    provider=f"mca:{provider}",
+                    limiter=limiter
+                )
+            except httpx.TransportError as e:
+                if attempt == max_retries:
+                    raise
+                logger.warning(f"MCA request failed ({e}), retrying")
+                retry_after = None
+            else:
+                if response.status_code != 429 and response.status_code < 500:
+                    return response
+                if attempt == max_retries:
+                    return response
+                logger.warning(f"MCA API returned {response.status_code}, retrying")
+                retry_after = response.headers.get("Retry-After")
+            
+            try:
+                delay = float(retry_after)
+            except (TypeError, ValueError):
+                delay = settings.MCA_RETRY_BACKOFF * (2 ** attempt) + random.uniform(0, settings.MCA_RETRY_BACKOFF)
+            await asyncio.sleep(delay)
+    
     def _get_indian_startup_cins(self) -> List[Dict[str, Any]]:
         """Return list of Indian startup CINs with metadata for API lookup"""
         return [
@@ -625,58 +1257,136 @@ class IngestionService:
             headers = {"Authorization": f"Bearer {settings.PROXYCURL_API_KEY}"}
             params = {"url": linkedin_url}
             
-            response = await self.client.get(url, headers=headers, params=params)
+            response = await self._cached_request("proxycurl", "GET", url, headers=headers, params=params)
             
             if response.status_code != 200:
                 logger.error(f"Proxycurl API error: {response.status_code}")
                 return None
             
             return response.json()
-            
+        
         except Exception as e:
             logger.error(f"Error fetching LinkedIn profile: {e}")
             return None
     
+    def _source_fetchers(self) -> Dict[str, Callable[..., Awaitable[List[Dict[str, Any]]]]]:
+        """Map source names to their fetch methods"""
+        return {
+            "yc": self.fetch_yc_startups,
+            "crunchbase": self.fetch_crunchbase_startups,
+            "angellist": self.fetch_angellist_startups,
+            "mca": self.fetch_mca_startups,
+        }
+    
+    async def _fetch_source(
+        self,
+        source: str,
+        fetcher: Callable[..., Awaitable[List[Dict[str, Any]]]],
+        timeout: Optional[float],
+        **kwargs
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Run a single source fetch with a timeout. Returns None if it timed out or failed."""
+        try:
+            return await asyncio.wait_for(fetcher(**kwargs), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"{source}: no response within {timeout}s, skipping")
+        except Exception as e:
+            logger.error(f"Error fetching from {source}: {e}")
+        return None
+    
     async def fetch_from_all_sources(
         self, 
         limit_per_source: int = 20,
         sectors: Optional[List[str]] = None,
-        stages: Optional[List[str]] = None
+        stages: Optional[List[str]] = None,
+        sources: Optional[List[str]] = None,
+        concurrent: bool = True,
+        source_timeout: Optional[float] = None,
+        total_timeout: Optional[float] = None,
+        since: Optional[Dict[str, str]] = None,
+        on_source_complete: Optional[Callable[[str, List[Dict[str, Any]]], Optional[Awaitable[None]]]] = None
     ) -> Dict[str, List[Dict[str, Any]]]:
-        """Fetch startups from all available sources, filtered by thesis"""
+        """
+        Fetch startups from all available sources, filtered by thesis
+        
+        In concurrent mode every source is fetched at the same time, so a full refresh
+        takes roughly as long as the slowest source. Each source gets `source_timeout`
+        seconds and the whole refresh is bounded by `total_timeout`; sources that time
+        out or fail are left out of the result and everything else is still returned.
+        `on_source_complete(source, startups)` is called (and awaited, if it is a
+        coroutine function) as each source finishes. Sources with a watermark in
+        `since` are fetched in delta mode.
+        """
+        fetchers = self._source_fetchers()
+        source_timeout = source_timeout if source_timeout is not None else settings.INGESTION_SOURCE_TIMEOUT
+        total_timeout = total_timeout if total_timeout is not None else settings.INGESTION_TOTAL_TIMEOUT
+        
+        names = []
+        for source in sources or list(fetchers):
+            name = source.lower()
+            if name not in fetchers:
+                logger.warning(f"Unknown source: {source}")
+            elif name not in names:
+                names.append(name)
+        
+        logger.info(f"Fetching from {', '.join(names)} ({'concurrent' if concurrent else 'sequential'}) with filters: sectors={sectors}, stages={stages}")
+        
         results = {}
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + total_timeout
         
-        try:
-            logger.info(f"Fetching from all sources with filters: sectors={sectors}, stages={stages}")
-            
-            # Fetch from YC
-            yc_startups = await self.fetch_yc_startups(limit=limit_per_source, sectors=sectors, stages=stages)
-            results["yc"] = yc_startups
-            logger.info(f"YC: Found {len(yc_startups)} startups")
-            
-            # Fetch from Crunchbase
-            crunchbase_startups = await self.fetch_crunchbase_startups(limit=limit_per_source, sectors=sectors, stages=stages)
-            results["crunchbase"] = crunchbase_startups
-            logger.info(f"Crunchbase: Found {len(crunchbase_startups)} startups")
-            
-            # Fetch from AngelList
-            angellist_startups = await self.fetch_angellist_startups(limit=limit_per_source, sectors=sectors, stages=stages)
-            results["angellist"] = angellist_startups
-            logger.info(f"AngelList: Found {len(angellist_startups)} startups")
-            
-            # Fetch from MCA (India)
-            mca_startups = await self.fetch_mca_startups(limit=limit_per_source, sectors=sectors, stages=stages)
-            results["mca"] = mca_startups
-            logger.info(f"MCA (India): Found {len(mca_startups)} startups")
+        async def record(name: str, startups: Optional[List[Dict[str, Any]]]):
+            if startups is None:
+                return
+            results[name] = startups
+            logger.info(f"{name}: Found {len(startups)} startups")
+            if on_source_complete:
+                result = on_source_complete(name, startups)
+                if inspect.isawaitable(result):
+                    await result
+        
+        def fetch(name: str, timeout: float):
+            return self._fetch_source(
+                name,
+                fetchers[name],
+                timeout,
+                limit=limit_per_source,
+                sectors=sectors,
+                stages=stages,
+                since=(since or {}).get(name)
+            )
+        
+        if concurrent:
+            tasks = {asyncio.create_task(fetch(name, source_timeout)): name for name in names}
+            pending = set(tasks)
+            while pending:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    await record(tasks[task], task.result())
             
-            total = sum(len(s) for s in results.values())
-            logger.info(f"Total startups fetched from all sources: {total}")
+            for task in pending:
+                task.cancel()
+                logger.warning(f"{tasks[task]}: still running after {total_timeout}s total deadline, cancelled")
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        else:
+            for name in names:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    logger.warning(f"{name}: skipped, {total_timeout}s total deadline reached")
+                    continue
+                await record(name, await fetch(name, min(source_timeout, remaining)))
         
-        except Exception as e:
-            logger.error(f"Error fetching from all sources: {str(e)}")
+        total = sum(len(s) for s in results.values())
+        logger.info(f"Total startups fetched from all sources: {total}")
         
         return results
     
     async def close(self):
-        """Close the HTTP client"""
-        await self.client.aclose()
+        """Release the service. The shared HTTP client is closed at app shutdown."""
+        self.client = None
@@ -0,0 +1,56 @@
+"""
+DealFlow Backend - Background job state
+Persists job progress on its Beanie document with throttled writes
+"""
+import time
+from typing import Optional, Set
+from beanie import Document
+from loguru import logger
+from app.core.config import settings
+
+
+class JobProgressTracker:
+    """
+    Applies progress changes to a job document and writes them to MongoDB at most
+    once every `flush_interval` seconds.
+    
+    Changes are applied to the document immediately and remembered as dirty fields;
+    `update()` only issues a `$set` when the interval has elapsed (or `force=True`),
+    so per-item progress ticks cost a handful of writes instead of one per item.
+    Status transitions should be written with `force=True`.
+    """
+    
+    def __init__(self, job: Document, flush_interval: Optional[float] = None):
+        self.job = job
+        self.flush_interval = flush_interval if flush_interval is not None else settings.JOB_PROGRESS_FLUSH_INTERVAL
+        self._dirty: Set[str] = set()
+        self._last_flush = 0.0
+    
+    async def update(self, force: bool = False, **fields):
+        """Apply field changes and write them if the flush interval has elapsed"""
+        for field, value in fields.items():
+            setattr(self.job, field, value)
+            self._dirty.add(field)
+        
+        if force or time.monotonic() - self._last_flush >= self.flush_interval:
+            await self.flush()
+    
+    def add_error(self, message: str):
+        """Record an error message on the job (written with the next flush)"""
+        self.job.errors.append(message)
+        self._dirty.add("errors")
+    
+    async def flush(self):
+        """Write all pending changes"""
+        if not self._dirty:
+            return
+        
+        changes = {field: getattr(self.job, field) for field in self._dirty}
+        self._dirty.clear()
+        self._last_flush = time.monotonic()
+        try:
+            await self.job.set(changes)
+        except Exception as e:
+            # Keep the changes pending so the next flush retries them
+            self._dirty.update(changes)
+            logger.error(f"Failed to persist job progress: {e}")
@@ -0,0 +1,68 @@
+"""
+DealFlow Backend - Keyword Matching
+Compiled multi-keyword matcher used by the scoring heuristics
+"""
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Optional, Sequence, Set
+
+
+class KeywordMatcher:
+    """
+    Finds which keyword categories occur in a text, in a single regex pass
+    
+    All keywords are compiled into one alternation (longest first) wrapped in a
+    lookahead, so the scan reports a match at every position. When several keywords
+    start at the same position only the longest is reported, but the others are then
+    all prefixes of it, so each keyword also carries the categories of its prefixes.
+    The result is exactly "category C is present iff some keyword of C is a substring".
+    
+    Texts are lowercased before matching; keywords are stored lowercased.
+    """
+    
+    def __init__(self, vocabularies: Dict[str, Iterable[str]]):
+        categories: Dict[str, Set[str]] = {}
+        for category, keywords in vocabularies.items():
+            for keyword in keywords:
+                categories.setdefault(keyword.lower(), set()).add(category)
+        
+        # Prefix closure: a match on "ph.d." also counts as a match on "ph.d"
+        self._categories: Dict[str, FrozenSet[str]] = {
+            keyword: frozenset().union(*(
+                categories[other] for other in categories if keyword.startswith(other)
+            ))
+            for keyword in categories
+        }
+        
+        alternation = "|".join(
+            re.escape(keyword) for keyword in sorted(self._categories, key=len, reverse=True)
+        )
+        self._pattern = re.compile(f"(?=({alternation}))") if self._categories else None
+    
+    def categories(self, text: Optional[str]) -> FrozenSet[str]:
+        """All categories with at least one keyword in text"""
+        if text is None or self._pattern is None:
+            return frozenset()
+        
+        found: Set[str] = set()
+        seen: Set[str] = set()
+        for match in self._pattern.finditer(text.lower()):
+            keyword = match.group(1)
+            if keyword not in seen:
+                seen.add(keyword)
+                found |= self._categories[keyword]
+        return frozenset(found)
+    
+    def first(self, text: Optional[str], candidates: Sequence[str]) -> Optional[str]:
+        """First candidate category (in the given order) present in text"""
+        found = self.categories(text)
+        for candidate in candidates:
+            if candidate in found:
+                return candidate
+        return None
+
+
+@lru_cache(maxsize=256)
+def term_matcher(terms: Sequence[str]) -> KeywordMatcher:
+    """Matcher whose categories are the terms themselves (e.g. thesis stages); cached per term tuple"""
+    return KeywordMatcher({term: [term] for term in terms})
@@ -6,16 +6,15 @@ from typing import Dict, Any, Optional
 from app.models.startup import Startup
 from app.models.user import User
 from app.core.config import settings
+from app.core.http import get_openai_client
 from loguru import logger
-import openai
 
 
 class OutreachService:
     """Service for generating personalized outreach messages"""
     
     def __init__(self):
-        if settings.OPENAI_API_KEY:
-            openai.api_key = settings.OPENAI_API_KEY
+        self.openai = get_openai_client()
     
     async def generate_message(
         self,
@@ -105,7 +104,7 @@ class OutreachService:
         Format as JSON with "subject" and "body" fields.
         """
         
-        response = await openai.ChatCompletion.acreate(
+        response = await self.openai.chat.completions.create(
             model="gpt-4",
             messages=[
                 {
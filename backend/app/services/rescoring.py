@@ -0,0 +1,174 @@
+"""
+DealFlow Backend - Bulk Rescoring
+Streams the startups collection through the batch scorer and writes back only changed scores
+"""
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from loguru import logger
+from app.core.config import settings
+from app.models.rescore import RescoreJob
+from app.models.startup import DUPLICATE_KEY, UNIQUE_KEYS, Metrics, Startup, normalize_cin, normalize_domain, normalize_name, search_terms
+from app.services.thesis import ThesisLike
+from app.services.batch_scoring import BatchScorer
+from app.services.jobs import JobProgressTracker
+from app.services.startup_stats import invalidate_startup_stats
+
+
+def score_changes(startup: Startup, result: Dict[str, Any]) -> Dict[str, Any]:
+    """$set document for the score fields that differ from what is stored"""
+    changes = {}
+    if startup.score != result["overall_score"]:
+        changes["score"] = result["overall_score"]
+    if startup.score_breakdown != result["breakdown"]:
+        changes["score_breakdown"] = result["breakdown"].model_dump()
+    if startup.unicorn_probability != result["unicorn_probability"]:
+        changes["unicorn_probability"] = result["unicorn_probability"]
+    if startup.investor_fit != result["investor_fit"]:
+        changes["investor_fit"] = result["investor_fit"]
+    return changes
+
+
+async def backfill_derived_fields(chunk_size: int = 1000) -> int:
+    """
+    Store parsed numeric metrics, entity-resolution and search keys on startups saved before
+    those fields existed. Returns the number of startups updated.
+    """
+    collection = Startup.get_motor_collection()
+    cursor = collection.find(
+        {"$or": [
+            {"metrics": {"$type": "object"}, "metrics.growth_pct": {"$exists": False}},
+            {"name_key": {"$exists": False}},
+            {"search_terms": {"$exists": False}}
+        ]},
+        {"metrics": 1, "name": 1, "tagline": 1, "website": 1, "cin": 1, "domain": 1},
+        batch_size=chunk_size
+    )
+    
+    updated = 0
+    pending = []
+    async for raw in cursor:
+        changes = {
+            "domain": normalize_domain(raw.get("website")) or raw.get("domain"),
+            "name_key": normalize_name(raw.get("name")),
+            "cin": normalize_cin(raw.get("cin")),
+            "search_terms": search_terms(raw.get("name"), raw.get("tagline"))
+        }
+        if isinstance(raw.get("metrics"), dict):
+            changes["metrics"] = Metrics.model_validate(raw["metrics"]).model_dump()
+        pending.append((raw["_id"], changes))
+        if len(pending) >= chunk_size:
+            updated += await _write_backfill(pending)
+            pending = []
+    if pending:
+        updated += await _write_backfill(pending)
+    return updated
+
+
+async def _write_backfill(pending: List[Tuple[Any, Dict[str, Any]]]) -> int:
+    """Write backfill changes by startup id; unique keys another startup already holds are left unset"""
+    collection = Startup.get_motor_collection()
+    operations = [UpdateOne({"_id": startup_id}, {"$set": changes}) for startup_id, changes in pending]
+    try:
+        return (await collection.bulk_write(operations, ordered=False)).modified_count
+    except BulkWriteError as e:
+        errors = e.details.get("writeErrors", [])
+        if any(error.get("code") != DUPLICATE_KEY for error in errors):
+            raise
+        logger.warning(f"{len(errors)} startups share a CIN or domain with another startup; left unset on them")
+        retry = [
+            UpdateOne(
+                {"_id": pending[error["index"]][0]},
+                {"$set": {name: value for name, value in pending[error["index"]][1].items() if name not in UNIQUE_KEYS}}
+            )
+            for error in errors
+        ]
+        return e.details.get("nModified", 0) + (await collection.bulk_write(retry, ordered=False)).modified_count
+
+
+async def _rescore_chunk(
+    chunk: List[Startup],
+    scorer: BatchScorer,
+    progress: JobProgressTracker
+):
+    job = progress.job
+    
+    # Scoring is CPU-bound; keep it off the event loop
+    results = await asyncio.to_thread(scorer.score, chunk)
+    
+    now = datetime.utcnow()
+    operations = []
+    for startup, result in zip(chunk, results):
+        changes = score_changes(startup, result)
+        if changes:
+            changes["updated_at"] = now
+            operations.append(UpdateOne({"_id": startup.id}, {"$set": changes}))
+    
+    updated = 0
+    if operations:
+        try:
+            write = await Startup.get_motor_collection().bulk_write(operations, ordered=False)
+            updated = write.modified_count
+        except BulkWriteError as e:
+            updated = e.details.get("nModified", 0)
+            for error in e.details.get("writeErrors", [])[:5]:
+                progress.add_error(f"Update error: {error.get('errmsg', 'write error')}")
+            logger.error(f"Rescore job {job.job_id}: {len(e.details.get('writeErrors', []))} updates failed")
+    
+    if updated:
+        invalidate_startup_stats()
+    
+    processed = job.processed + len(chunk)
+    await progress.update(
+        processed=processed,
+        updated=job.updated + updated,
+        progress=min(99, int(processed / max(job.total, 1) * 100))
+    )
+
+
+async def run_rescore_job(job: RescoreJob, thesis: ThesisLike = None):
+    """
+    Rescore every startup against `thesis`
+    Startups stored before metrics were parsed get their derived fields first.
+    The collection is read through a cursor in RESCORE_CHUNK_SIZE chunks; each chunk is
+    scored with BatchScorer and changed fields are written with one unordered bulk_write.
+    """
+    progress = JobProgressTracker(job)
+    chunk_size = max(1, settings.RESCORE_CHUNK_SIZE)
+    
+    try:
+        started_at = datetime.utcnow()
+        total = await Startup.count()
+        await progress.update(force=True, status="running", started_at=started_at, total=total)
+        logger.info(f"Rescore job {job.job_id}: scoring {total} startups")
+        
+        backfilled = await backfill_derived_fields(chunk_size)
+        if backfilled:
+            logger.info(f"Rescore job {job.job_id}: stored derived fields for {backfilled} startups")
+        
+        scorer = BatchScorer(thesis)
+        chunk: List[Startup] = []
+        async for startup in Startup.find_all(batch_size=chunk_size):
+            chunk.append(startup)
+            if len(chunk) >= chunk_size:
+                await _rescore_chunk(chunk, scorer, progress)
+                chunk = []
+        if chunk:
+            await _rescore_chunk(chunk, scorer, progress)
+        
+        completed_at = datetime.utcnow()
+        await progress.update(
+            force=True,
+            status="completed",
+            progress=100,
+            completed_at=completed_at,
+            execution_time=(completed_at - started_at).total_seconds()
+        )
+        logger.info(f"Rescore job {job.job_id} completed: {job.updated} of {job.processed} startups changed")
+    
+    except Exception as e:
+        logger.error(f"Rescore job {job.job_id} failed: {e}")
+        progress.add_error(str(e))
+        await progress.update(force=True, status="failed", completed_at=datetime.utcnow())
@@ -2,30 +2,182 @@
 DealFlow Backend - AI Scoring Service
 Scores startups based on Team, Traction, Market, Fit, and Unicorn Probability
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from app.models.startup import Startup, ScoreBreakdown
-from app.models.user import FundThesis
 from app.core.config import settings
+from app.core.http import get_openai_client
+from app.services.ai_scoring import get_ai_scoring_pipeline
+from app.services.keywords import KeywordMatcher
+from app.services.thesis import ThesisLike, compile_thesis
 from loguru import logger
-import openai
+
+
+# Weights for the overall score
+SCORE_WEIGHTS = {
+    "team": 0.30,
+    "traction": 0.25,
+    "market": 0.25,
+    "fit": 0.20
+}
+
+# Team signals (matched against lowercased founder background/role)
+TOP_COMPANIES = [
+    "google", "meta", "facebook", "amazon", "apple", "microsoft",
+    "netflix", "deepmind", "openai", "stripe", "coinbase"
+]
+TOP_SCHOOLS = ["stanford", "mit", "harvard", "berkeley", "yale", "princeton"]
+PHD_KEYWORDS = ["phd", "ph.d"]
+SERIAL_FOUNDER_KEYWORDS = ["serial", "exit"]
+TECHNICAL_ROLES = ["cto", "technical"]
+
+# Market signals; the first matching sector/stage wins, in this order
+HOT_SECTORS = {
+    "ai/ml": 15,
+    "ai": 15,
+    "healthtech": 12,
+    "fintech": 12,
+    "climate tech": 15,
+    "enterprise saas": 10,
+    "developer tools": 10,
+    "crypto": 8,
+    "cybersecurity": 12,
+    "biotech": 12,
+}
+STAGE_SCORES = {
+    "pre-seed": 10,
+    "seed": 8,
+    "series a": 5,
+    "series b": 3,
+    "series c": 2,
+}
+STARTUP_HUBS = ["san francisco", "new york", "boston", "austin", "seattle", "london"]
+
+# Compiled once; each text field is scanned in a single pass for all categories
+TEAM_KEYWORDS = KeywordMatcher({
+    "top_company": TOP_COMPANIES,
+    "top_school": TOP_SCHOOLS,
+    "phd": PHD_KEYWORDS,
+    "serial_founder": SERIAL_FOUNDER_KEYWORDS,
+    "technical_role": TECHNICAL_ROLES,
+})
+TRACTION_KEYWORDS = KeywordMatcher({
+    "yc": ["y combinator", "yc"],
+    "press": ["techcrunch", "featured"],
+    "partnership": ["partnership"],
+    "growth": ["grew", "growth"],
+    "enterprise_customers": ["enterprise", "fortune"],
+    "customers": ["client", "customer"],
+})
+MARKET_KEYWORDS = KeywordMatcher({
+    "startup_hub": STARTUP_HUBS,
+})
+
+
+def team_points(background: Optional[str], role: Optional[str], linkedin: Optional[str]) -> int:
+    """Team points for a single founder"""
+    points = 0
+    found = TEAM_KEYWORDS.categories(background or "")
+    
+    # Ex-FAANG or top companies
+    if "top_company" in found:
+        points += 10
+    
+    # Academic credentials
+    if "top_school" in found:
+        points += 8
+    
+    # PhD
+    if "phd" in found:
+        points += 5
+    
+    # Serial entrepreneur
+    if "serial_founder" in found:
+        points += 10
+    
+    # Technical co-founder check
+    if role and "technical_role" in TEAM_KEYWORDS.categories(role):
+        points += 5
+    
+    # LinkedIn presence
+    if linkedin:
+        points += 2
+    
+    return points
+
+
+def revenue_points(revenue_usd: Optional[float]) -> int:
+    """Traction points for parsed revenue (Metrics.revenue_usd)"""
+    if revenue_usd is None:
+        return 0
+    if revenue_usd >= 10_000_000:
+        return 30
+    elif revenue_usd >= 5_000_000:
+        return 25
+    elif revenue_usd >= 1_000_000:
+        return 20
+    elif revenue_usd >= 100_000:
+        return 10
+    elif revenue_usd > 0:
+        return 5
+    return 0
+
+
+def growth_points(growth_pct: Optional[float]) -> int:
+    """Traction points for parsed growth (Metrics.growth_pct); unparsed growth gets the minimum"""
+    if growth_pct is None:
+        return 5
+    if growth_pct >= 200:
+        return 25
+    elif growth_pct >= 100:
+        return 20
+    elif growth_pct >= 50:
+        return 15
+    else:
+        return 5
+
+
+def users_points(users: str) -> int:
+    """Traction points for a users/customers string"""
+    found = TRACTION_KEYWORDS.categories(users)
+    if "enterprise_customers" in found:
+        return 15
+    elif "customers" in found:
+        return 10
+    return 0
+
+
+def signal_points(signal: str) -> int:
+    """Traction points for a single signal"""
+    points = 0
+    found = TRACTION_KEYWORDS.categories(signal)
+    if "yc" in found:
+        points += 10
+    if "press" in found:
+        points += 5
+    if "partnership" in found:
+        points += 8
+    if "growth" in found:
+        points += 5
+    return points
 
 
 class ScoringService:
     """Service for scoring startups using AI and heuristics"""
     
     def __init__(self):
-        if settings.OPENAI_API_KEY:
-            openai.api_key = settings.OPENAI_API_KEY
+        self.openai = get_openai_client()
     
     async def calculate_score(
         self,
         startup: Startup,
-        thesis: Optional[FundThesis] = None
+        thesis: ThesisLike = None
     ) -> Dict[str, Any]:
         """
         Calculate AI score for a startup
         Returns overall score, breakdown, unicorn probability, and investor fit
         """
+        thesis = compile_thesis(thesis)
+        
         # Calculate individual scores
         team_score = await self._score_team(startup)
         traction_score = await self._score_traction(startup)
@@ -33,12 +185,7 @@ class ScoringService:
         fit_score = await self._score_fit(startup, thesis)
         
         # Calculate weighted overall score
-        weights = {
-            "team": 0.30,
-            "traction": 0.25,
-            "market": 0.25,
-            "fit": 0.20
-        }
+        weights = SCORE_WEIGHTS
         
         overall_score = (
             team_score * weights["team"] +
@@ -69,6 +216,18 @@ class ScoringService:
             "investor_fit": investor_fit
         }
     
+    async def calculate_scores(
+        self,
+        startups: List[Startup],
+        thesis: ThesisLike = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Score many startups against one thesis with the NumPy batch engine
+        Returns the same dicts as calculate_score, in input order
+        """
+        from app.services.batch_scoring import BatchScorer  # Imports this module
+        return BatchScorer(thesis, scoring_service=self).score(startups)
+    
     async def _score_team(self, startup: Startup) -> float:
         """Score the founding team"""
         score = 50.0  # Base score
@@ -77,35 +236,7 @@ class ScoringService:
             return score
         
         for founder in startup.founders:
-            # Check for strong backgrounds
-            background = founder.background.lower() if founder.background else ""
-            
-            # Ex-FAANG or top companies
-            if any(company in background for company in 
-                   ["google", "meta", "facebook", "amazon", "apple", "microsoft", 
-                    "netflix", "deepmind", "openai", "stripe", "coinbase"]):
-                score += 10
-            
-            # Academic credentials
-            if any(school in background for school in 
-                   ["stanford", "mit", "harvard", "berkeley", "yale", "princeton"]):
-                score += 8
-            
-            # PhD
-            if "phd" in background or "ph.d" in background:
-                score += 5
-            
-            # Serial entrepreneur
-            if "serial" in background or "exit" in background:
-                score += 10
-            
-            # Technical co-founder check
-            if founder.role and any(role in founder.role.lower() for role in ["cto", "technical"]):
-                score += 5
-            
-            # LinkedIn presence
-            if founder.linkedin:
-                score += 2
+            score += team_points(founder.background, founder.role, founder.linkedin)
         
         # Multiple founders bonus
         if len(startup.founders) >= 2:
@@ -124,59 +255,20 @@ class ScoringService:
         
         # Revenue scoring
         if metrics.revenue:
-            revenue_str = metrics.revenue.lower()
-            if "m" in revenue_str:  # Millions
-                try:
-                    amount = float(revenue_str.replace("$", "").replace("m", "").replace("arr", "").strip())
-                    if amount >= 10:
-                        score += 30
-                    elif amount >= 5:
-                        score += 25
-                    elif amount >= 1:
-                        score += 20
-                    else:
-                        score += 10
-                except:
-                    score += 10
-            elif "k" in revenue_str:  # Thousands
-                score += 5
+            score += revenue_points(metrics.revenue_usd)
         
         # Growth scoring
         if metrics.growth:
-            growth_str = metrics.growth.replace("+", "").replace("%", "").replace("yoy", "").strip()
-            try:
-                growth = float(growth_str)
-                if growth >= 200:
-                    score += 25
-                elif growth >= 100:
-                    score += 20
-                elif growth >= 50:
-                    score += 15
-                else:
-                    score += 5
-            except:
-                score += 5
+            score += growth_points(metrics.growth_pct)
         
         # User/Customer base
         if metrics.users:
-            users_str = metrics.users.lower()
-            if "enterprise" in users_str or "fortune" in users_str:
-                score += 15
-            elif any(word in users_str for word in ["client", "customer"]):
-                score += 10
+            score += users_points(metrics.users)
         
         # Signals scoring
         if startup.signals:
             for signal in startup.signals:
-                signal_lower = signal.lower()
-                if "y combinator" in signal_lower or "yc" in signal_lower:
-                    score += 10
-                if "techcrunch" in signal_lower or "featured" in signal_lower:
-                    score += 5
-                if "partnership" in signal_lower:
-                    score += 8
-                if "grew" in signal_lower or "growth" in signal_lower:
-                    score += 5
+                score += signal_points(signal)
         
         return min(100, score)
     
@@ -185,44 +277,22 @@ class ScoringService:
         score = 60.0  # Base score
         
         # Hot sectors get bonus
-        hot_sectors = {
-            "ai/ml": 15,
-            "ai": 15,
-            "healthtech": 12,
-            "fintech": 12,
-            "climate tech": 15,
-            "enterprise saas": 10,
-            "developer tools": 10,
-            "crypto": 8,
-            "cybersecurity": 12,
-            "biotech": 12,
-        }
-        
         sector_lower = startup.sector.lower() if startup.sector else ""
-        for sector, bonus in hot_sectors.items():
+        for sector, bonus in HOT_SECTORS.items():
             if sector in sector_lower:
                 score += bonus
                 break
         
         # Stage scoring (earlier stage = higher potential)
-        stage_scores = {
-            "pre-seed": 10,
-            "seed": 8,
-            "series a": 5,
-            "series b": 3,
-            "series c": 2,
-        }
-        
         stage_lower = startup.stage.lower() if startup.stage else ""
-        for stage, bonus in stage_scores.items():
+        for stage, bonus in STAGE_SCORES.items():
             if stage in stage_lower:
                 score += bonus
                 break
         
         # Location bonus (strong startup ecosystems)
         location_lower = startup.location.lower() if startup.location else ""
-        if any(city in location_lower for city in 
-               ["san francisco", "new york", "boston", "austin", "seattle", "london"]):
+        if "startup_hub" in MARKET_KEYWORDS.categories(location_lower):
             score += 5
         
         # YC batch bonus
@@ -234,45 +304,15 @@ class ScoringService:
     async def _score_fit(
         self,
         startup: Startup,
-        thesis: Optional[FundThesis]
+        thesis: ThesisLike
     ) -> float:
         """Score investor fit based on thesis"""
+        thesis = compile_thesis(thesis)
         if not thesis:
             return 70.0  # Default moderate fit
         
-        score = 50.0  # Base score
-        
-        # Sector match
-        if thesis.sectors:
-            sector_lower = startup.sector.lower() if startup.sector else ""
-            for thesis_sector in thesis.sectors:
-                if thesis_sector.lower() in sector_lower or sector_lower in thesis_sector.lower():
-                    score += 20
-                    break
-        
-        # Stage match
-        if thesis.stages:
-            stage_lower = startup.stage.lower() if startup.stage else ""
-            for thesis_stage in thesis.stages:
-                if thesis_stage.lower() in stage_lower:
-                    score += 20
-                    break
-        
-        # Geography match
-        if thesis.geographies:
-            location_lower = startup.location.lower() if startup.location else ""
-            for geo in thesis.geographies:
-                if geo.lower() in location_lower:
-                    score += 15
-                    break
-        
-        # Anti-portfolio check (negative score)
-        if thesis.anti_portfolio:
-            sector_lower = startup.sector.lower() if startup.sector else ""
-            for anti in thesis.anti_portfolio:
-                if anti.lower() in sector_lower:
-                    score -= 30
-                    break
+        # Base score plus sector/stage/geography matches, minus anti-portfolio
+        score = 50.0 + thesis.fit_adjustment(startup.sector, startup.stage, startup.location)
         
         return max(0, min(100, score))
     
@@ -307,36 +347,28 @@ class ScoringService:
     def _generate_fit_description(
         self,
         startup: Startup,
-        thesis: Optional[FundThesis],
+        thesis: ThesisLike,
         fit_score: float
     ) -> str:
         """Generate human-readable investor fit description"""
         if not thesis:
             return f"Score: {fit_score}/100. Configure your fund thesis for personalized fit analysis."
         
+        thesis = compile_thesis(thesis)
         matches = []
         
         # Check matches
-        if thesis.sectors:
-            sector_lower = startup.sector.lower() if startup.sector else ""
-            for thesis_sector in thesis.sectors:
-                if thesis_sector.lower() in sector_lower or sector_lower in thesis_sector.lower():
-                    matches.append(f"{thesis_sector} thesis")
-                    break
+        thesis_sector = thesis.sector_match(startup.sector)
+        if thesis_sector is not None:
+            matches.append(f"{thesis_sector} thesis")
         
-        if thesis.stages:
-            stage_lower = startup.stage.lower() if startup.stage else ""
-            for thesis_stage in thesis.stages:
-                if thesis_stage.lower() in stage_lower:
-                    matches.append(f"{thesis_stage} stage")
-                    break
-        
-        if thesis.geographies:
-            location_lower = startup.location.lower() if startup.location else ""
-            for geo in thesis.geographies:
-                if geo.lower() in location_lower:
-                    matches.append(f"{geo} geography")
-                    break
+        thesis_stage = thesis.stage_match(startup.stage)
+        if thesis_stage is not None:
+            matches.append(f"{thesis_stage} stage")
+        
+        geo = thesis.geography_match(startup.location)
+        if geo is not None:
+            matches.append(f"{geo} geography")
         
         if fit_score >= 85:
             prefix = "Perfect match"
@@ -357,49 +389,19 @@ class ScoringService:
         Use OpenAI to provide enhanced scoring and insights
         This is a premium feature requiring OpenAI API key
         """
+        results = await self.score_many_with_ai([startup])
+        return results[0]
+    
+    async def score_many_with_ai(self, startups: List[Startup]) -> List[Optional[Dict[str, Any]]]:
+        """
+        AI scores for many startups, batched and cached (see app.services.ai_scoring)
+        Returns one dict (AIScore fields) or None per startup, in input order
+        """
         if not settings.OPENAI_API_KEY:
-            return None
+            return [None] * len(startups)
         
-        try:
-            prompt = f"""
-            Analyze this startup and provide a JSON response with scores (0-100) and brief insights:
-            
-            Name: {startup.name}
-            Sector: {startup.sector}
-            Stage: {startup.stage}
-            Tagline: {startup.tagline}
-            Description: {startup.description}
-            Founders: {[f.dict() for f in startup.founders] if startup.founders else 'Unknown'}
-            Metrics: {startup.metrics.dict() if startup.metrics else 'Unknown'}
-            Signals: {startup.signals}
-            
-            Provide:
-            1. team_score (0-100)
-            2. market_score (0-100)
-            3. traction_score (0-100)
-            4. unicorn_probability (0-100)
-            5. key_strengths (list of 3)
-            6. key_risks (list of 3)
-            7. recommendation (one sentence)
-            """
-            
-            response = await openai.ChatCompletion.acreate(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a VC analyst scoring startups."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3
-            )
-            
-            # Parse response
-            content = response.choices[0].message.content
-            # In production, properly parse the JSON response
-            return {"ai_analysis": content}
-            
-        except Exception as e:
-            logger.error(f"OpenAI scoring error: {e}")
-            return None
+        scores = await get_ai_scoring_pipeline().score(startups)
+        return [score.model_dump() if score else None for score in scores]
 
     async def generate_insights(self, startup_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
@@ -425,7 +427,7 @@ class ScoringService:
             logger.warning(f"Could not generate insights: {e}")
             return None
 
-    async def calculate_fit_score(self, startup_data: Dict[str, Any], thesis: Optional[FundThesis] = None) -> float:
+    async def calculate_fit_score(self, startup_data: Dict[str, Any], thesis: ThesisLike = None) -> float:
         """
         Calculate how well a startup fits the investor's thesis
         Returns a score from 0-100
@@ -436,17 +438,18 @@ class ScoringService:
         stage = startup_data.get("stage", "")
         
         # If no thesis provided, return base score
+        thesis = compile_thesis(thesis)
         if not thesis:
             return score
         
         # Sector match
         if thesis.sectors:
-            if sector in thesis.sectors or "Sector Agnostic" in thesis.sectors:
+            if thesis.has_sector(sector):
                 score += 25
         
         # Stage match
         if thesis.stages:
-            if stage in thesis.stages:
+            if thesis.has_stage(stage):
                 score += 25
         
         return min(score, 100.0)
@@ -0,0 +1,115 @@
+"""
+DealFlow Backend - Startup Search
+Ranked text search with typeahead over startups
+
+Words are matched through the weighted text index on name, tagline and description
+(stemmed, ranked by textScore). The word still being typed (the last one, unless the
+search ends with a space) is also matched as a prefix of the indexed search_terms
+(name and tagline words), so typeahead finds partial words. Both branches of the
+$or are index scans rather than collection scans. Startups whose name starts with
+the whole search rank first.
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from app.models.fit import StartupFit
+from app.models.startup import Startup, search_terms
+from app.models.user import User
+
+# Relevance added when the startup's name starts with the search
+NAME_PREFIX_BOOST = 10
+
+
+def parse_search(search: str) -> Tuple[List[str], Optional[str]]:
+    """Complete words of a search and the trailing word being typed (None if complete)"""
+    words = search_terms(search)
+    if not words or not search[-1].isalnum():
+        return words, None
+    return words[:-1], words[-1]
+
+
+def search_match(search: str) -> Optional[Dict[str, Any]]:
+    """
+    $match conditions for a search (None if it has no words)
+    Startups match on the text index (any word, including the one being typed) or,
+    for typeahead, on name/tagline words that contain the complete words and start
+    with the word being typed.
+    """
+    words, prefix = parse_search(search)
+    if not words and not prefix:
+        return None
+    text = {"$text": {"$search": " ".join(words + ([prefix] if prefix else []))}}
+    if not prefix:
+        return text
+    typeahead: Dict[str, Any] = {"$regex": f"^{re.escape(prefix)}"}
+    if words:
+        typeahead["$all"] = words
+    return {"$or": [text, {"search_terms": typeahead}]}
+
+
+def _relevance(search: str) -> Dict[str, Any]:
+    words, prefix = parse_search(search)
+    phrase = " ".join(words + ([prefix] if prefix else []))
+    name_boost = {
+        "$cond": [
+            {"$eq": [{"$indexOfCP": [{"$ifNull": ["$name_key", ""]}, phrase]}, 0]},
+            NAME_PREFIX_BOOST,
+            0
+        ]
+    }
+    # Typeahead-only matches have no text score
+    return {"$add": [{"$ifNull": [{"$meta": "textScore"}, 0]}, name_boost]}
+
+
+async def search_startups(
+    search: str,
+    query: Dict[str, Any],
+    user: Optional[User] = None,
+    min_score: Optional[float] = None,
+    skip: int = 0,
+    limit: int = 50
+) -> List[Tuple[Startup, Optional[StartupFit]]]:
+    """
+    Startups matching `search` and the `query` filters, most relevant first (then by score)
+    With `user`, each startup comes with the user's fit and `min_score` applies to it.
+    """
+    match = search_match(search)
+    if match is None:
+        return []
+    match = {**query, **match}
+    if min_score is not None and user is None:
+        match["score"] = {"$gte": min_score}
+    
+    pipeline: List[Dict[str, Any]] = [
+        {"$match": match},
+        {"$addFields": {"_relevance": _relevance(search)}}
+    ]
+    ranked = [{"$sort": {"_relevance": -1, "score": -1, "_id": -1}}]
+    page = [{"$skip": skip}, {"$limit": limit}]
+    
+    if user is None:
+        pipeline += ranked + page
+    else:
+        join = [
+            {"$lookup": {
+                "from": StartupFit.get_motor_collection().name,
+                "let": {"startup_id": "$_id"},
+                "pipeline": [
+                    {"$match": {"user_id": str(user.id), "$expr": {"$eq": ["$startup_id", "$$startup_id"]}}}
+                ],
+                "as": "fit"
+            }},
+            {"$unwind": {"path": "$fit", "preserveNullAndEmptyArrays": True}}
+        ]
+        if min_score is not None:
+            # The fit is needed to filter, so join before cutting the page
+            pipeline += join + [{"$match": {"fit.score": {"$gte": min_score}}}] + ranked + page
+        else:
+            pipeline += ranked + page + join
+    
+    rows = await Startup.aggregate(pipeline).to_list()
+    results = []
+    for row in rows:
+        row.pop("_relevance", None)
+        fit = row.pop("fit", None)
+        results.append((Startup.model_validate(row), StartupFit.model_validate(fit) if fit else None))
+    return results
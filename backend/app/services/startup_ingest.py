@@ -0,0 +1,235 @@
+"""
+DealFlow Backend - Startup Ingestion
+Idempotent upserts of discovered companies into the startups collection
+
+Each resolved company is keyed on yc_id, crunchbase_id, CIN or website domain (in
+that order). Stored startups are loaded with one query per batch and only fields
+whose ingested value differs are $set; new companies are inserted through
+$setOnInsert upserts, so re-running the same ingest writes nothing and the
+collection grows only with new companies.
+
+Sources own the identifiers, website, YC batch and source list and keep them
+current. Name, tagline, sector, stage, location and description can be edited in
+the app (PUT /startups/{id}), so ingest only fills them in while they are empty
+and never overwrites an edit.
+"""
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Sequence, Set, Tuple
+from beanie import PydanticObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from loguru import logger
+from app.models.startup import DUPLICATE_KEY, Startup, normalize_cin, normalize_domain, normalize_name, search_terms
+from app.services.batch_scoring import BatchScorer
+from app.services.entity_resolution import ResolvedEntity
+from app.services.fits import SCORED_FIELDS, refresh_startup_fits
+from app.services.rescoring import score_changes
+from app.services.startup_stats import invalidate_startup_stats
+from app.services.thesis import ThesisLike
+
+# Upsert keys, strongest first
+INGEST_KEYS = ("yc_id", "crunchbase_id", "cin", "domain")
+
+# Startup fields taken from source records (everything else is owned by the app)
+INGEST_FIELDS = (
+    "name", "tagline", "sector", "stage", "location", "description", "website",
+    "yc_batch", "yc_id", "crunchbase_id", "cin",
+)
+
+# Ingested fields kept in step with the source; the other INGEST_FIELDS are editable
+# in the app and only filled in when empty
+SOURCE_OWNED_FIELDS = {"website", "domain", "yc_batch", "yc_id", "crunchbase_id", "cin"}
+
+@dataclass
+class IngestOutcome:
+    """What an ingest run did, with the startup id for each entity position"""
+    startup_ids: Dict[int, str] = field(default_factory=dict)
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    skipped: int = 0  # No upsert key
+    errors: List[str] = field(default_factory=list)
+
+
+def ingest_fields(entity: ResolvedEntity) -> Dict[str, Any]:
+    """Startup fields for a resolved company (empty values left out)"""
+    fields = {
+        name: entity.data.get(name) for name in INGEST_FIELDS
+        if entity.data.get(name) not in (None, "", [])
+    }
+    fields["cin"] = normalize_cin(fields.get("cin"))
+    fields["domain"] = entity.domain or normalize_domain(fields.get("website"))
+    return {name: value for name, value in fields.items() if value is not None}
+
+
+def _index_keys(doc: Dict[str, Any]) -> List[Tuple[str, Any]]:
+    return [(key, doc[key]) for key in INGEST_KEYS if doc.get(key)]
+
+
+def _changed_fields(stored: Dict[str, Any], fields: Dict[str, Any], sources: List[str]) -> Dict[str, Any]:
+    """$set document for source-owned values that changed and editable fields still empty"""
+    changes = {
+        name: value for name, value in fields.items()
+        if stored.get(name) != value and (name in SOURCE_OWNED_FIELDS or not stored.get(name))
+    }
+    merged_sources = list(stored.get("sources") or [])
+    merged_sources += [source for source in sources if source not in merged_sources]
+    if merged_sources != (stored.get("sources") or []):
+        changes["sources"] = merged_sources
+    if "name" in changes or "tagline" in changes:
+        name = changes.get("name", stored.get("name"))
+        changes["name_key"] = normalize_name(name)
+        changes["search_terms"] = search_terms(name, changes.get("tagline", stored.get("tagline")))
+    return changes
+
+
+async def _write(operations: List[UpdateOne], outcome: IngestOutcome) -> Tuple[Dict[int, Any], Set[int]]:
+    """
+    Run the writes; returns upserted ids and failed operations, by operation index
+    Duplicate key errors (another ingest inserted the company first) are not failures.
+    """
+    if not operations:
+        return {}, set()
+    try:
+        result = await Startup.get_motor_collection().bulk_write(operations, ordered=False)
+        return dict(result.upserted_ids), set()
+    except BulkWriteError as e:
+        upserted = {item["index"]: item["_id"] for item in e.details.get("upserted", [])}
+        errors = [error for error in e.details.get("writeErrors", []) if error.get("code") != DUPLICATE_KEY]
+        for error in errors[:5]:
+            outcome.errors.append(f"Ingest error: {error.get('errmsg', 'write error')}")
+        if errors:
+            logger.error(f"Startup ingest: {len(errors)} writes failed")
+        return upserted, {error["index"] for error in errors}
+
+
+async def _existing_ids(keyed_fields: List[Dict[str, Any]]) -> Dict[Tuple[str, Any], PydanticObjectId]:
+    """Ids of stored startups by upsert key"""
+    conditions = [{key: value} for fields in keyed_fields for key, value in _index_keys(fields)]
+    if not conditions:
+        return {}
+    ids = {}
+    async for doc in Startup.get_motor_collection().find({"$or": conditions}, {key: 1 for key in INGEST_KEYS}):
+        for index_key in _index_keys(doc):
+            ids.setdefault(index_key, doc["_id"])
+    return ids
+
+
+async def _rescore(startup_ids: List[PydanticObjectId], thesis: ThesisLike):
+    """Score new or changed startups and refresh every user's fits for them"""
+    if not startup_ids:
+        return
+    startups = await Startup.find({"_id": {"$in": startup_ids}}).to_list()
+    results = await asyncio.to_thread(BatchScorer(thesis).score, startups)
+    now = datetime.utcnow()
+    operations = []
+    for startup, result in zip(startups, results):
+        changes = score_changes(startup, result)
+        if changes:
+            changes["updated_at"] = now
+            operations.append(UpdateOne({"_id": startup.id}, {"$set": changes}))
+    if operations:
+        await Startup.get_motor_collection().bulk_write(operations, ordered=False)
+    await refresh_startup_fits(startups)
+
+
+async def upsert_startups(entities: Sequence[ResolvedEntity], thesis: ThesisLike = None) -> IngestOutcome:
+    """Insert new companies and update changed fields of known ones"""
+    outcome = IngestOutcome()
+    keyed: List[Tuple[int, ResolvedEntity, Dict[str, Any]]] = []
+    for position, entity in enumerate(entities):
+        fields = ingest_fields(entity)
+        if _index_keys(fields):
+            keyed.append((position, entity, fields))
+        else:
+            outcome.skipped += 1
+    if not keyed:
+        return outcome
+    
+    # Load the stored startups for every key in one query
+    values: Dict[str, set] = {key: set() for key in INGEST_KEYS}
+    for _, _, fields in keyed:
+        for key, value in _index_keys(fields):
+            values[key].add(value)
+    stored_by_key: Dict[Tuple[str, Any], Dict[str, Any]] = {}
+    cursor = Startup.get_motor_collection().find(
+        {"$or": [{key: {"$in": list(found)}} for key, found in values.items() if found]},
+        {name: 1 for name in INGEST_FIELDS + ("domain", "sources")}
+    )
+    async for doc in cursor:
+        for index_key in _index_keys(doc):
+            stored_by_key.setdefault(index_key, doc)
+    
+    now = datetime.utcnow()
+    operations: List[UpdateOne] = []
+    to_rescore: List[PydanticObjectId] = []
+    inserted: Dict[int, Tuple[int, Dict[str, Any]]] = {}  # Operation index -> (position, fields)
+    
+    for position, entity, fields in keyed:
+        stored = next(
+            (stored_by_key[index_key] for index_key in _index_keys(fields) if index_key in stored_by_key),
+            None
+        )
+        sources = entity.data.get("sources") or []
+        
+        if stored is not None:
+            outcome.startup_ids[position] = str(stored["_id"])
+            changes = _changed_fields(stored, fields, sources)
+            if not changes:
+                outcome.unchanged += 1
+                continue
+            operations.append(UpdateOne(
+                {"_id": stored["_id"]},
+                {"$set": {**changes, "updated_at": now, "last_updated": "Just now"}}
+            ))
+            outcome.updated += 1
+            if SCORED_FIELDS.intersection(changes):
+                to_rescore.append(stored["_id"])
+            continue
+        
+        try:
+            startup = Startup(**fields, sources=sources, last_updated="Just now")
+        except Exception as e:
+            outcome.errors.append(f"Invalid startup {fields.get('name')}: {e}")
+            continue
+        startup.id = PydanticObjectId()
+        document = startup.model_dump(exclude={"id", "revision_id"})
+        document["_id"] = startup.id
+        
+        # Upsert on the strongest key; with the unique key indexes a concurrent ingest of
+        # the same company matches or hits a duplicate key instead
+        key, value = _index_keys(fields)[0]
+        inserted[len(operations)] = (position, fields)
+        operations.append(UpdateOne({key: value}, {"$setOnInsert": document}, upsert=True))
+        for index_key in _index_keys(fields):
+            stored_by_key.setdefault(index_key, {**fields, "_id": startup.id, "sources": sources})
+    
+    upserted, failed = await _write(operations, outcome)
+    existing = []
+    for index, (position, fields) in inserted.items():
+        if index in upserted:
+            outcome.startup_ids[position] = str(upserted[index])
+            to_rescore.append(upserted[index])
+            outcome.created += 1
+        elif index not in failed:
+            existing.append((position, fields))
+    
+    # Inserted by a concurrent ingest since the startups were loaded: already exists
+    if existing:
+        ids = await _existing_ids([fields for _, fields in existing])
+        for position, fields in existing:
+            found = next((ids[index_key] for index_key in _index_keys(fields) if index_key in ids), None)
+            if found is not None:
+                outcome.startup_ids[position] = str(found)
+            outcome.unchanged += 1
+    
+    try:
+        await _rescore(to_rescore, thesis)
+    except Exception as e:
+        logger.error(f"Startup ingest: could not score {len(to_rescore)} startups: {e}")
+    
+    if outcome.created or outcome.updated:
+        invalidate_startup_stats()
+    return outcome
@@ -0,0 +1,82 @@
+"""
+DealFlow Backend - Startup Statistics
+Dashboard counts over the startups collection
+
+All statistics come from one $facet aggregation, and the result is kept in memory
+for STATS_CACHE_TTL seconds. Startup writes in this process (create, update, delete,
+scoring, deal status changes, ingest) invalidate it; writes made by other processes
+(e.g. a discovery worker) show up once the TTL lapses.
+"""
+import asyncio
+import time
+from typing import Any, Dict, Optional, Tuple
+from app.core.config import settings
+from app.models.startup import Startup
+
+DEAL_STATUSES = ["new", "contacted", "meeting", "diligence", "passed", "invested"]
+
+# (computed at, statistics) of the last aggregation
+_cached: Optional[Tuple[float, Dict[str, Any]]] = None
+# Bumped on every invalidation so a computation that raced a write is not cached
+_generation = 0
+_lock = asyncio.Lock()
+
+
+def invalidate_startup_stats():
+    """Drop the cached statistics after a startup write"""
+    global _cached, _generation
+    _cached = None
+    _generation += 1
+
+
+async def compute_startup_stats() -> Dict[str, Any]:
+    """Totals, deal status counts, top sectors and average score in one aggregation"""
+    pipeline = [
+        {"$facet": {
+            "total": [{"$count": "count"}],
+            "by_status": [
+                {"$match": {"deal_status": {"$in": DEAL_STATUSES}}},
+                {"$group": {"_id": "$deal_status", "count": {"$sum": 1}}}
+            ],
+            "by_sector": [
+                {"$group": {"_id": "$sector", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1}},
+                {"$limit": 10}
+            ],
+            "average": [{"$group": {"_id": None, "avg_score": {"$avg": "$score"}}}]
+        }}
+    ]
+    result = (await Startup.aggregate(pipeline).to_list())[0]
+    
+    status_counts = {status: 0 for status in DEAL_STATUSES}
+    status_counts.update({item["_id"]: item["count"] for item in result["by_status"]})
+    avg_score = result["average"][0]["avg_score"] if result["average"] else None
+    
+    return {
+        "total": result["total"][0]["count"] if result["total"] else 0,
+        "by_status": status_counts,
+        "by_sector": {item["_id"]: item["count"] for item in result["by_sector"]},
+        "average_score": round(avg_score or 0, 1)
+    }
+
+
+async def cached_startup_stats() -> Dict[str, Any]:
+    """Cached statistics, recomputed once they are older than STATS_CACHE_TTL"""
+    if _cached and time.monotonic() - _cached[0] < settings.STATS_CACHE_TTL:
+        return _cached[1]
+    
+    # Concurrent dashboard loads on a cold cache share one aggregation
+    async with _lock:
+        if _cached and time.monotonic() - _cached[0] < settings.STATS_CACHE_TTL:
+            return _cached[1]
+        return await _refresh()
+
+
+async def _refresh() -> Dict[str, Any]:
+    global _cached
+    generation = _generation
+    started = time.monotonic()
+    stats = await compute_startup_stats()
+    if generation == _generation and settings.STATS_CACHE_TTL > 0:
+        _cached = (started, stats)
+    return stats
@@ -0,0 +1,201 @@
+"""
+DealFlow Backend - Compiled Fund Thesis
+Precomputed thesis matchers shared by fit scoring, fit descriptions and discovery
+"""
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
+from app.models.user import FundThesis, User
+from app.services.keywords import KeywordMatcher, term_matcher
+
+
+# Location keywords for the onboarding geography regions (matched as lowercase substrings)
+REGION_LOCATIONS: Dict[str, List[str]] = {
+    "north america": [
+        "north america", "united states", ", usa", "u.s.", "canada", "mexico",
+        "san francisco", "bay area", "silicon valley", "palo alto", "mountain view",
+        "menlo park", "los angeles", "san diego", "seattle", "new york", "nyc",
+        "boston", "cambridge, ma", "austin", "chicago", "denver", "miami",
+        "atlanta", "washington", "toronto", "vancouver", "montreal",
+        ", ca", ", ny", ", tx", ", wa", ", il", ", fl",
+    ],
+    "europe": [
+        "europe", "united kingdom", ", uk", "england", "london", "germany", "berlin",
+        "munich", "france", "paris", "netherlands", "amsterdam", "spain", "madrid",
+        "barcelona", "sweden", "stockholm", "switzerland", "zurich", "ireland",
+        "dublin", "italy", "milan", "portugal", "lisbon", "denmark", "copenhagen",
+        "finland", "helsinki", "norway", "oslo", "poland", "warsaw", "estonia",
+        "tallinn", "belgium", "brussels", "austria", "vienna",
+    ],
+    "asia-pacific": [
+        "asia", "apac", "india", "bangalore", "bengaluru", "mumbai", "delhi",
+        "gurgaon", "gurugram", "hyderabad", "pune", "chennai", "singapore", "china",
+        "beijing", "shanghai", "shenzhen", "hong kong", "japan", "tokyo", "korea",
+        "seoul", "indonesia", "jakarta", "vietnam", "philippines", "malaysia",
+        "thailand", "australia", "sydney", "melbourne", "new zealand", "auckland",
+        "taiwan", "taipei",
+    ],
+    "latin america": [
+        "latin america", "latam", "brazil", "são paulo", "sao paulo", "argentina",
+        "buenos aires", "colombia", "bogota", "bogotá", "chile", "santiago", "peru",
+        "lima", "mexico city", "uruguay", "montevideo",
+    ],
+    "middle east & africa": [
+        "middle east", "africa", "israel", "tel aviv", "uae", "dubai", "abu dhabi",
+        "saudi", "riyadh", "egypt", "cairo", "nigeria", "lagos", "kenya", "nairobi",
+        "south africa", "cape town", "johannesburg", "turkey", "istanbul",
+    ],
+}
+
+SECTOR_AGNOSTIC = "sector agnostic"
+
+
+def normalize(value: Optional[str]) -> str:
+    return value.strip().lower() if value else ""
+
+
+class CompiledThesis:
+    """
+    A FundThesis prepared for matching many startups
+    
+    Thesis terms are lowercased once, geography regions are expanded to location
+    keywords, and per-value results (sector, stage, location) are memoized, so
+    scoring a collection against one thesis does each distinct lookup only once.
+    """
+    
+    def __init__(self, thesis: FundThesis):
+        self.thesis = thesis
+        self.sectors = list(thesis.sectors)
+        self.stages = list(thesis.stages or thesis.investment_stage)
+        self.geographies = list(thesis.geographies or thesis.geography)
+        self.anti_portfolio = list(thesis.anti_portfolio)
+        
+        # Normalized sets for exact membership
+        self.sector_set = {normalize(sector) for sector in self.sectors}
+        self.stage_set = {normalize(stage) for stage in self.stages}
+        self.sector_agnostic = SECTOR_AGNOSTIC in self.sector_set
+        
+        self._sectors_lower = [(sector, sector.lower()) for sector in self.sectors]
+        self._stage_matcher = term_matcher(tuple(self.stages))
+        self._anti_matcher = term_matcher(tuple(self.anti_portfolio))
+        self._any_geography = next(
+            (geo for geo in self.geographies if normalize(geo).startswith("global")), None
+        )
+        self._geo_matcher = KeywordMatcher({
+            geo: [geo] + REGION_LOCATIONS.get(normalize(geo), [])
+            for geo in self.geographies
+        })
+        
+        self._sector_matches: Dict[str, Optional[str]] = {}
+        self._stage_matches: Dict[str, Optional[str]] = {}
+        self._geo_matches: Dict[str, Optional[str]] = {}
+        self._anti_matches: Dict[str, bool] = {}
+    
+    def sector_match(self, sector: Optional[str]) -> Optional[str]:
+        """First thesis sector that contains, or is contained in, the startup sector"""
+        sector_lower = sector.lower() if sector else ""
+        if sector_lower not in self._sector_matches:
+            self._sector_matches[sector_lower] = next(
+                (
+                    thesis_sector for thesis_sector, thesis_lower in self._sectors_lower
+                    if thesis_lower in sector_lower or sector_lower in thesis_lower
+                ),
+                None
+            )
+        return self._sector_matches[sector_lower]
+    
+    def stage_match(self, stage: Optional[str]) -> Optional[str]:
+        """First thesis stage contained in the startup stage"""
+        stage_lower = stage.lower() if stage else ""
+        if stage_lower not in self._stage_matches:
+            self._stage_matches[stage_lower] = self._stage_matcher.first(stage_lower, self.stages)
+        return self._stage_matches[stage_lower]
+    
+    def geography_match(self, location: Optional[str]) -> Optional[str]:
+        """First thesis geography whose region covers the startup location"""
+        if self._any_geography:
+            return self._any_geography
+        location_lower = location.lower() if location else ""
+        if location_lower not in self._geo_matches:
+            self._geo_matches[location_lower] = self._geo_matcher.first(location_lower, self.geographies)
+        return self._geo_matches[location_lower]
+    
+    def is_anti_portfolio(self, sector: Optional[str]) -> bool:
+        """Whether the startup sector contains an anti-portfolio term"""
+        sector_lower = sector.lower() if sector else ""
+        if sector_lower not in self._anti_matches:
+            self._anti_matches[sector_lower] = self._anti_matcher.first(sector_lower, self.anti_portfolio) is not None
+        return self._anti_matches[sector_lower]
+    
+    def has_sector(self, sector: Optional[str]) -> bool:
+        """Exact (case-insensitive) sector membership; "Sector Agnostic" accepts all"""
+        return self.sector_agnostic or normalize(sector) in self.sector_set
+    
+    def has_stage(self, stage: Optional[str]) -> bool:
+        """Exact (case-insensitive) stage membership"""
+        return normalize(stage) in self.stage_set
+    
+    def fit_key(self, sector: Optional[str], stage: Optional[str], location: Optional[str]) -> tuple:
+        """Everything the fit score and fit description take from the thesis for these values"""
+        return (
+            self.sector_match(sector),
+            self.stage_match(stage),
+            self.geography_match(location),
+            self.is_anti_portfolio(sector)
+        )
+    
+    def fit_adjustment(self, sector: Optional[str], stage: Optional[str], location: Optional[str]) -> int:
+        """Points added to the base fit score for a startup"""
+        points = 0
+        if self.sector_match(sector) is not None:
+            points += 20
+        if self.stage_match(stage) is not None:
+            points += 20
+        if self.geography_match(location) is not None:
+            points += 15
+        if self.is_anti_portfolio(sector):
+            points -= 30
+        return points
+
+
+ThesisLike = Union[FundThesis, CompiledThesis, None]
+
+
+def compile_thesis(thesis: ThesisLike) -> Optional[CompiledThesis]:
+    """Accept a FundThesis or an already compiled one"""
+    if thesis is None or isinstance(thesis, CompiledThesis):
+        return thesis
+    return CompiledThesis(thesis)
+
+
+# Per-user cache: user id -> (user.updated_at when compiled, compiled thesis)
+_MAX_CACHED_THESES = 1024
+_thesis_cache: "OrderedDict[str, Tuple[Optional[datetime], Optional[CompiledThesis]]]" = OrderedDict()
+
+
+def get_compiled_thesis(user: Optional[User]) -> Optional[CompiledThesis]:
+    """
+    Compiled thesis for a user, cached until the thesis changes
+    Entries are keyed by user id and checked against user.updated_at, so a thesis
+    saved through another API worker is picked up as well.
+    """
+    if user is None or user.thesis is None:
+        return None
+    
+    key = str(user.id)
+    cached = _thesis_cache.get(key)
+    if cached is not None and cached[0] == user.updated_at:
+        _thesis_cache.move_to_end(key)
+        return cached[1]
+    
+    compiled = CompiledThesis(user.thesis)
+    _thesis_cache[key] = (user.updated_at, compiled)
+    _thesis_cache.move_to_end(key)
+    while len(_thesis_cache) > _MAX_CACHED_THESES:
+        _thesis_cache.popitem(last=False)
+    return compiled
+
+
+def invalidate_compiled_thesis(user_id) -> None:
+    """Drop a user's cached thesis (call after saving a new thesis)"""
+    _thesis_cache.pop(str(user_id), None)
@@ -0,0 +1,62 @@
+"""
+DealFlow Backend - Source Watermarks
+Per-source high-water marks for delta discovery runs
+
+A delta run fetches each source with its stored watermark as `since`, so sources
+return only records newer than the last run (oldest first). The newest record
+returned then becomes the next watermark. A source without a watermark is fetched in
+full and starts the watermark from what that run saw.
+"""
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+from pymongo import UpdateOne
+from app.models.discovery import SourceWatermark
+from app.services.ingestion import record_watermark, watermark_key
+
+
+def watermark_scope(sectors: Optional[Sequence[str]], stages: Optional[Sequence[str]]) -> str:
+    """Scope key for the filters of a run"""
+    return json.dumps(
+        {"sectors": sorted(sectors or []), "stages": sorted(stages or [])},
+        separators=(",", ":")
+    )
+
+
+async def load_watermarks(sources: Sequence[str], scope: str) -> Dict[str, str]:
+    """Stored watermarks by source"""
+    watermarks = await SourceWatermark.find(
+        {"source": {"$in": list(sources)}, "scope": scope}
+    ).to_list()
+    return {watermark.source: watermark.value for watermark in watermarks}
+
+
+def next_watermarks(
+    fetched: Dict[str, List[Dict[str, Any]]],
+    current: Dict[str, str]
+) -> Dict[str, str]:
+    """Watermarks that moved forward with the fetched records"""
+    advanced = {}
+    for source, records in fetched.items():
+        values = [value for value in (record_watermark(source, record) for record in records) if value]
+        if not values:
+            continue
+        newest = max(values, key=lambda value: watermark_key(source, value))
+        if source not in current or watermark_key(source, newest) > watermark_key(source, current[source]):
+            advanced[source] = newest
+    return advanced
+
+
+async def save_watermarks(watermarks: Dict[str, str], scope: str):
+    """Store advanced watermarks (one bulk upsert)"""
+    if not watermarks:
+        return
+    now = datetime.utcnow()
+    await SourceWatermark.get_motor_collection().bulk_write([
+        UpdateOne(
+            {"source": source, "scope": scope},
+            {"$set": {"value": value, "updated_at": now}},
+            upsert=True
+        )
+        for source, value in watermarks.items()
+    ], ordered=False)
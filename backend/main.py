@@ -2,6 +2,7 @@
 DealFlow Backend - Main Application Entry Point
 FastAPI application with MongoDB, JWT auth, and AI scoring
 """
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -12,7 +13,10 @@ from loguru import logger
 
 from app.core.config import settings
 from app.core.database import connect_to_mongo, close_mongo_connection
+from app.core.http import open_http_clients, close_http_clients
+from app.core.index_advisor import check_indexes
 from app.api.routes import api_router
+from app.api.pagination import NEXT_CURSOR_HEADER
 
 
 # Rate limiter
@@ -25,12 +29,18 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting DealFlow Backend...")
     await connect_to_mongo()
+    await open_http_clients()
+    # Explaining the route queries takes a while, so don't hold up startup for it
+    index_check = asyncio.create_task(check_indexes()) if settings.INDEX_CHECK_ON_STARTUP else None
     logger.info("DealFlow Backend started successfully!")
     
     yield
     
     # Shutdown
     logger.info("Shutting down DealFlow Backend...")
+    if index_check and not index_check.done():
+        index_check.cancel()
+    await close_http_clients()
     await close_mongo_connection()
     logger.info("DealFlow Backend shutdown complete.")
 
@@ -65,6 +75,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Include API routes
@@ -0,0 +1,148 @@
+"""
+AI Scoring Pipeline Test Script
+Runs the scoring pipeline against a stub OpenAI server (httpx MockTransport) and a
+scratch MongoDB database, and checks batching, strict validation and the cache
+"""
+import asyncio
+import json
+import sys
+import httpx
+from motor.motor_asyncio import AsyncIOMotorClient
+from beanie import init_beanie
+from openai import AsyncOpenAI
+from app.core.config import settings
+from app.core.http import http_clients
+from app.models.ai_score import AIScoreCache
+from app.models.startup import Founder, Metrics, Startup
+from app.services.ai_scoring import USER_PROMPT, AIScoringPipeline
+
+TEST_DATABASE = f"{settings.DATABASE_NAME}_ai_scoring_test"
+BATCH_SIZE = 3
+
+# Startups the stub answers with an invalid entry (a number sent as a string, which only lax parsing would accept)
+INVALID_NAMES = {"Broken Scores Inc"}
+
+
+class StubOpenAI:
+    """Chat completions endpoint that scores every startup in the prompt"""
+    
+    def __init__(self):
+        self.batches = []
+        self.response_formats = []
+    
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        self.response_formats.append(body.get("response_format"))
+        prompt = body["messages"][-1]["content"]
+        startups = json.loads(prompt[len(USER_PROMPT):])
+        self.batches.append([startup["name"] for startup in startups])
+        
+        results = []
+        for startup in startups:
+            results.append({
+                "id": startup["id"],
+                "team_score": "80" if startup["name"] in INVALID_NAMES else 80,
+                "market_score": 70,
+                "traction_score": 60,
+                "unicorn_probability": 15,
+                "key_strengths": ["Team", "Market", "Product"],
+                "key_risks": ["Competition", "Funding", "Execution"],
+                "recommendation": "Take a meeting."
+            })
+        # An entry for a startup that was not asked about must be ignored
+        results.append({"id": "999", "team_score": 1, "market_score": 1, "traction_score": 1, "unicorn_probability": 1})
+        
+        return httpx.Response(200, json={
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": 0,
+            "model": body["model"],
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": json.dumps({"results": results})},
+                "finish_reason": "stop"
+            }]
+        })
+
+
+def make_startup(name: str) -> Startup:
+    return Startup(
+        name=name,
+        sector="FinTech",
+        stage="Seed",
+        tagline=f"{name} tagline",
+        founders=[Founder(name="Ada Founder", role="CEO", background="Ex-Stripe")],
+        metrics=Metrics(revenue="$1M ARR", growth="200%")
+    )
+
+
+def check(condition: bool, message: str) -> bool:
+    print(f"{'✅' if condition else '❌'} {message}")
+    return condition
+
+
+async def test_ai_scoring() -> bool:
+    client = AsyncIOMotorClient(settings.mongodb_connection_string, serverSelectionTimeoutMS=5000)
+    await init_beanie(database=client[TEST_DATABASE], document_models=[Startup, AIScoreCache])
+    
+    stub = StubOpenAI()
+    settings.OPENAI_API_KEY = settings.OPENAI_API_KEY or "stub-key"
+    http_clients.openai = AsyncOpenAI(
+        api_key="stub-key",
+        base_url="http://openai.stub/v1",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(stub.handle))
+    )
+    
+    try:
+        pipeline = AIScoringPipeline(batch_size=BATCH_SIZE, concurrency=2, rate_limit=0, use_cache=True)
+        valid = [make_startup(f"Stub Startup {i}") for i in range(6)]
+        startups = valid + [make_startup(name) for name in INVALID_NAMES]
+        ok = True
+        
+        # 1. Batching: 7 startups in batches of 3 -> 3 requests
+        print("\n1️⃣ First run")
+        scores = await pipeline.score(startups)
+        ok &= check(pipeline.requests == 3, f"{len(startups)} startups scored in {pipeline.requests} requests")
+        ok &= check(
+            sorted(len(batch) for batch in stub.batches) == [1, 3, 3],
+            f"Batch sizes {[len(batch) for batch in stub.batches]}"
+        )
+        ok &= check(
+            all(fmt == {"type": "json_object"} for fmt in stub.response_formats),
+            "JSON mode requested"
+        )
+        
+        # 2. Strict validation: invalid entries are rejected, unexpected ids ignored
+        print("\n2️⃣ Validation")
+        ok &= check(all(score is not None for score in scores[:len(valid)]), "Valid entries parsed")
+        ok &= check(scores[-1] is None, "Entry with a numeric string score rejected")
+        ok &= check(await AIScoreCache.count() == len(valid), f"{await AIScoreCache.count()} results cached")
+        
+        # 3. Cached rerun: no API calls
+        print("\n3️⃣ Cached rerun")
+        before = pipeline.requests
+        rerun = await pipeline.score(valid)
+        ok &= check(pipeline.requests == before, f"{pipeline.requests - before} requests on rerun")
+        ok &= check(
+            [score.model_dump() for score in rerun] == [score.model_dump() for score in scores[:len(valid)]],
+            "Rerun returned the cached scores"
+        )
+        
+        # 4. Without JSON mode response_format is not sent
+        print("\n4️⃣ JSON mode off")
+        plain = AIScoringPipeline(batch_size=BATCH_SIZE, rate_limit=0, use_cache=False, json_mode=False)
+        await plain.score(valid[:1])
+        ok &= check(stub.response_formats[-1] is None, "No response_format sent")
+        
+        return ok
+    finally:
+        await http_clients.openai.close()
+        http_clients.openai = None
+        await client.drop_database(TEST_DATABASE)
+        client.close()
+
+
+if __name__ == "__main__":
+    passed = asyncio.run(test_ai_scoring())
+    print("\n✅ All checks passed!" if passed else "\n❌ Some checks failed")
+    sys.exit(0 if passed else 1)
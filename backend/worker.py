@@ -0,0 +1,42 @@
+"""
+DealFlow Backend - Discovery Worker Entry Point
+Runs queued discovery jobs outside the API process (requires DISCOVERY_QUEUE_ENABLED=True on the API)
+
+Usage: python worker.py [--concurrency N]
+"""
+import argparse
+import asyncio
+import signal
+from loguru import logger
+
+from app.core.database import connect_to_mongo, close_mongo_connection
+from app.core.http import open_http_clients, close_http_clients
+from app.services.discovery_worker import DiscoveryWorker
+
+
+async def main(concurrency: int = None):
+    logger.info("Starting DealFlow discovery worker...")
+    await connect_to_mongo()
+    await open_http_clients()
+    
+    worker = DiscoveryWorker(concurrency=concurrency)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, worker.stop)
+        except NotImplementedError:
+            pass  # Windows: Ctrl+C raises KeyboardInterrupt instead
+    
+    try:
+        await worker.run()
+    finally:
+        await close_http_clients()
+        await close_mongo_connection()
+        logger.info("DealFlow discovery worker shutdown complete.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DealFlow discovery worker")
+    parser.add_argument("--concurrency", type=int, default=None, help="Jobs to run at once (default: DISCOVERY_WORKER_CONCURRENCY)")
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency))
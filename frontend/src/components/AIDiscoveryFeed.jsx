@@ -17,30 +17,21 @@ export default function AIDiscoveryFeed() {
   const [sources, setSources] = useState(["yc"]);
   const [limitPerSource, setLimitPerSource] = useState(20);
 
-  // Poll for job status
+  // Stream job progress and results as they are produced
   useEffect(() => {
     if (!jobId || !isRunning) return;
 
-    const pollInterval = setInterval(async () => {
-      try {
-        const statusData = await discoveryService.getJobStatus(jobId);
+    const unsubscribe = discoveryService.subscribeToJob(jobId, {
+      onProgress: (statusData) => setStatus(statusData),
+      onResults: (newResults) =>
+        setResults((prev) => [...prev, ...newResults]),
+      onComplete: (statusData) => {
         setStatus(statusData);
+        setIsRunning(false);
+      },
+    });
 
-        // Stop polling if job is completed or failed
-        if (statusData.status === "completed" || statusData.status === "failed") {
-          setIsRunning(false);
-          // Fetch results
-          if (statusData.startups_added > 0) {
-            const resultsData = await discoveryService.getResults(jobId, 0, 50);
-            setResults(resultsData);
-          }
-        }
-      } catch (error) {
-        console.error("Error polling job status:", error);
-      }
-    }, 2000); // Poll every 2 seconds
-
-    return () => clearInterval(pollInterval);
+    return unsubscribe;
   }, [jobId, isRunning]);
 
   // Start discovery
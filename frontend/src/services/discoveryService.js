@@ -58,6 +58,34 @@ export const discoveryService = {
     }
   },
 
+  /**
+   * Subscribe to a discovery job's server-sent event stream
+   * Handlers: onProgress(status), onResults(results), onComplete(status), onError(event)
+   * Returns a function that closes the stream
+   */
+  subscribeToJob(jobId, { onProgress, onResults, onComplete, onError } = {}) {
+    const source = new EventSource(
+      `${API_BASE_URL}/api/v1/discovery/jobs/${jobId}/events`
+    );
+
+    source.addEventListener("progress", (event) => {
+      onProgress?.(JSON.parse(event.data));
+    });
+    source.addEventListener("results", (event) => {
+      onResults?.(JSON.parse(event.data));
+    });
+    source.addEventListener("complete", (event) => {
+      source.close();
+      onComplete?.(JSON.parse(event.data));
+    });
+    source.onerror = (event) => {
+      console.error("Discovery event stream error:", event);
+      onError?.(event);
+    };
+
+    return () => source.close();
+  },
+
   /**
    * Get discovery results
    */
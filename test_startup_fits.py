@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test that updating a startup's metrics refreshes the user's fit scores
+Run against a local backend: PUT /startups/{id} with new metrics, then check the
+StartupFit document in MongoDB was rescored after the update.
+"""
+import aiohttp
+import asyncio
+import os
+from datetime import datetime
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+API_URL = "http://localhost:8000/api/v1"
+MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+DATABASE_NAME = os.getenv("DATABASE_NAME", "dealflow")
+
+
+async def wait_for_fit(db, user_id, startup_id, newer_than=None, timeout=15):
+    """Poll startup_fits until the fit exists (and was written after `newer_than`)"""
+    for _ in range(timeout * 2):
+        fit = await db.startup_fits.find_one({"user_id": user_id, "startup_id": startup_id})
+        if fit and (newer_than is None or fit["updated_at"] > newer_than):
+            return fit
+        await asyncio.sleep(0.5)
+    return None
+
+
+async def test_startup_fits():
+    """Test fit refresh after a metrics update"""
+    db = AsyncIOMotorClient(MONGODB_URL)[DATABASE_NAME]
+    
+    async with aiohttp.ClientSession() as session:
+        # 1. Register and log in
+        print("1️⃣ Registering user...")
+        register_data = {
+            "email": f"fits_{asyncio.get_event_loop().time()}@example.com",
+            "password": "TestPassword123!",
+            "full_name": "Fit Test User",
+            "company": "Test Fund",
+            "role": "Partner"
+        }
+        async with session.post(f"{API_URL}/auth/register", json=register_data) as resp:
+            if resp.status != 201:
+                print(f"   ❌ Registration failed: {await resp.text()}")
+                return
+            user = await resp.json()
+            user_id = user["id"]
+            print(f"   ✅ User registered: {user['email']}")
+        
+        async with session.post(
+            f"{API_URL}/auth/login",
+            json={"email": register_data["email"], "password": register_data["password"]}
+        ) as resp:
+            if resp.status != 200:
+                print(f"   ❌ Login failed: {await resp.text()}")
+                return
+            headers = {"Authorization": f"Bearer {(await resp.json())['access_token']}"}
+            print("   ✅ Logged in")
+        
+        # 2. Set a thesis so fits are materialized for this user
+        print("\n2️⃣ Setting thesis...")
+        thesis_data = {
+            "fund_name": "Test Fund",
+            "fund_size": "50M",
+            "check_size_min": 100000,
+            "check_size_max": 1000000,
+            "stages": ["Seed", "Series A"],
+            "sectors": ["FinTech"],
+            "geographies": ["United States"],
+            "thesis_description": "Fit refresh test",
+            "anti_portfolio": []
+        }
+        async with session.put(f"{API_URL}/auth/thesis", json=thesis_data, headers=headers) as resp:
+            if resp.status != 200:
+                print(f"   ❌ Failed to update thesis: {await resp.text()}")
+                return
+            print("   ✅ Thesis updated")
+        
+        # 3. Create a startup with weak metrics
+        print("\n3️⃣ Creating startup...")
+        startup_data = {
+            "name": f"Fit Test {datetime.utcnow().timestamp():.0f}",
+            "sector": "FinTech",
+            "stage": "Seed",
+            "location": "San Francisco, CA",
+            "founders": [{"name": "Ada Founder", "role": "CEO", "background": "Ex-Stripe engineer"}],
+            "metrics": {"revenue": "$10K", "growth": "5%", "users": "100"}
+        }
+        async with session.post(f"{API_URL}/startups", json=startup_data, headers=headers) as resp:
+            if resp.status != 201:
+                print(f"   ❌ Failed to create startup: {await resp.text()}")
+                return
+            startup_id = (await resp.json())["id"]
+            print(f"   ✅ Startup created: {startup_id}")
+        
+        before = await wait_for_fit(db, user_id, ObjectId(startup_id))
+        if not before:
+            print("   ❌ No fit score was materialized for the new startup")
+            return
+        print(f"   ✅ Initial fit score: {before['score']}")
+        
+        # 4. Update metrics (and founders) through the API
+        print("\n4️⃣ Updating metrics...")
+        update_data = {
+            "metrics": {"revenue": "$5M ARR", "growth": "300% YoY", "users": "50K"},
+            "founders": [{"name": "Ada Founder", "role": "CEO", "background": "Ex-Google, 2x founder"}]
+        }
+        async with session.put(f"{API_URL}/startups/{startup_id}", json=update_data, headers=headers) as resp:
+            if resp.status != 200:
+                print(f"   ❌ Failed to update startup: {await resp.text()}")
+                return
+            print("   ✅ Startup updated")
+        
+        # 5. The fit must have been rescored with the new metrics
+        print("\n5️⃣ Checking fit score...")
+        after = await wait_for_fit(db, user_id, ObjectId(startup_id), newer_than=before["updated_at"])
+        if not after:
+            print("   ❌ Fit score was not refreshed after the update (check the backend log)")
+            return
+        print(f"   ✅ Fit refreshed: {before['score']} -> {after['score']}")
+        
+        stored = await db.startups.find_one({"_id": ObjectId(startup_id)})
+        if stored["metrics"].get("revenue_usd") != 5_000_000:
+            print(f"   ❌ Parsed revenue not stored: {stored['metrics']}")
+            return
+        print(f"   ✅ Parsed metrics stored: revenue_usd={stored['metrics']['revenue_usd']}")
+        
+        # Clean up
+        async with session.delete(f"{API_URL}/startups/{startup_id}", headers=headers):
+            pass
+        
+        print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    asyncio.run(test_startup_fits())